@@ -0,0 +1,117 @@
+from decimal import Decimal
+
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+
+from .models import BudgetTracking, Prediction
+
+# Locations are stored as "<District> - <Sector>" (see constants/locations.js)
+LOCATION_SEPARATOR = " - "
+
+TOTAL_KEYS = (
+    "total_schools",
+    "total_predictions",
+    "total_required_rooms",
+    "total_rooms_to_build",
+    "total_estimated_budget",
+    "total_allocated_budget",
+    "total_spent_budget",
+)
+DECIMAL_KEYS = ("total_estimated_budget", "total_allocated_budget", "total_spent_budget")
+APPROVAL_KEYS = ("district_approved", "mineduc_approved", "pending")
+
+
+def split_location(location):
+    district, _, sector = (location or "").partition(LOCATION_SEPARATOR)
+    return district, sector
+
+
+def latest_per_school(predictions):
+    """
+    Narrow ``predictions`` to the most recent one of each school. Predictions
+    are re-generated rather than edited, so older rows are history and summing
+    them would count a school once per run.
+    """
+    latest = (
+        predictions.model.objects.filter(school=OuterRef("school"))
+        .order_by("-created_at", "-id")
+        .values("pk")[:1]
+    )
+    return predictions.filter(pk=Subquery(latest))
+
+
+def sector_rows(queryset=None):
+    """
+    One aggregated query over predictions, grouped by school location
+    (i.e. sector/umurenge). District and national figures are rolled up from
+    these rows, so the database is only scanned once.
+    """
+    if queryset is None:
+        queryset = latest_per_school(Prediction.objects.all())
+    return (
+        queryset.order_by()
+        .values(location=F("school__location"))
+        .annotate(
+            total_schools=Count("school", distinct=True),
+            total_predictions=Count("id"),
+            total_required_rooms=Sum("required_rooms"),
+            total_rooms_to_build=Sum("rooms_to_build"),
+            total_estimated_budget=Sum("estimated_budget"),
+            district_approved=Count("id", filter=Q(approved_by_district=True)),
+            mineduc_approved=Count("id", filter=Q(approved_by_mineduc=True)),
+            pending=Count("id", filter=Q(approved_by_district=False, approved_by_mineduc=False)),
+        )
+        .order_by("location")
+    )
+
+
+def budget_rows(queryset=None):
+    """Allocated and spent budget per sector, following project -> prediction -> school."""
+    if queryset is None:
+        queryset = BudgetTracking.objects.all()
+    return (
+        queryset.order_by()
+        .values(location=F("project__prediction__school__location"))
+        .annotate(
+            total_allocated_budget=Sum("allocated_budget"),
+            total_spent_budget=Sum("spent_budget"),
+        )
+        .order_by("location")
+    )
+
+
+def _empty_totals():
+    totals = {key: 0 for key in TOTAL_KEYS}
+    for key in DECIMAL_KEYS:
+        totals[key] = Decimal("0.00")
+    totals["approvals"] = {key: 0 for key in APPROVAL_KEYS}
+    return totals
+
+
+def _accumulate(totals, row):
+    for key in TOTAL_KEYS:
+        totals[key] += row.get(key) or 0
+    for key in APPROVAL_KEYS:
+        totals["approvals"][key] += row.get(key) or 0
+
+
+def build_rollup(rows):
+    """
+    Fold per-sector rows into ``{"national": ..., "districts": [...]}`` where
+    each district carries its own totals and its sectors.
+    """
+    national = _empty_totals()
+    districts = {}
+    for row in rows:
+        location = row["location"]
+        district_name, sector_name = split_location(location)
+        district = districts.get(district_name)
+        if district is None:
+            district = districts[district_name] = {"district": district_name, **_empty_totals(), "sectors": []}
+
+        sector = {"umurenge": location, "sector": sector_name, **_empty_totals()}
+        _accumulate(sector, row)
+        district["sectors"].append(sector)
+        _accumulate(district, row)
+        _accumulate(national, row)
+
+    return {"national": national, "districts": list(districts.values())}
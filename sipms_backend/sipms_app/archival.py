@@ -0,0 +1,111 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ActionLog, ActionLogArchive
+
+ARCHIVE_FIELDS = ("id", "user_id", "action", "model_name", "object_id", "details", "timestamp")
+
+
+def month_start(value, months_back=0):
+    """First day of the month ``months_back`` months before ``value``."""
+    index = value.year * 12 + value.month - 1 - months_back
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def retention_cutoff(months=None, now=None):
+    """Rows older than the returned aware datetime are due for archival."""
+    if months is None:
+        months = getattr(settings, "SIPMS_ACTIONLOG_RETENTION_MONTHS", 6)
+    now = timezone.localtime(now or timezone.now())
+    return timezone.make_aware(datetime.combine(month_start(now, months), time.min))
+
+
+def archive_dir():
+    path = getattr(settings, "SIPMS_ACTIONLOG_ARCHIVE_DIR", settings.BASE_DIR / "archives" / "action_logs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def archive_before(cutoff, chunk_size=5000):
+    """
+    Move ActionLog rows older than ``cutoff`` into one gzip'd JSONL file per
+    month and delete them from the hot table. Returns the created
+    ActionLogArchive rows. Files are fully written and fsync'd while reading;
+    only once the read is finished is each file recorded and its rows deleted,
+    in one transaction per file.
+    """
+    rows = (
+        ActionLog.objects.filter(timestamp__lt=cutoff)
+        .order_by("timestamp", "id")
+        .values(*ARCHIVE_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    writers = []
+    for row in rows:
+        month = month_start(timezone.localtime(row["timestamp"]))
+        if not writers or writers[-1].month != month:
+            if writers:
+                writers[-1].close()
+            writers.append(_MonthWriter(month, cutoff))
+        writers[-1].write(row)
+    if writers:
+        writers[-1].close()
+    return [writer.commit() for writer in writers]
+
+
+def read_archive(archive):
+    """Yield the archived rows of ``archive`` as dicts."""
+    with gzip.open(archive.path, "rt") as stream:
+        for line in stream:
+            yield json.loads(line)
+
+
+class _MonthWriter:
+    def __init__(self, month, cutoff):
+        self.month = month
+        self.start = timezone.make_aware(datetime.combine(month, time.min))
+        self.end = min(timezone.make_aware(datetime.combine(month_start(month, -1), time.min)), cutoff)
+        stamp = timezone.now().strftime("%Y%m%d%H%M%S%f")
+        self.path = os.path.join(archive_dir(), f"actionlog-{month:%Y-%m}-{stamp}.jsonl.gz")
+        self.raw = open(self.path, "wb")
+        self.stream = io.TextIOWrapper(gzip.GzipFile(fileobj=self.raw, mode="wb"), encoding="utf-8")
+        self.row_count = 0
+        self.max_id = 0
+
+    def write(self, row):
+        self.stream.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+        self.row_count += 1
+        self.max_id = max(self.max_id, row["id"])
+
+    def close(self):
+        self.stream.close()
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+        self.raw.close()
+
+    def commit(self):
+        """Record the closed file and delete the rows it holds."""
+        digest = hashlib.sha256()
+        with open(self.path, "rb") as stream:
+            for block in iter(lambda: stream.read(1 << 20), b""):
+                digest.update(block)
+
+        with transaction.atomic():
+            archive = ActionLogArchive.objects.create(
+                month=self.month, path=self.path, row_count=self.row_count, sha256=digest.hexdigest()
+            )
+            # Rows replayed late by the audit writer get higher ids and are
+            # left for the next run rather than deleted unarchived.
+            ActionLog.objects.filter(
+                timestamp__gte=self.start, timestamp__lt=self.end, id__lte=self.max_id
+            ).delete()
+        return archive
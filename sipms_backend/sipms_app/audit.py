@@ -0,0 +1,262 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ActionLog
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, f"SIPMS_AUDIT_{name}", default)
+
+
+class AuditLogWriter:
+    """
+    Buffers ActionLog records in a bounded in-memory queue and writes them
+    with ``bulk_create`` from a background thread once ``batch_size`` records
+    are waiting or ``flush_interval`` seconds have passed.
+
+    When the queue is full, ``submit`` blocks for up to ``enqueue_timeout``
+    seconds and then drops the record. With a ``spool_path`` every record is
+    first appended to a per-process JSONL file (the pid is added to the name)
+    with a sequence number; after each write a ``done`` line lists the numbers
+    that reached the database, so replay on start only writes the rest. Spools
+    left by processes that are no longer running are replayed as well. The
+    file is truncated whenever nothing spooled is still pending.
+    """
+
+    def __init__(self, batch_size=200, flush_interval=1.0, queue_size=10000, enqueue_timeout=0.05, spool_path=None):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.spool_path = spool_path
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        # Guards the spool file only; never held while waiting on the queue.
+        self._spool_lock = threading.Lock()
+        self._spool = None
+        self._sequence = 0
+        self._pending = 0
+        self._stopping = threading.Event()
+        self._thread = None
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        if self.spool_path:
+            self._replay_spools()
+            self._spool = open(self._spool_file(os.getpid()), "a")
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def submit(self, record):
+        if self._thread is None:
+            self.start()
+        sequence = None
+        if self._spool is not None:
+            # Spool before queueing so the writer can never mark a record done
+            # ahead of its spool line.
+            with self._spool_lock:
+                self._sequence += 1
+                sequence = self._sequence
+                self._pending += 1
+                self._append({"seq": sequence, "record": record})
+        try:
+            self._queue.put((sequence, record), timeout=self.enqueue_timeout)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.warning("Audit queue full, dropped %s %s record", record["action"], record["model_name"])
+            self._mark_done([sequence])
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def flush(self):
+        """Synchronously write everything currently queued."""
+        while True:
+            batch = self._take(block=False)
+            if not batch:
+                return
+            self._write(batch)
+
+    def stop(self, timeout=5.0):
+        self._stopping.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+        self.flush()
+
+    def metrics(self):
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+        }
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._take(block=True)
+            if batch:
+                self._write(batch)
+
+    def _take(self, block):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                if block:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        records = [record for _, record in batch]
+        written = 0
+        try:
+            ActionLog.objects.bulk_create([ActionLog(**record) for record in records])
+            written = len(records)
+        except Exception:
+            # Isolate the offending record(s) instead of losing the batch.
+            for record in records:
+                try:
+                    ActionLog.objects.create(**record)
+                    written += 1
+                except Exception:
+                    logger.exception("Could not write audit record %r", record)
+        finally:
+            close_old_connections()
+
+        # Failed records are logged above; replaying them would fail again.
+        self._mark_done([sequence for sequence, _ in batch])
+        with self._lock:
+            self.written += written
+            self.failed += len(records) - written
+            self.flushes += 1
+
+    def _append(self, line):
+        self._spool.write(json.dumps(line, cls=DjangoJSONEncoder) + "\n")
+        self._spool.flush()
+
+    def _mark_done(self, sequences):
+        sequences = [sequence for sequence in sequences if sequence is not None]
+        if not sequences or self._spool is None:
+            return
+        with self._spool_lock:
+            self._pending -= len(sequences)
+            if self._pending:
+                self._append({"done": sequences})
+            else:
+                self._spool.truncate(0)
+
+    def _spool_file(self, pid):
+        root, ext = os.path.splitext(self.spool_path)
+        return f"{root}.{pid}{ext}"
+
+    def _replay_spools(self):
+        root, ext = os.path.splitext(self.spool_path)
+        for path in glob.glob(f"{glob.escape(root)}.*{ext}"):
+            owner = path[len(root) + 1:len(path) - len(ext)].split(".")[0]
+            if not owner.isdigit() or (int(owner) != os.getpid() and _process_alive(int(owner))):
+                continue
+            # Claim the file by renaming it so concurrent starters don't
+            # replay the same spool twice.
+            claimed = f"{root}.{os.getpid()}.replay{ext}"
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue
+            self._replay(claimed)
+            os.remove(claimed)
+
+    def _replay(self, path):
+        records, done = {}, set()
+        with open(path) as spool:
+            for line in spool:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if "done" in entry:
+                    done.update(entry["done"])
+                else:
+                    records[entry["seq"]] = entry["record"]
+        batch = [(None, record) for sequence, record in records.items() if sequence not in done]
+        for _, record in batch:
+            record["timestamp"] = parse_datetime(record["timestamp"])
+        if batch:
+            logger.info("Replaying %d spooled audit records", len(batch))
+            self._write(batch)
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AuditLogWriter(
+                    batch_size=_setting("BATCH_SIZE", 200),
+                    flush_interval=_setting("FLUSH_INTERVAL", 1.0),
+                    queue_size=_setting("QUEUE_SIZE", 10000),
+                    enqueue_timeout=_setting("ENQUEUE_TIMEOUT", 0.05),
+                    spool_path=_setting("SPOOL_PATH", None),
+                )
+    return _writer
+
+
+def record_action(user, action, model_name, object_id=None, details=None):
+    """Queue an ActionLog entry, or write it inline when SIPMS_AUDIT_ASYNC is off."""
+    record = {
+        "user_id": getattr(user, "pk", None),
+        "action": action,
+        "model_name": model_name,
+        "object_id": object_id,
+        "details": details,
+        "timestamp": timezone.now(),
+    }
+    if not _setting("ASYNC", True):
+        ActionLog.objects.create(**record)
+        return
+    get_writer().submit(record)
@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import TokenClaimsUser, User
+
+CLAIM_FIELDS = ("role", "sector", "school_id", "is_active", "token_version")
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token whose access tokens carry the user's role, sector,
+    school_id, is_active and token_version.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for field in CLAIM_FIELDS:
+            token[field] = getattr(user, field)
+        return token
+
+
+class FullUserCache:
+    """
+    In-process LRU of full User rows keyed by token id (jti), for requests
+    that read fields the token does not carry. Entries live until the token
+    expires or the user's token_version moves past the cached row's.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token, loader, version=None):
+        jti = token[api_settings.JTI_CLAIM]
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(jti)
+        if entry is not None:
+            user, expires = entry
+            if expires > now and version is not None and user.token_version == version:
+                with self.lock:
+                    if jti in self.entries:
+                        self.entries.move_to_end(jti)
+                    self.hits += 1
+                return user
+        with self.lock:
+            self.misses += 1
+        user = loader()
+        with self.lock:
+            self.entries[jti] = (user, token["exp"])
+            while len(self.entries) > getattr(settings, "SIPMS_JWT_USER_CACHE_SIZE", 1024):
+                self.entries.popitem(last=False)
+        return user
+
+    def invalidate_user(self, pk):
+        with self.lock:
+            for jti in [jti for jti, (user, _) in self.entries.items() if user.pk == pk]:
+                del self.entries[jti]
+
+    def metrics(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "size": len(self.entries),
+        }
+
+
+full_user_cache = FullUserCache()
+
+
+def token_state(pk):
+    """
+    ``(token_version, is_active)`` of user ``pk``, or None if it is gone. One
+    primary-key lookup of two columns; the database is the shared store, so
+    every worker sees a change as soon as it commits.
+    """
+    return User.objects.filter(pk=pk).values_list("token_version", "is_active").first()
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that answers ``request.user`` from the token's claims
+    instead of loading the full user row and its school. Claims are trusted
+    only while the token's token_version matches the user's and the user is
+    active; otherwise, or without the claims, the full row is loaded and
+    checked as usual.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        pk = User._meta.pk.to_python(user_id)
+        state = token_state(pk)
+        version = state[0] if state else None
+        if state == (validated_token.get("token_version"), True) and all(
+            claim in validated_token for claim in CLAIM_FIELDS
+        ):
+            return claims_user(validated_token, pk, version)
+        return full_user_cache.get(
+            validated_token, lambda: super(ClaimsJWTAuthentication, self).get_user(validated_token), version
+        )
+
+
+def claims_user(validated_token, pk, version):
+    loaded = {"id": pk, **{field: validated_token[field] for field in CLAIM_FIELDS}}
+    fields = [field.attname for field in TokenClaimsUser._meta.concrete_fields if field.attname in loaded]
+    user = TokenClaimsUser.from_db("default", fields, [loaded[name] for name in fields])
+    user.load_full_user = lambda: full_user_cache.get(validated_token, lambda: User.objects.get(pk=pk), version)
+    return user
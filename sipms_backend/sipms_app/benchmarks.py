@@ -0,0 +1,161 @@
+import time
+from decimal import Decimal
+
+from django.utils import timezone
+from rest_framework.serializers import ModelSerializer
+
+from . import serializers
+from .models import (
+    ActionLog,
+    BudgetTracking,
+    Job,
+    Notification,
+    Prediction,
+    PredictionReport,
+    Project,
+    ReportUpload,
+    School,
+    User,
+)
+
+
+def sample_objects():
+    """One unsaved, fully populated instance per model, linked like real rows."""
+    now = timezone.now()
+    school = School(
+        id=1, name="GS Kimironko", location="Gasabo - Kimironko", established_year=1998,
+        student_population=1240, number_of_rooms=22, head_teacher="M. Uwase",
+        email="gs.kimironko@example.rw", phone="0788000000", created_at=now,
+    )
+    user = User(
+        id=1, username="district.gasabo", email="gasabo@example.rw", first_name="Jean", last_name="Habimana",
+        role=User.Role.DISTRICT, sector="Kimironko", school=school,
+    )
+    prediction = Prediction(
+        id=1, school=school, created_by=user, required_rooms=36, rooms_to_build=14,
+        estimated_budget=Decimal("70000000.00"), created_at=now,
+    )
+    project = Project(id=1, prediction=prediction, district=user, project_name="Kimironko block B", created_at=now)
+    report = PredictionReport(
+        id=1, location=school.location, document="prediction_reports/blobs/ab/abc.pdf", created_by=user,
+        created_at=now, status="pending",
+    )
+    return {
+        "school": school,
+        "user": user,
+        "prediction": prediction,
+        "project": project,
+        "budget": BudgetTracking(
+            id=1, project=project, allocated_budget=Decimal("70000000.00"), spent_budget=Decimal("1000000.00"),
+            remaining_budget=Decimal("69000000.00"), created_at=now,
+        ),
+        "notification": Notification(
+            id=1, role="MINEDUC", sender="DISTRICT", sector="Kimironko",
+            message="A new report is waiting for review.", created_at=now,
+        ),
+        "report": report,
+        "upload": ReportUpload(
+            location=school.location, filename="report.pdf", total_size=1024, created_by=user, created_at=now,
+        ),
+        "job": Job(id=1, task="report.sent", status="succeeded", attempts=1, max_attempts=5, run_at=now, created_at=now),
+        "action_log": ActionLog(
+            id=1, user=user, action="APPROVE", model_name="PredictionReport", object_id=1,
+            details={"status": "approved"}, timestamp=now,
+        ),
+        "login": {"email": user.email, "token": {"refresh": "r", "access": "a"}, "user": user},
+    }
+
+
+# (serializer, sample key, context) for every serializer in serializers.py.
+CASES = [
+    (serializers.SchoolSerializer, "school", {}),
+    (serializers.UserSerializer, "user", {}),
+    (serializers.UserLoginSerializer, "login", {}),
+    (serializers.UserRegisterSerializer, "user", {}),
+    (serializers.PredictionSerializer, "prediction", {}),
+    (serializers.ProjectSerializer, "project", {}),
+    (serializers.BudgetTrackingSerializer, "budget", {}),
+    (serializers.NotificationSerializer, "notification", {}),
+    (serializers.InboxNotificationSerializer, "notification", {"last_read_id": 1}),
+    (serializers.PredictionReportSerializer, "report", {}),
+    (serializers.PredictionReportCreateSerializer, "report", {}),
+    (serializers.ReportUploadSerializer, "upload", {}),
+    (serializers.JobSerializer, "job", {}),
+    (serializers.ActionLogSerializer, "action_log", {}),
+]
+
+
+def measure_serializers(repeat=200):
+    """
+    Time constructing each serializer and calling ``to_representation`` on a
+    sample object, the per-row cost of a detail response. Returns
+    ``{name: microseconds per op}``, the best of three runs of ``repeat``.
+    """
+    samples = sample_objects()
+    results = {}
+    for serializer_class, key, context in CASES:
+        instance = samples[key]
+        serializer_class(context=context).to_representation(instance)
+        best = None
+        for _ in range(3):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                serializer_class(context=context).to_representation(instance)
+            elapsed = (time.perf_counter() - started) / repeat
+            best = elapsed if best is None else min(best, elapsed)
+        results[serializer_class.__name__] = best * 1e6
+    return results
+
+
+def measure_field_maps(repeat=200):
+    """
+    Time building one instance's fields for every serializer with a cached
+    field map, from the class cache and by rebuilding it the way a plain
+    ModelSerializer does. Returns ``{name: (cached us, uncached us)}``, the
+    best of three runs of ``repeat``. Both run on this host in the same
+    process, so their ratio holds where absolute timings don't.
+    """
+    results = {}
+    for serializer_class, _, context in CASES:
+        if not issubclass(serializer_class, serializers.CachedFieldMapSerializer):
+            continue
+        serializer = serializer_class(context=context)
+        serializer.get_fields()
+        timings = []
+        for build in (
+            serializer.get_fields,
+            lambda: serializer.prepare_fields(ModelSerializer.get_fields(serializer)),
+        ):
+            best = None
+            for _ in range(3):
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    build()
+                elapsed = (time.perf_counter() - started) / repeat
+                best = elapsed if best is None else min(best, elapsed)
+            timings.append(best * 1e6)
+        results[serializer_class.__name__] = tuple(timings)
+    return results
+
+
+# Regression ceilings in microseconds per op, about twice the timings
+# measured with cached, deep-copied field maps. Wall-clock numbers vary too
+# much between hosts for the unit tests, so `manage.py benchmark_serializers
+# --check` enforces them; --tolerance scales them on slow hosts. The unit
+# tests compare cached against rebuilt field maps with measure_field_maps.
+BUDGETS_US = {
+    "SchoolSerializer": 600,
+    "UserSerializer": 1500,
+    "UserLoginSerializer": 1600,
+    "UserRegisterSerializer": 1500,
+    "PredictionSerializer": 2800,
+    "ProjectSerializer": 650,
+    "BudgetTrackingSerializer": 650,
+    "NotificationSerializer": 500,
+    "InboxNotificationSerializer": 500,
+    "PredictionReportSerializer": 1000,
+    "PredictionReportCreateSerializer": 400,
+    "ReportUploadSerializer": 600,
+    "JobSerializer": 700,
+    "ActionLogSerializer": 2300,
+}
@@ -0,0 +1,162 @@
+import hashlib
+import os
+import time
+
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import DocumentBlob, PredictionReport
+from .table_versions import bump
+
+BLOB_DIR = "prediction_reports/blobs"
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def stream_sha256(stream):
+    digest = hashlib.sha256()
+    for block in iter(lambda: stream.read(READ_BLOCK_SIZE), b""):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+class LocalFile(File):
+    # FileSystemStorage moves anything exposing temporary_file_path() into
+    # place with a rename instead of copying it block by block.
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def document_storage():
+    return PredictionReport._meta.get_field("document").storage
+
+
+def blob_name(digest, filename):
+    extension = os.path.splitext(filename)[1].lower()[:10]
+    return f"{BLOB_DIR}/{digest[:2]}/{digest}{extension}"
+
+
+def store_blob(content, digest, size, filename):
+    """
+    Return the DocumentBlob for ``digest``, writing ``content`` only when no
+    copy is stored yet. Call inside the transaction that saves the report so
+    the row lock is held until its reference is counted.
+    """
+    storage = document_storage()
+    blob, _ = DocumentBlob.objects.get_or_create(
+        sha256=digest, defaults={"name": blob_name(digest, filename), "size": size}
+    )
+    blob = DocumentBlob.objects.select_for_update().get(pk=blob.pk)
+    if not storage.exists(blob.name):
+        blob.name = storage.save(blob.name, content)
+        blob.save(update_fields=["name"])
+    return blob
+
+
+def add_reference(blob_id):
+    DocumentBlob.objects.filter(pk=blob_id).update(ref_count=F("ref_count") + 1)
+
+
+def release_reference(blob_id):
+    """Drop one reference; the last one deletes the row and, after commit, the file."""
+    with transaction.atomic():
+        DocumentBlob.objects.filter(pk=blob_id, ref_count__gt=0).update(ref_count=F("ref_count") - 1)
+        blob = DocumentBlob.objects.select_for_update().filter(pk=blob_id, ref_count=0).first()
+        if blob is not None and not blob.reports.exists():
+            _delete_blob(blob)
+
+
+def _delete_blob(blob):
+    name = blob.name
+    blob.delete()
+    transaction.on_commit(lambda: document_storage().delete(name))
+
+
+def recount_references():
+    """Reset every ref_count from the reports that actually point at it. Returns rows fixed."""
+    actual = (
+        PredictionReport.objects.filter(blob=OuterRef("pk"))
+        .order_by()
+        .values("blob")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    drifted = DocumentBlob.objects.annotate(actual=Coalesce(Subquery(actual), 0)).exclude(ref_count=F("actual"))
+    fixed = 0
+    for blob in drifted:
+        DocumentBlob.objects.filter(pk=blob.pk).update(ref_count=blob.actual)
+        fixed += 1
+    return fixed
+
+
+def collect_garbage(grace_seconds=3600, dry_run=False):
+    """
+    Delete unreferenced blobs, then files under ``prediction_reports/`` that
+    no blob or report names. Files younger than ``grace_seconds`` are kept so
+    an upload between its file write and its row commit is not collected.
+    Returns ``(blobs, files, bytes)`` removed.
+    """
+    storage = document_storage()
+    removed_blobs = 0
+    for blob in DocumentBlob.objects.filter(ref_count=0, reports__isnull=True):
+        removed_blobs += 1
+        if not dry_run:
+            with transaction.atomic():
+                _delete_blob(blob)
+
+    known = set(DocumentBlob.objects.values_list("name", flat=True))
+    known.update(PredictionReport.objects.exclude(document="").values_list("document", flat=True).iterator())
+    root = storage.path("prediction_reports")
+    cutoff = time.time() - grace_seconds
+    removed_files = removed_bytes = 0
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, storage.location).replace(os.sep, "/")
+            if name in known or os.path.getmtime(path) > cutoff:
+                continue
+            removed_files += 1
+            removed_bytes += os.path.getsize(path)
+            if not dry_run:
+                os.remove(path)
+    return removed_blobs, removed_files, removed_bytes
+
+
+def adopt_legacy_documents():
+    """
+    Move reports stored before content addressing into blobs, dropping the
+    duplicate copies. Returns ``(reports adopted, bytes freed)``.
+    """
+    storage = document_storage()
+    adopted = freed = 0
+    legacy = PredictionReport.objects.filter(blob__isnull=True).exclude(document="")
+    for report in legacy.iterator():
+        old_name = report.document.name
+        if not storage.exists(old_name):
+            continue
+        if not report.sha256:
+            with storage.open(old_name, "rb") as stream:
+                report.sha256 = stream_sha256(stream)
+            report.size = storage.size(old_name)
+        duplicate = DocumentBlob.objects.filter(sha256=report.sha256).exists()
+        with transaction.atomic():
+            with storage.open(old_name, "rb") as stream:
+                blob = store_blob(stream, report.sha256, report.size, old_name)
+            PredictionReport.objects.filter(pk=report.pk).update(
+                blob=blob,
+                document=blob.name,
+                filename=report.filename or os.path.basename(old_name),
+                sha256=report.sha256,
+                size=report.size,
+            )
+            add_reference(blob.pk)
+        if blob.name != old_name:
+            storage.delete(old_name)
+            if duplicate:
+                freed += report.size
+        adopted += 1
+    if adopted:
+        # The UPDATEs above send no signals; the report list shows ``document``.
+        bump(PredictionReport)
+    return adopted, freed
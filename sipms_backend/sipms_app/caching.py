@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from .serializers import SchoolSerializer, UserRegisterSerializer
+
+
+class SerializedCache:
+    """
+    Read-through cache of one serializer's output per object, stored in the
+    "serialized" cache alias (LocMem LRU by default, Redis when configured).
+    Keys carry the serializer name and the alias' VERSION, so bumping the
+    version after a serializer change orphans every old entry.
+
+    LocMem lives in one process, so a write served by one worker cannot
+    evict another worker's copy. On LocMem the cache is only used with DEBUG
+    or SIPMS_SERIALIZED_CACHE_LOCAL (single-process deployments, tests);
+    otherwise every read goes to the database.
+    """
+
+    def __init__(self, name, serializer_class):
+        self.name = name
+        self.serializer_class = serializer_class
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def backend(self):
+        return caches["serialized"]
+
+    @property
+    def enabled(self):
+        if not isinstance(self.backend, LocMemCache):
+            return True
+        return settings.DEBUG or getattr(settings, "SIPMS_SERIALIZED_CACHE_LOCAL", False)
+
+    def key(self, pk):
+        return f"sipms:{self.name}:{self.serializer_class.__name__}:{pk}"
+
+    def get(self, pk, loader):
+        """Return cached data for ``pk``, or serialize ``loader()`` and cache it."""
+        if not self.enabled:
+            return self.serializer_class(loader()).data
+        data = self.backend.get(self.key(pk))
+        if data is not None:
+            self.hits += 1
+            return data
+        self.misses += 1
+        data = self.serializer_class(loader()).data
+        self.backend.set(self.key(pk), data)
+        return data
+
+    def invalidate(self, *pks):
+        if pks:
+            self.invalidations += len(pks)
+            self.backend.delete_many([self.key(pk) for pk in pks])
+
+    def metrics(self):
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "invalidations": self.invalidations,
+        }
+
+
+school_cache = SerializedCache("school", SchoolSerializer)
+user_cache = SerializedCache("user", UserRegisterSerializer)
@@ -0,0 +1,119 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header, parse_etags
+
+from .blobs import READ_BLOCK_SIZE, stream_sha256
+
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header, size):
+    """
+    Return ``(start, end)`` inclusive for a single ``bytes=`` range, ``None``
+    to serve the whole file (no header, or one we don't support such as
+    multiple ranges), or ``False`` when the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = RANGE_HEADER.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes. An empty file has none to send.
+        length = int(last)
+        if length == 0 or size == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def ensure_content_hash(report):
+    """Fill in sha256/size for documents stored before they were recorded."""
+    if report.sha256 and report.size is not None:
+        return
+    with report.document.open("rb") as stream:
+        report.sha256 = stream_sha256(stream)
+    report.size = report.document.size
+    report.save(update_fields=["sha256", "size"])
+
+
+def _read_range(document, start, length):
+    with document.open("rb") as stream:
+        stream.seek(start)
+        while length > 0:
+            block = stream.read(min(READ_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def document_response(request, report):
+    """
+    Serve ``report.document`` with a strong ETag from its content hash,
+    Cache-Control, and single-range support. With
+    SIPMS_DOCUMENT_ACCEL_REDIRECT set, the body is left to the front proxy.
+    """
+    if not report.document or not report.document.storage.exists(report.document.name):
+        raise Http404("Document not found.")
+    ensure_content_hash(report)
+
+    etag = f'"{report.sha256}"'
+    filename = report.filename or os.path.basename(report.document.name)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={getattr(settings, 'SIPMS_DOCUMENT_MAX_AGE', 3600)}",
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": content_disposition_header(
+            request.GET.get("download") in ("1", "true"), filename
+        ),
+    }
+
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag in if_none_match or "*" in if_none_match:
+        return HttpResponse(status=304, headers=headers)
+
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    accel_prefix = getattr(settings, "SIPMS_DOCUMENT_ACCEL_REDIRECT", None)
+    if accel_prefix:
+        # nginx serves the file (ranges included) from an internal location
+        # aliased to MEDIA_ROOT; the worker is released immediately.
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response["X-Accel-Redirect"] = accel_prefix.rstrip("/") + "/" + report.document.name
+        return response
+
+    size = report.size
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if not if_range or if_range == etag:
+        byte_range = parse_range(request.headers.get("Range"), size)
+    if byte_range is False:
+        headers["Content-Range"] = f"bytes */{size}"
+        return HttpResponse(status=416, headers=headers)
+
+    if byte_range is None:
+        # FileResponse lets the WSGI server use wsgi.file_wrapper (sendfile).
+        response = FileResponse(report.document.open("rb"), content_type=content_type)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    start, end = byte_range
+    length = end - start + 1
+    response = StreamingHttpResponse(
+        _read_range(report.document, start, length), status=206, content_type=content_type, headers=headers
+    )
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Length"] = str(length)
+    return response
@@ -0,0 +1,412 @@
+import csv
+import hashlib
+import io
+import os
+import uuid
+import zipfile
+from decimal import Decimal
+from itertools import groupby
+from xml.sax.saxutils import escape, quoteattr
+
+from django.db import transaction
+from django.db.models import DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .aggregates import latest_per_school, split_location
+from .blobs import LocalFile, store_blob
+from .bulk import filter_schools
+from .models import BudgetTracking, Prediction, PredictionReport, School
+from .uploads import upload_dir
+
+FORMATS = ("csv", "xlsx", "pdf")
+
+HEADERS = (
+    "District", "Sector", "School", "Students", "Rooms", "Required rooms", "Rooms to build",
+    "Estimated budget", "Allocated budget", "Spent budget", "District approved", "MINEDUC approved",
+)
+# Indexes into a row of the columns summed into district and national totals.
+SUMMED = range(3, 10)
+APPROVALS = (10, 11)
+
+
+def latest_predictions(district=None, location=None):
+    """The most recent prediction of each school, so re-runs are not double counted."""
+    schools = filter_schools(School.objects.all(), district, location)
+    return latest_per_school(Prediction.objects.filter(school__in=schools))
+
+
+def export_rows(predictions, chunk_size=2000):
+    """
+    Yield one tuple per prediction in HEADERS order, ordered by location so
+    each district's rows are contiguous. Budgets are summed per prediction in
+    the database; rows stream through ``iterator`` in ``chunk_size`` batches.
+    """
+    money = DecimalField(max_digits=18, decimal_places=2)
+
+    def budget(field):
+        total = (
+            BudgetTracking.objects.filter(project__prediction=OuterRef("pk"))
+            .order_by()
+            .values("project__prediction")
+            .annotate(total=Sum(field))
+            .values("total")
+        )
+        return Coalesce(Subquery(total, output_field=money), Value(Decimal("0")), output_field=money)
+
+    rows = (
+        predictions.annotate(allocated=budget("allocated_budget"), spent=budget("spent_budget"))
+        .order_by("school__location", "school__name", "id")
+        .values_list(
+            "school__location", "school__name", "school__student_population", "school__number_of_rooms",
+            "required_rooms", "rooms_to_build", "estimated_budget", "allocated", "spent",
+            "approved_by_district", "approved_by_mineduc",
+        )
+    )
+    for location, *values in rows.iterator(chunk_size=chunk_size):
+        district, sector = split_location(location)
+        yield (district, sector, *values)
+
+
+def write_export(writer, rows):
+    """Feed ``rows`` to ``writer`` grouped by district, with running totals. Returns the row count."""
+    national = _Totals()
+    for district, district_rows in groupby(rows, key=lambda row: row[0]):
+        totals = _Totals()
+        writer.start_district(district)
+        for row in district_rows:
+            writer.write_row(row)
+            totals.add(row)
+        writer.end_district(district, totals.row(district, "Total"))
+        national.merge(totals)
+    writer.close(national.row("National", "Total"))
+    return national.count
+
+
+class _Totals:
+    def __init__(self):
+        self.count = 0
+        self.sums = {index: 0 for index in SUMMED}
+        self.approved = {index: 0 for index in APPROVALS}
+
+    def add(self, row):
+        self.count += 1
+        for index in SUMMED:
+            self.sums[index] += row[index]
+        for index in APPROVALS:
+            self.approved[index] += bool(row[index])
+
+    def merge(self, other):
+        self.count += other.count
+        for index in SUMMED:
+            self.sums[index] += other.sums[index]
+        for index in APPROVALS:
+            self.approved[index] += other.approved[index]
+
+    def row(self, district, label):
+        return (district, label, f"{self.count} schools", *(self.sums[i] for i in SUMMED),
+                *(self.approved[i] for i in APPROVALS))
+
+
+def _cell_text(value):
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, Decimal):
+        return f"{value:,.2f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+
+class CsvExportWriter:
+
+    def __init__(self, stream):
+        self.text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        self.csv = csv.writer(self.text)
+        self.csv.writerow(HEADERS)
+
+    def start_district(self, district):
+        pass
+
+    def write_row(self, row):
+        self.csv.writerow(row)
+
+    def end_district(self, district, totals):
+        self.csv.writerow(totals)
+
+    def close(self, totals):
+        self.csv.writerow(totals)
+        self.text.flush()
+        self.text.detach()
+
+
+class XlsxExportWriter:
+    """
+    Minimal SpreadsheetML writer: one sheet per district plus a summary sheet,
+    each streamed into the zip as it is produced.
+    """
+
+    INVALID_SHEET_CHARS = str.maketrans({c: " " for c in "[]:*?/\\"})
+
+    def __init__(self, stream):
+        self.zip = zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED)
+        self.sheets = []
+        self.sheet = None
+        self.summary = []
+
+    def _open_sheet(self, name):
+        name = (name.translate(self.INVALID_SHEET_CHARS).strip() or "Sheet")[:31]
+        taken = {sheet.lower() for sheet in self.sheets}
+        base, suffix = name, 2
+        while name.lower() in taken:
+            name = f"{base[:28]} {suffix}"
+            suffix += 1
+        self.sheets.append(name)
+        self.sheet = self.zip.open(f"xl/worksheets/sheet{len(self.sheets)}.xml", "w")
+        self.sheet.write(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        )
+        self._row(HEADERS)
+
+    def _row(self, values):
+        cells = []
+        for value in values:
+            if isinstance(value, (int, Decimal)) and not isinstance(value, bool):
+                cells.append(f"<c><v>{value}</v></c>")
+            else:
+                cells.append(f'<c t="inlineStr"><is><t>{escape(_cell_text(value))}</t></is></c>')
+        self.sheet.write(f"<row>{''.join(cells)}</row>".encode("utf-8"))
+
+    def _close_sheet(self):
+        self.sheet.write(b"</sheetData></worksheet>")
+        self.sheet.close()
+
+    def start_district(self, district):
+        self._open_sheet(district)
+
+    def write_row(self, row):
+        self._row(row)
+
+    def end_district(self, district, totals):
+        self._row(totals)
+        self._close_sheet()
+        # One line per district; bounded by the number of districts.
+        self.summary.append(totals)
+
+    def close(self, totals):
+        self._open_sheet("Summary")
+        for row in self.summary:
+            self._row(row)
+        self._row(totals)
+        self._close_sheet()
+
+        sheets = "".join(
+            f'<sheet name={quoteattr(name)} sheetId="{i}" r:id="rId{i}"/>'
+            for i, name in enumerate(self.sheets, 1)
+        )
+        relations = "".join(
+            f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+            f'worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, len(self.sheets) + 1)
+        )
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/'
+            f'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, len(self.sheets) + 1)
+        )
+        self.zip.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f"{overrides}</Types>"
+        ))
+        self.zip.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+            'officeDocument" Target="xl/workbook.xml"/></Relationships>'
+        ))
+        self.zip.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f"<sheets>{sheets}</sheets></workbook>"
+        ))
+        self.zip.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f"{relations}</Relationships>"
+        ))
+        self.zip.close()
+
+
+class PdfExportWriter:
+    """
+    Minimal PDF writer: landscape A4 pages of monospaced table text. Each page
+    is written out as soon as it fills, so only one page is ever in memory.
+    """
+
+    WIDTH, HEIGHT, MARGIN = 842, 595, 28
+    FONT_SIZE, LEADING = 6.5, 9
+    COLUMN_WIDTHS = (12, 16, 28, 8, 6, 9, 8, 16, 16, 16, 9, 9)
+
+    def __init__(self, stream, title="School infrastructure predictions"):
+        self.stream = stream
+        self.offsets = {}
+        self.pages = []
+        self.lines = []
+        self.title = title
+        self.lines_per_page = int((self.HEIGHT - 2 * self.MARGIN) / self.LEADING) - 2
+        # Objects 1-3 are the catalog, page tree and font; pages follow.
+        self.next_id = 4
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>")
+
+    def _write(self, data):
+        self.stream.write(data)
+        self.position = getattr(self, "position", 0) + len(data)
+
+    def _object(self, number, body):
+        self.offsets[number] = self.position
+        self._write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def _format(self, values):
+        return " ".join(
+            _cell_text(value)[:width].rjust(width) if index >= 3 else _cell_text(value)[:width].ljust(width)
+            for index, (value, width) in enumerate(zip(values, self.COLUMN_WIDTHS))
+        )
+
+    def _line(self, text):
+        if not self.lines:
+            self.lines.append(f"{self.title}  -  page {len(self.pages) + 1}")
+            self.lines.append(self._format(HEADERS))
+        self.lines.append(text)
+        if len(self.lines) >= self.lines_per_page:
+            self._flush_page()
+
+    def _flush_page(self):
+        if not self.lines:
+            return
+        y = self.HEIGHT - self.MARGIN
+        commands = [f"BT /F1 {self.FONT_SIZE} Tf {self.LEADING} TL {self.MARGIN} {y} Td"]
+        for text in self.lines:
+            safe = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            commands.append(f"({safe}) '")
+        commands.append("ET")
+        content = "\n".join(commands).encode("cp1252", "replace")
+        content_id, page_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self._object(content_id, f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream")
+        self._object(page_id, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.WIDTH} {self.HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode())
+        self.pages.append(page_id)
+        self.lines = []
+
+    def start_district(self, district):
+        self._line("")
+        self._line(f"District: {district}")
+
+    def write_row(self, row):
+        self._line(self._format(row))
+
+    def end_district(self, district, totals):
+        self._line(self._format(totals))
+
+    def close(self, totals):
+        self._line("")
+        self._line(self._format(totals))
+        self._flush_page()
+        kids = " ".join(f"{page} 0 R" for page in self.pages)
+        self._object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>".encode())
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref_at = self.position
+        count = self.next_id
+        entries = ["0000000000 65535 f "] + [f"{self.offsets[n]:010d} 00000 n " for n in range(1, count)]
+        self._write(f"xref\n0 {count}\n".encode() + "\n".join(entries).encode() + b"\n")
+        self._write(f"trailer\n<< /Size {count} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode())
+
+
+WRITERS = {"csv": CsvExportWriter, "xlsx": XlsxExportWriter, "pdf": PdfExportWriter}
+
+
+class _HashingFile:
+    """Write-through wrapper that hashes everything written to ``raw``."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.digest.update(data)
+        self.size += len(data)
+        return self.raw.write(data)
+
+    def flush(self):
+        self.raw.flush()
+
+    # zipfile and TextIOWrapper probe these; reporting the stream as
+    # forward-only keeps zipfile from seeking back to patch headers.
+    closed = False
+
+    def seekable(self):
+        return False
+
+    def readable(self):
+        return False
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self.size
+
+
+def generate_report(created_by, fmt, district=None, location=None, chunk_size=2000, on_created=None):
+    """
+    Export the latest prediction of every matching school to ``fmt`` and
+    attach the file as a PredictionReport. The file is hashed as it is
+    written and moved into blob storage without being read back.
+
+    Call outside a transaction: only storing the blob and creating the report
+    are atomic, together with ``on_created(report, row_count)``, so the
+    write lock is not held while rows stream out.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Unsupported export format {fmt!r}")
+    scope = location or district or "National"
+    stamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+    filename = f"predictions-{scope.replace(' ', '')}-{stamp}.{fmt}"
+    path = os.path.join(upload_dir(), f"export-{uuid.uuid4().hex}.{fmt}")
+
+    rows = export_rows(latest_predictions(district, location), chunk_size=chunk_size)
+    try:
+        with open(path, "wb") as raw:
+            stream = _HashingFile(raw)
+            row_count = write_export(WRITERS[fmt](stream), rows)
+            raw.flush()
+            os.fsync(raw.fileno())
+        digest, size = stream.digest.hexdigest(), stream.size
+        with transaction.atomic(), open(path, "rb") as handle:
+            blob = store_blob(LocalFile(handle), digest, size, filename)
+            report = PredictionReport.objects.create(
+                location=scope,
+                created_by=created_by,
+                blob=blob,
+                document=blob.name,
+                filename=filename,
+                sha256=digest,
+                size=size,
+            )
+            if on_created is not None:
+                on_created(report, row_count)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+    return report, row_count
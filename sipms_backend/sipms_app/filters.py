@@ -0,0 +1,205 @@
+import re
+from datetime import datetime, time
+
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .aggregates import LOCATION_SEPARATOR
+
+DETAILS_PREFIX = "details."
+DETAILS_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def parse_int(params, name):
+    value = params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: "Must be an integer."})
+
+
+def parse_timestamp(params, name, end_of_day=False):
+    """Accept an ISO datetime or a plain date; naive values use the current timezone."""
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        day = None if parsed else parse_date(value)
+    except ValueError:
+        # Well-formed but impossible, e.g. 2024-02-30.
+        raise ValidationError({name: "Must be a valid ISO date or datetime."})
+    if parsed is None:
+        if day is None:
+            raise ValidationError({name: "Must be an ISO date or datetime."})
+        parsed = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_action_logs(queryset, params):
+    """
+    Filters: ``user``, ``action``, ``model_name``, ``object_id``,
+    ``since``/``until`` on timestamp, and ``details.<key>=<value>`` for keys
+    inside the details JSON.
+    """
+    user = parse_int(params, "user")
+    if user is not None:
+        queryset = queryset.filter(user_id=user)
+    if params.get("action"):
+        queryset = queryset.filter(action=params["action"].upper())
+    if params.get("model_name"):
+        queryset = queryset.filter(model_name=params["model_name"])
+    object_id = parse_int(params, "object_id")
+    if object_id is not None:
+        queryset = queryset.filter(object_id=object_id)
+
+    since = parse_timestamp(params, "since")
+    if since:
+        queryset = queryset.filter(timestamp__gte=since)
+    until = parse_timestamp(params, "until", end_of_day=True)
+    if until:
+        queryset = queryset.filter(timestamp__lte=until)
+
+    for name, value in params.items():
+        if not name.startswith(DETAILS_PREFIX):
+            continue
+        key = name[len(DETAILS_PREFIX):]
+        if not DETAILS_KEY.match(key):
+            raise ValidationError({name: "Invalid details key."})
+        # Query strings are untyped; match numeric JSON values as well.
+        values = [value]
+        if value.lstrip("-").isdigit():
+            values.append(int(value))
+        condition = Q()
+        for candidate in values:
+            condition |= _details_match(key, candidate)
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+def _details_match(key, value):
+    # Containment can use the GIN index on PostgreSQL; other backends only
+    # support key lookups on JSONField.
+    if connection.vendor == "postgresql":
+        return Q(details__contains={key: value})
+    return Q(**{f"details__{key}": value})
+
+
+SCHOOL_ORDERING = ("created_at", "name", "student_population", "number_of_rooms")
+PREDICTION_ORDERING = ("created_at", "required_rooms", "rooms_to_build", "estimated_budget")
+
+
+def parse_bool(params, name):
+    value = params.get(name)
+    if value in (None, ""):
+        return None
+    if value.lower() in ("1", "true", "yes"):
+        return True
+    if value.lower() in ("0", "false", "no"):
+        return False
+    raise ValidationError({name: "Must be true or false."})
+
+
+def parse_ordering(params, allowed):
+    """
+    ``?ordering=<field>`` or ``-<field>`` from ``allowed``, with ``id`` as a
+    tie-breaker so cursor pagination stays stable. None keeps the default.
+    """
+    value = params.get("ordering")
+    if not value:
+        return None
+    field = value.lstrip("-")
+    if field not in allowed:
+        raise ValidationError({"ordering": f"Must be one of {', '.join(allowed)}, optionally prefixed with '-'."})
+    return (value, "-id" if value.startswith("-") else "id")
+
+
+def _filter_location(queryset, params, prefix=""):
+    # ``location`` is an exact match so it can use the location index.
+    if params.get("location"):
+        queryset = queryset.filter(**{f"{prefix}location": params["location"]})
+    if params.get("district"):
+        queryset = queryset.filter(**{f"{prefix}location__istartswith": params["district"] + LOCATION_SEPARATOR})
+    sector = params.get("sector")
+    if sector:
+        # ``User.sector`` stores the full "<District> - <Sector>" location;
+        # a bare sector name matches that sector in any district.
+        if LOCATION_SEPARATOR in sector:
+            queryset = queryset.filter(**{f"{prefix}location__iexact": sector})
+        else:
+            queryset = queryset.filter(**{f"{prefix}location__iendswith": LOCATION_SEPARATOR + sector})
+    return queryset
+
+
+def _filter_range(queryset, params, field):
+    low = parse_int(params, f"{field}_min")
+    if low is not None:
+        queryset = queryset.filter(**{f"{field}__gte": low})
+    high = parse_int(params, f"{field}_max")
+    if high is not None:
+        queryset = queryset.filter(**{f"{field}__lte": high})
+    return queryset
+
+
+def _filter_created(queryset, params):
+    since = parse_timestamp(params, "since")
+    if since:
+        queryset = queryset.filter(created_at__gte=since)
+    until = parse_timestamp(params, "until", end_of_day=True)
+    if until:
+        queryset = queryset.filter(created_at__lte=until)
+    return queryset
+
+
+def filter_school_list(queryset, params):
+    """
+    Filters: ``location`` (exact), ``district``, ``sector``, ``search`` on
+    name, ``student_population_min``/``_max``, ``number_of_rooms_min``/``_max``
+    and ``since``/``until`` on created_at.
+    """
+    queryset = _filter_location(queryset, params)
+    if params.get("search"):
+        queryset = queryset.filter(name__icontains=params["search"])
+    queryset = _filter_range(queryset, params, "student_population")
+    queryset = _filter_range(queryset, params, "number_of_rooms")
+    return _filter_created(queryset, params)
+
+
+def filter_prediction_list(queryset, params):
+    """
+    Filters: ``school``, ``created_by``, the school's ``location``/``district``
+    /``sector``, ``needs_rooms`` (rooms_to_build > 0), ``rooms_to_build_min``
+    /``_max``, ``approved_by_district``, ``approved_by_mineduc`` and
+    ``since``/``until`` on created_at.
+    """
+    school = parse_int(params, "school")
+    if school is not None:
+        queryset = queryset.filter(school_id=school)
+    created_by = parse_int(params, "created_by")
+    if created_by is not None:
+        queryset = queryset.filter(created_by_id=created_by)
+    queryset = _filter_location(queryset, params, prefix="school__")
+
+    needs_rooms = parse_bool(params, "needs_rooms")
+    if needs_rooms is not None:
+        queryset = queryset.filter(rooms_to_build__gt=0) if needs_rooms else queryset.filter(rooms_to_build=0)
+    queryset = _filter_range(queryset, params, "rooms_to_build")
+    for flag in ("approved_by_district", "approved_by_mineduc"):
+        value = parse_bool(params, flag)
+        if value is not None:
+            queryset = queryset.filter(**{flag: value})
+    return _filter_created(queryset, params)
+
+
+def filter_user_list(queryset, params):
+    """Filters: ``role`` and the assigned school's ``location``/``district``/``sector``."""
+    if params.get("role"):
+        queryset = queryset.filter(role=params["role"].upper())
+    return _filter_location(queryset, params, prefix="school__")
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+def pbkdf2_iterations():
+    """SIPMS_PASSWORD_ITERATIONS, or Django's default when it is unset."""
+    return getattr(settings, "SIPMS_PASSWORD_ITERATIONS", None) or PBKDF2PasswordHasher.iterations
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with its iteration count taken from
+    SIPMS_PASSWORD_ITERATIONS (Django's default when unset). It keeps the ``pbkdf2_sha256`` algorithm name,
+    so existing hashes verify unchanged and ``User.check_password`` rehashes
+    any stored at a different count on the user's next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return pbkdf2_iterations()
@@ -0,0 +1,240 @@
+import csv
+import io
+import os
+import re
+import time
+import zipfile
+from xml.etree.ElementTree import ParseError, iterparse
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .aggregates import LOCATION_SEPARATOR
+from .audit import record_action
+from .caching import school_cache, user_cache
+from .models import School, User
+from .rollups import refresh_locations
+from .serializers import SchoolSerializer
+from .table_versions import bump
+
+IMPORT_FIELDS = (
+    "name", "location", "established_year", "student_population", "number_of_rooms", "head_teacher", "email", "phone",
+)
+KEY_FIELDS = ("name", "location")
+MAX_REPORTED_ERRORS = 1000
+
+SPREADSHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+RELATIONSHIP_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+CELL_COLUMN = re.compile(r"[A-Z]+")
+
+
+def _column_index(reference):
+    index = 0
+    for char in CELL_COLUMN.match(reference).group():
+        index = index * 26 + ord(char) - 64
+    return index - 1
+
+
+def iter_csv_rows(stream):
+    """Yield each CSV record as a list of strings, decoding ``stream`` as it is read."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.reader(text)
+    finally:
+        text.detach()
+
+
+def iter_xlsx_rows(stream):
+    """
+    Yield the rows of the first worksheet as lists of strings. The sheet XML
+    is parsed incrementally and each row's elements are cleared once read;
+    only the shared-string table is held in memory.
+    """
+    with zipfile.ZipFile(stream) as workbook:
+        shared = []
+        if "xl/sharedStrings.xml" in workbook.namelist():
+            with workbook.open("xl/sharedStrings.xml") as strings:
+                for _, element in iterparse(strings):
+                    if element.tag == f"{SPREADSHEET_NS}si":
+                        shared.append("".join(text.text or "" for text in element.iter(f"{SPREADSHEET_NS}t")))
+                        element.clear()
+        sheet = _first_sheet(workbook)
+        with workbook.open(sheet) as rows:
+            for _, element in iterparse(rows):
+                if element.tag != f"{SPREADSHEET_NS}row":
+                    continue
+                values = []
+                for cell in element.iter(f"{SPREADSHEET_NS}c"):
+                    if cell.get("r"):
+                        values.extend([""] * (_column_index(cell.get("r")) - len(values)))
+                    kind = cell.get("t")
+                    if kind == "inlineStr":
+                        value = "".join(text.text or "" for text in cell.iter(f"{SPREADSHEET_NS}t"))
+                    else:
+                        raw = cell.findtext(f"{SPREADSHEET_NS}v") or ""
+                        value = shared[int(raw)] if kind == "s" and raw else raw
+                    values.append(value)
+                element.clear()
+                yield values
+
+
+def _first_sheet(workbook):
+    with workbook.open("xl/workbook.xml") as book:
+        for _, element in iterparse(book):
+            if element.tag == f"{SPREADSHEET_NS}sheet":
+                relation = element.get(f"{RELATIONSHIP_NS}id")
+                break
+        else:
+            raise ValidationError({"file": "Workbook has no sheets."})
+    with workbook.open("xl/_rels/workbook.xml.rels") as rels:
+        for _, element in iterparse(rels):
+            if element.get("Id") == relation:
+                target = element.get("Target").lstrip("/")
+                return target if target.startswith("xl/") else f"xl/{target}"
+    return "xl/worksheets/sheet1.xml"
+
+
+def _checked(rows):
+    # Malformed files surface as a 400 on the upload, not a server error.
+    try:
+        yield from rows
+    except (zipfile.BadZipFile, KeyError, ParseError):
+        raise ValidationError({"file": "Not a readable XLSX workbook."})
+    except (UnicodeDecodeError, csv.Error):
+        raise ValidationError({"file": "Not a readable UTF-8 CSV file."})
+
+
+def iter_records(stream, filename):
+    """Yield ``(line_number, dict)`` for each data row of a CSV or XLSX file, keyed by model field."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".xlsx":
+        rows = iter_xlsx_rows(stream)
+    elif extension in (".csv", ".txt", ""):
+        rows = iter_csv_rows(stream)
+    else:
+        raise ValidationError({"file": "Upload a .csv or .xlsx file."})
+
+    rows = _checked(rows)
+    header = next(rows, None)
+    if not header:
+        raise ValidationError({"file": "The file is empty."})
+    columns = [re.sub(r"[\s-]+", "_", (column or "").strip().lower()) for column in header]
+    has_sectors = "location" not in columns and {"district", "sector"} <= set(columns)
+    if "name" not in columns or ("location" not in columns and not has_sectors):
+        raise ValidationError({"file": "Header must include name and location (or district and sector)."})
+
+    for line, values in enumerate(rows, start=2):
+        if not any((value or "").strip() for value in values):
+            continue
+        # Blank cells count as empty, so they never overwrite a stored value
+        # with an empty string or fail an integer column.
+        record = dict(zip(columns, ((value or "").strip() or None for value in values)))
+        if has_sectors:
+            district, sector = record.get("district"), record.get("sector")
+            record["location"] = f"{district}{LOCATION_SEPARATOR}{sector}" if district and sector else None
+        yield line, {field: record[field] for field in IMPORT_FIELDS if field in record}
+
+
+def import_schools(records, user=None, chunk_size=1000, dry_run=False):
+    """
+    Validate ``records`` (from ``iter_records``) against SchoolSerializer
+    and upsert them on (name, location) with chunked ``bulk_create``. Rows
+    that fail validation are reported, not imported. Bulk writes bypass
+    signals, so table versions, caches and rollups are refreshed here.
+    Returns a stats dict with per-row errors.
+    """
+    started = time.perf_counter()
+    validator = SchoolSerializer()
+    # The (name, location) uniqueness check would cost a query per row and
+    # reject exactly the rows an upsert is meant to update.
+    validator.validators = []
+    stats = {"rows": 0, "created": 0, "updated": 0, "invalid": 0, "errors": []}
+    locations = set()
+    updated_ids = []
+    batch = {}
+
+    def flush():
+        created, ids = _upsert(list(batch.values()), dry_run)
+        stats["created"] += created
+        stats["updated"] += len(ids)
+        updated_ids.extend(ids)
+        batch.clear()
+
+    with transaction.atomic():
+        for line, record in records:
+            stats["rows"] += 1
+            try:
+                data = validator.run_validation(record)
+                for field in KEY_FIELDS:
+                    if not data.get(field):
+                        raise ValidationError({field: ["This field is required."]})
+            except ValidationError as error:
+                stats["invalid"] += 1
+                if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+                    stats["errors"].append({"line": line, "errors": error.detail})
+                continue
+            # A key repeated in the file keeps its last row, as a sequence of
+            # single-row upserts would.
+            batch[(data["name"], data["location"])] = data
+            locations.add(data["location"])
+            if len(batch) >= chunk_size:
+                flush()
+        if batch:
+            flush()
+
+        if not dry_run and (stats["created"] or stats["updated"]):
+            bump(School)
+            refresh_locations(locations)
+        if dry_run:
+            transaction.set_rollback(True)
+
+    if not dry_run:
+        school_cache.invalidate(*updated_ids)
+        user_cache.invalidate(*User.objects.filter(school_id__in=updated_ids).values_list("pk", flat=True))
+
+    seconds = time.perf_counter() - started
+    imported = stats["created"] + stats["updated"]
+    stats.update({
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(stats["rows"] / seconds) if seconds else stats["rows"],
+        "errors_truncated": stats["invalid"] > len(stats["errors"]),
+        "dry_run": dry_run,
+    })
+    if not dry_run and imported:
+        record_action(
+            user=user,
+            action='CREATE',
+            model_name='School',
+            details={'bulk_import': True, **{key: stats[key] for key in ("rows", "created", "updated", "invalid")}},
+        )
+    return stats
+
+
+def _upsert(rows, dry_run):
+    """Upsert one chunk. Returns ``(created count, ids of updated schools)``."""
+    names = {row["name"] for row in rows}
+    existing = {
+        (name, location): pk
+        for pk, name, location in School.objects.filter(name__in=names).values_list("pk", "name", "location")
+    }
+    updated = [existing[key] for key in ((row["name"], row["location"]) for row in rows) if key in existing]
+    if dry_run:
+        return len(rows) - len(updated), updated
+
+    # Columns missing from the file, or left blank in a row, keep their
+    # model default on insert and their stored value on update. Rows are
+    # grouped by the columns they provide so each group is one upsert.
+    groups = {}
+    for row in rows:
+        values = {field: value for field, value in row.items() if value is not None}
+        groups.setdefault(frozenset(values), []).append(School(**values))
+    for provided, schools in groups.items():
+        update_fields = sorted(provided - set(KEY_FIELDS))
+        School.objects.bulk_create(
+            schools,
+            update_conflicts=bool(update_fields),
+            ignore_conflicts=not update_fields,
+            unique_fields=list(KEY_FIELDS) if update_fields else None,
+            update_fields=update_fields or None,
+        )
+    return len(rows) - len(updated), updated
@@ -0,0 +1,82 @@
+from django.db import transaction
+from django.db.models import F
+
+from .models import Notification, NotificationAudienceCounter, NotificationReadCursor
+from .notification_stream import audience_filter
+
+
+def record_delivery(notification):
+    """Count a new notification against its audience. Called from post_save."""
+    sector = notification.sector or ""
+    updated = NotificationAudienceCounter.objects.filter(role=notification.role, sector=sector).update(
+        total=F("total") + 1
+    )
+    if not updated:
+        counter, created = NotificationAudienceCounter.objects.get_or_create(
+            role=notification.role, sector=sector, defaults={"total": 1}
+        )
+        if not created:
+            NotificationAudienceCounter.objects.filter(pk=counter.pk).update(total=F("total") + 1)
+
+
+def record_removal(notification):
+    """
+    Undo ``record_delivery`` for a deleted notification. Readers who had
+    already seen it also drop it from ``seen_total`` so their unread count
+    stays put. Called from post_delete.
+    """
+    sector = notification.sector or ""
+    NotificationAudienceCounter.objects.filter(role=notification.role, sector=sector, total__gt=0).update(
+        total=F("total") - 1
+    )
+    readers = NotificationReadCursor.objects.filter(
+        user__role=notification.role, last_read_id__gte=notification.pk, seen_total__gt=0
+    )
+    if sector:
+        readers = readers.filter(user__sector=sector)
+    readers.update(seen_total=F("seen_total") - 1)
+
+
+def visible_total(user):
+    """Notifications ever addressed to the user's role, role-wide or to their sector."""
+    sectors = [""] + ([user.sector] if user.sector else [])
+    totals = NotificationAudienceCounter.objects.filter(role=user.role, sector__in=sectors).values_list(
+        "total", flat=True
+    )
+    return sum(totals)
+
+
+def visible_notifications(user):
+    return Notification.objects.filter(audience_filter(user.role, user.sector))
+
+
+def get_cursor(user):
+    cursor, _ = NotificationReadCursor.objects.get_or_create(user=user)
+    return cursor
+
+
+def unread_count(user, cursor=None):
+    """Two indexed lookups, whatever the size of the notification table."""
+    cursor = cursor or get_cursor(user)
+    return max(visible_total(user) - cursor.seen_total, 0)
+
+
+def mark_read(user, up_to_id=None):
+    """
+    Mark everything up to ``up_to_id`` (default: the newest visible
+    notification) as read. The cursor never moves backwards.
+    """
+    with transaction.atomic():
+        cursor, _ = NotificationReadCursor.objects.select_for_update().get_or_create(user=user)
+        visible = visible_notifications(user)
+        newest = visible.order_by("-id").values_list("id", flat=True).first() or 0
+        up_to_id = newest if up_to_id is None else min(up_to_id, newest)
+        if up_to_id <= cursor.last_read_id:
+            return cursor
+
+        total = visible_total(user)
+        still_unread = 0 if up_to_id == newest else visible.filter(id__gt=up_to_id).count()
+        cursor.last_read_id = up_to_id
+        cursor.seen_total = max(total - still_unread, 0)
+        cursor.save()
+    return cursor
@@ -0,0 +1,241 @@
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+# Tasks registered with atomic=False manage their own transactions.
+NON_ATOMIC_TASKS = set()
+
+
+def _setting(name, default):
+    return getattr(settings, f"SIPMS_JOBS_{name}", default)
+
+
+def task(name, atomic=True):
+    """
+    Register a function as the handler for jobs named ``name``. Long-running
+    handlers pass ``atomic=False`` and open their own, short transactions;
+    on SQLite one transaction around the whole handler would hold the write
+    lock for its entire run.
+    """
+    def register(func):
+        TASKS[name] = func
+        if atomic:
+            NON_ATOMIC_TASKS.discard(name)
+        else:
+            NON_ATOMIC_TASKS.add(name)
+        return func
+    return register
+
+
+def enqueue(name, payload=None, idempotency_key=None, max_attempts=None, delay=0):
+    """
+    Queue ``name`` with keyword arguments ``payload`` (must be JSON-safe).
+
+    The row is written in the caller's transaction, so a job exists only if
+    the change that caused it commits. A repeated ``idempotency_key`` returns
+    the job already queued under it. With SIPMS_JOBS_EAGER the job runs
+    before this returns.
+    """
+    if name not in TASKS:
+        raise KeyError(f"Unknown task {name!r}")
+    fields = {
+        "task": name,
+        "payload": payload or {},
+        "max_attempts": max_attempts or _setting("MAX_ATTEMPTS", 5),
+        "run_at": timezone.now() + timedelta(seconds=delay),
+    }
+    if idempotency_key:
+        job, created = Job.objects.get_or_create(idempotency_key=idempotency_key, defaults=fields)
+    else:
+        job, created = Job.objects.create(**fields), True
+    if created and _setting("EAGER", False):
+        Job.objects.filter(pk=job.pk).update(status="running", locked_by="eager", attempts=F("attempts") + 1)
+        job.refresh_from_db()
+        execute(job)
+        job.refresh_from_db()
+    return job
+
+
+def backoff(attempt):
+    """Seconds to wait before retry number ``attempt``: exponential, capped, jittered."""
+    base = _setting("RETRY_BASE_SECONDS", 5)
+    cap = _setting("RETRY_MAX_SECONDS", 3600)
+    return min(cap, base * 2 ** (attempt - 1)) * random.uniform(0.8, 1.2)
+
+
+def claim(worker_id, limit=1):
+    """Mark up to ``limit`` due jobs as running for ``worker_id`` and return them."""
+    now = timezone.now()
+    with transaction.atomic():
+        queryset = Job.objects.filter(status="queued", run_at__lte=now).order_by("run_at", "id")
+        # PostgreSQL workers skip each other's rows; SQLite's IMMEDIATE
+        # transactions already serialize claims.
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        jobs = list(queryset[:limit])
+        if jobs:
+            Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                status="running", locked_by=worker_id, locked_at=now, attempts=F("attempts") + 1
+            )
+    for job in jobs:
+        job.status, job.locked_by, job.locked_at = "running", worker_id, now
+        job.attempts += 1
+    return jobs
+
+
+class _Heartbeat(threading.Thread):
+    # Refreshes a running job's lease so release_expired does not requeue a
+    # handler that is slow rather than dead.
+
+    def __init__(self, job, interval):
+        super().__init__(name=f"job-heartbeat-{job.pk}", daemon=True)
+        self.job = job
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    Job.objects.filter(pk=self.job.pk, status="running", locked_by=self.job.locked_by).update(
+                        locked_at=timezone.now()
+                    )
+                except Exception:
+                    logger.exception("Could not refresh the lease of job %s", self.job.pk)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class LeaseLost(Exception):
+    """The job was requeued or claimed by another worker while this one held it."""
+
+
+def _owned(job):
+    # The job's row, only while this worker still holds its lease.
+    return Job.objects.filter(pk=job.pk, status="running", locked_by=job.locked_by)
+
+
+def _finish(job, result):
+    if not _owned(job).update(
+        status="succeeded", result=result, finished_at=timezone.now(), last_error="", locked_by="", locked_at=None
+    ):
+        raise LeaseLost(f"Job {job.pk} lost its lease before it finished")
+
+
+def execute(job):
+    """
+    Run a claimed job. The handler runs in a transaction unless its task was
+    registered with ``atomic=False``, so a failed attempt leaves nothing
+    behind and the retry starts clean. While it runs, a heartbeat keeps the
+    lease fresh. Every write to the job row is conditional on this worker
+    still holding the lease; an atomic handler's writes commit only together
+    with its ``succeeded`` status. Returns True on success.
+    """
+    handler = TASKS.get(job.task)
+    if not _owned(job).update(locked_at=timezone.now()):
+        logger.warning("Job %s (%s) lost its lease before it started", job.pk, job.task)
+        return False
+    heartbeat = None
+    # Eager jobs run inside the caller's transaction; there is no lease to
+    # keep, and on SQLite a second connection would wait on its write lock.
+    if job.locked_by != "eager":
+        heartbeat = _Heartbeat(job, _setting("LEASE_SECONDS", 300) / 3)
+        heartbeat.start()
+    try:
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for {job.task!r}")
+            if job.task in NON_ATOMIC_TASKS:
+                result = handler(**job.payload)
+                _finish(job, result)
+            else:
+                with transaction.atomic():
+                    _finish(job, handler(**job.payload))
+        finally:
+            if heartbeat is not None:
+                heartbeat.stop()
+    except LeaseLost:
+        logger.warning("Job %s (%s) lost its lease while running; its result was discarded", job.pk, job.task)
+        return False
+    except Exception:
+        error = traceback.format_exc()
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            delay = backoff(job.attempts)
+            _owned(job).update(
+                status="queued", run_at=now + timedelta(seconds=delay), last_error=error, locked_by="", locked_at=None
+            )
+            logger.warning("Job %s (%s) failed, retry %d in %.0fs", job.pk, job.task, job.attempts, delay)
+        else:
+            _owned(job).update(
+                status="failed", finished_at=now, last_error=error, locked_by="", locked_at=None
+            )
+            logger.error("Job %s (%s) failed permanently after %d attempts", job.pk, job.task, job.attempts)
+        return False
+    return True
+
+
+def release_expired(lease_seconds=None):
+    """Requeue jobs whose worker died mid-run. Returns the number requeued."""
+    if lease_seconds is None:
+        lease_seconds = _setting("LEASE_SECONDS", 300)
+    cutoff = timezone.now() - timedelta(seconds=lease_seconds)
+    stale = Job.objects.filter(status="running", locked_at__lt=cutoff)
+    stale.filter(attempts__gte=F("max_attempts")).update(
+        status="failed", finished_at=timezone.now(), last_error="Worker lease expired.", locked_by="", locked_at=None
+    )
+    return stale.update(status="queued", locked_by="", locked_at=None)
+
+
+def run_worker(worker_id=None, poll_interval=None, once=False, stop=None):
+    """
+    Claim and run jobs until ``stop`` is set, or, with ``once``, until none
+    are due. Returns the number of jobs run. Jobs are claimed one at a time:
+    only the running job has a heartbeat, so a claimed job left waiting
+    behind a slow one would outlive its lease and run twice.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    if poll_interval is None:
+        poll_interval = _setting("POLL_INTERVAL", 1.0)
+    processed = 0
+    while stop is None or not stop.is_set():
+        close_old_connections()
+        release_expired()
+        jobs = claim(worker_id)
+        for job in jobs:
+            execute(job)
+            processed += 1
+        if not jobs:
+            if once:
+                break
+            if stop is not None:
+                stop.wait(poll_interval)
+            else:
+                time.sleep(poll_interval)
+    return processed
+
+
+def queue_stats():
+    counts = {status: 0 for status, _ in Job.STATUS_CHOICES}
+    for row in Job.objects.order_by().values("status").annotate(total=Count("id")):
+        counts[row["status"]] = row["total"]
+    return counts
@@ -0,0 +1,40 @@
+from django.conf import settings
+
+from .authentication import ClaimsRefreshToken
+from .models import User
+
+SLIM_USER_FIELDS = ("id", "role", "sector", "school_id")
+
+
+def find_user(email):
+    """One indexed query; the school is joined so the full response needs no second one."""
+    return User.objects.select_related("school").filter(email=email).first()
+
+
+def verify_password(user, password):
+    """
+    Check ``password`` for ``user``. A hash stored at another hasher cost is
+    replaced on success. An unknown email still pays for one hash, so
+    response time does not reveal which addresses have accounts.
+    """
+    if user is None:
+        User().set_password(password)
+        return False
+    return user.check_password(password)
+
+
+def issue_tokens(user):
+    refresh = ClaimsRefreshToken.for_user(user)
+    return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+
+def slim_user_data(user):
+    return {field: getattr(user, field) for field in SLIM_USER_FIELDS}
+
+
+def use_slim_response(request):
+    """``?slim=1`` or ``{"slim": true}`` asks for the slim body; SIPMS_LOGIN_SLIM makes it the default."""
+    value = request.query_params.get("slim", request.data.get("slim"))
+    if value is None:
+        return getattr(settings, "SIPMS_LOGIN_SLIM", False)
+    return str(value).lower() in ("1", "true", "yes")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from sipms_app.archival import archive_before, retention_cutoff
+from sipms_app.models import ActionLog
+
+
+class Command(BaseCommand):
+    help = "Move ActionLog rows older than the retention window into gzip'd JSONL archives."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            help="Full months to keep in the table (default: SIPMS_ACTIONLOG_RETENTION_MONTHS).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many rows would be archived.")
+
+    def handle(self, *args, **options):
+        cutoff = retention_cutoff(options["months"])
+        if options["dry_run"]:
+            count = ActionLog.objects.filter(timestamp__lt=cutoff).count()
+            self.stdout.write(f"{count} rows older than {cutoff:%Y-%m-%d} would be archived.")
+            return
+
+        for archive in archive_before(cutoff):
+            self.stdout.write(f"{archive.month:%Y-%m}: {archive.row_count} rows -> {archive.path}")
+        self.stdout.write(self.style.SUCCESS(f"Archived everything before {cutoff:%Y-%m-%d}."))
@@ -0,0 +1,95 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.test import APIRequestFactory
+
+from sipms_app import views
+from sipms_app.models import PredictionReport
+
+# (label, list view, query params) for every paginated list endpoint and the
+# filters the frontend actually sends.
+VIEW_SCENARIOS = [
+    ("users", views.UserListView, {}),
+    ("schools", views.SchoolListCreateView, {}),
+    ("schools by location", views.SchoolListCreateView, {"location": "Gasabo - Kinyinya"}),
+    ("predictions", views.PredictionListCreateView, {}),
+    ("predictions by location", views.PredictionListCreateView, {"location": "Gasabo - Kinyinya"}),
+    ("predictions needing rooms", views.PredictionListCreateView, {"needs_rooms": "1"}),
+    ("predictions pending", views.PredictionListCreateView, {"approved_by_district": "0", "approved_by_mineduc": "0"}),
+    ("projects", views.ProjectListCreateView, {}),
+    ("budget", views.BudgetTrackingListCreateView, {}),
+    ("notifications", views.NotificationListCreateView, {}),
+    ("prediction reports", views.PredictionReportListCreateView, {}),
+    ("prediction reports by location", views.PredictionReportListCreateView, {"location": "Gasabo"}),
+    ("action logs", views.ActionLogListView, {}),
+    ("action logs by user", views.ActionLogListView, {"user": 1}),
+    ("action logs by object", views.ActionLogListView, {"model_name": "PredictionReport", "object_id": 1}),
+]
+
+# Querysets built outside generic list views.
+QUERYSET_SCENARIOS = [
+    ("reports by exact location", lambda: PredictionReport.objects.filter(location__iexact="Gasabo - Kinyinya")),
+    ("reports by status", lambda: PredictionReport.objects.filter(status="pending")),
+]
+
+# SQLite prints a bare "SCAN <table>" for a full table scan; "SCAN <table>
+# USING INDEX" walks an index in list order and stops at the LIMIT, so it is
+# not flagged. PostgreSQL prints "Seq Scan".
+SEQUENTIAL_SCAN = re.compile(r"\bSCAN (?!CONSTANT ROW)\S+(?: AS \S+)?$|\bSeq Scan\b", re.MULTILINE)
+# Every matching row is read and sorted before the first page is returned.
+FULL_SORT = re.compile(r"\bUSE TEMP B-TREE FOR ORDER BY\b")
+
+# Scenarios where a full sort is expected and bounded. Predictions have no
+# location column: one sector's rows are found through its schools and
+# sorted, which stays small however large the table grows.
+BOUNDED_SORTS = {"predictions by location"}
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on the query behind each list view and flag sequential scans and full sorts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--strict", action="store_true", help="Exit non-zero if any plan is flagged.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan, not just flagged ones.")
+
+    def handle(self, *args, **options):
+        flagged = []
+        for label, queryset in self.querysets():
+            plan = queryset.explain()
+            if SEQUENTIAL_SCAN.search(plan):
+                problem = "SEQ SCAN"
+            elif FULL_SORT.search(plan) and label not in BOUNDED_SORTS:
+                problem = "FULL SORT"
+            else:
+                problem = None
+            is_flagged = problem is not None
+            status = self.style.WARNING(problem) if is_flagged else self.style.SUCCESS("ok")
+            self.stdout.write(f"{label:>32}: {status}")
+            if is_flagged or options["verbose_plans"]:
+                self.stdout.write("\n".join("    " + line for line in plan.splitlines()))
+            if is_flagged:
+                flagged.append(label)
+
+        self.stdout.write(f"Backend: {connection.vendor}. Small tables may legitimately be scanned; "
+                          "run against production-sized data.")
+        if flagged and options["strict"]:
+            raise CommandError(f"Sequential scans or full sorts in: {', '.join(flagged)}")
+
+    def querysets(self):
+        factory = APIRequestFactory()
+        for label, view_class, params in VIEW_SCENARIOS:
+            request = factory.get("/", params, SERVER_NAME="localhost")
+            view = view_class()
+            view.setup(request)
+            view.request = view.initialize_request(request)
+            view.format_kwarg = None
+            yield label, self.first_page(view, view.get_queryset())
+        for label, build in QUERYSET_SCENARIOS:
+            yield label, build()
+
+    def first_page(self, view, queryset):
+        # Mirror what the cursor paginator sends for the first page.
+        paginator = view.pagination_class()
+        ordering = paginator.get_ordering(view.request, queryset, view)
+        return queryset.order_by(*ordering)[:paginator.get_page_size(view.request) + 1]
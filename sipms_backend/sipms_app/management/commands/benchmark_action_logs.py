@@ -0,0 +1,83 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from sipms_app.models import ActionLog, User
+from sipms_app.views import ActionLogListView
+
+ACTIONS = [choice for choice, _ in ActionLog.ACTION_CHOICES]
+MODELS = ["School", "Prediction", "PredictionReport", "User", "Notification"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time filtered ActionLogListView requests against the configured database. "
+        "--seed adds synthetic rows first, so only use it on a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0, help="Top the table up to this many rows first.")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--threshold-ms", type=float, default=50.0)
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            self.seed(options["seed"])
+
+        total = ActionLog.objects.count()
+        sample = ActionLog.objects.order_by("-id").first()
+        if sample is None:
+            self.stdout.write("ActionLog is empty; run with --seed N.")
+            return
+
+        since = (timezone.now() - timedelta(days=7)).date().isoformat()
+        scenarios = {
+            "latest page": {},
+            "by user": {"user": sample.user_id or ""},
+            "by action": {"action": "APPROVE"},
+            "by object": {"model_name": sample.model_name, "object_id": sample.object_id or ""},
+            "last 7 days": {"since": since},
+            "details.status": {"details.status": "approved", "model_name": "PredictionReport"},
+        }
+
+        factory = APIRequestFactory()
+        view = ActionLogListView.as_view()
+        user = User(username="benchmark", role=User.Role.ADMIN)
+        self.stdout.write(f"ActionLog rows: {total}")
+        for name, params in scenarios.items():
+            timings = []
+            for _ in range(options["repeat"]):
+                request = factory.get("/api/action-logs/", params, SERVER_NAME="localhost")
+                force_authenticate(request, user=user)
+                started = time.perf_counter()
+                view(request).render()
+                timings.append((time.perf_counter() - started) * 1000)
+            median = statistics.median(timings)
+            p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+            flag = "" if median <= options["threshold_ms"] else "  SLOW"
+            self.stdout.write(f"{name:>15}: median {median:7.2f} ms  p95 {p95:7.2f} ms{flag}")
+
+    def seed(self, target, chunk_size=10000):
+        missing = target - ActionLog.objects.count()
+        user_ids = list(User.objects.values_list("id", flat=True)[:50]) or [None]
+        now = timezone.now()
+        while missing > 0:
+            batch = min(chunk_size, missing)
+            ActionLog.objects.bulk_create([
+                ActionLog(
+                    user_id=random.choice(user_ids),
+                    action=random.choice(ACTIONS),
+                    model_name=random.choice(MODELS),
+                    object_id=random.randint(1, 50000),
+                    details={"status": random.choice(["approved", "denied", "pending"])},
+                    timestamp=now - timedelta(seconds=random.randint(0, 730 * 86400)),
+                )
+                for _ in range(batch)
+            ])
+            missing -= batch
+            self.stdout.write(f"seeded {target - missing}/{target}")
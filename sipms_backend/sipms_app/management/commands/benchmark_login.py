@@ -0,0 +1,79 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from sipms_app.hashers import pbkdf2_iterations
+from sipms_app.login import find_user, issue_tokens, slim_user_data, verify_password
+from sipms_app.models import School, User
+from sipms_app.serializers import UserSerializer
+
+EMAIL = "login-benchmark@sipms.invalid"
+PASSWORD = "benchmark-Pa55word!"
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time each stage of a login (user lookup, password hash, JWT issuance, "
+        "response serialization) with a throwaway user that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--iterations", type=int, help="PBKDF2 cost to measure instead of SIPMS_PASSWORD_ITERATIONS."
+        )
+        parser.add_argument("--slim", action="store_true", help="Serialize the slim login response.")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"] or pbkdf2_iterations()
+        with override_settings(SIPMS_PASSWORD_ITERATIONS=iterations):
+            try:
+                with transaction.atomic():
+                    self.run(iterations, options["repeat"], options["slim"])
+                    raise Rollback
+            except Rollback:
+                pass
+
+    def run(self, iterations, repeat, slim):
+        school = School.objects.create(name="Login benchmark", location="Benchmark - Benchmark")
+        user = User(username=EMAIL, email=EMAIL, role=User.Role.SCHOOL, school=school)
+        # Stored at a different cost, so the first login measures a rehash.
+        with override_settings(SIPMS_PASSWORD_ITERATIONS=iterations + 1):
+            user.set_password(PASSWORD)
+        user.save()
+
+        started = time.perf_counter()
+        verify_password(find_user(EMAIL), PASSWORD)
+        rehash_ms = (time.perf_counter() - started) * 1000
+
+        stages = {"lookup": [], "hash": [], "jwt": [], "serialize": [], "total": []}
+        for _ in range(repeat):
+            marks = [time.perf_counter()]
+            user = find_user(EMAIL)
+            marks.append(time.perf_counter())
+            assert verify_password(user, PASSWORD)
+            marks.append(time.perf_counter())
+            issue_tokens(user)
+            marks.append(time.perf_counter())
+            if slim:
+                slim_user_data(user)
+            else:
+                UserSerializer(user).data
+            marks.append(time.perf_counter())
+            for name, start, end in zip(stages, marks, marks[1:]):
+                stages[name].append((end - start) * 1000)
+            stages["total"].append((marks[-1] - marks[0]) * 1000)
+
+        self.stdout.write(f"PBKDF2 iterations: {iterations}  response: {'slim' if slim else 'full'}")
+        for name, timings in stages.items():
+            self.stdout.write(f"{name:>10}: median {statistics.median(timings):8.2f} ms")
+        self.stdout.write(f"{'rehash':>10}: {rehash_ms:8.2f} ms (first login after a cost change)")
+        per_second = 1000 / statistics.median(stages["total"])
+        self.stdout.write(self.style.SUCCESS(f"~{per_second:.1f} logins/sec per worker process"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from sipms_app.benchmarks import BUDGETS_US, measure_serializers
+
+
+class Command(BaseCommand):
+    help = (
+        "Time constructing each serializer and rendering one unsaved sample "
+        "object, the per-row cost of a detail response. Touches no database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=200)
+        parser.add_argument("--check", action="store_true", help="Exit non-zero if any serializer exceeds its budget.")
+        parser.add_argument("--tolerance", type=float, default=1.0, help="Multiply every budget, for slow hosts.")
+
+    def handle(self, *args, **options):
+        over = []
+        for name, micros in measure_serializers(options["repeat"]).items():
+            budget = BUDGETS_US[name] * options["tolerance"]
+            flag = ""
+            if micros > budget:
+                over.append(name)
+                flag = self.style.WARNING(f"  over budget ({budget:.0f} us)")
+            self.stdout.write(f"{name:>34}: {micros:8.1f} us/op  {1e6 / micros:10.0f} ops/sec{flag}")
+        if over and options["check"]:
+            raise CommandError(f"Over budget: {', '.join(over)}")
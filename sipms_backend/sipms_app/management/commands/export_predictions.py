@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from sipms_app.exports import FORMATS, generate_report
+from sipms_app.models import User
+
+
+class Command(BaseCommand):
+    help = "Export the latest prediction of every school to CSV/XLSX/PDF and attach it as a PredictionReport."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--created-by", required=True, help="Email of the user the report is attributed to.")
+        parser.add_argument("--format", choices=FORMATS, default="csv")
+        parser.add_argument("--district", help='District name, e.g. "Gasabo".')
+        parser.add_argument("--location", help='Sector location, e.g. "Gasabo - Kinyinya".')
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options["created_by"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['created_by']}")
+
+        report, rows = generate_report(
+            user, options["format"], options["district"], options["location"], chunk_size=options["chunk_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Report {report.id}: {rows} schools, {report.size} bytes -> {report.document.name}"
+        ))
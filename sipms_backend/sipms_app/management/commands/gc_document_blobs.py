@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from sipms_app.blobs import adopt_legacy_documents, collect_garbage, recount_references
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount document blob references and delete unreferenced blobs and orphaned "
+        "files under MEDIA_ROOT/prediction_reports/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be deleted.")
+        parser.add_argument(
+            "--grace-minutes",
+            type=int,
+            default=60,
+            help="Leave files younger than this alone (uploads in flight).",
+        )
+        parser.add_argument(
+            "--adopt-legacy",
+            action="store_true",
+            help="First move reports stored before content addressing into shared blobs.",
+        )
+
+    def handle(self, *args, **options):
+        if options["adopt_legacy"] and not options["dry_run"]:
+            adopted, freed = adopt_legacy_documents()
+            self.stdout.write(f"Adopted {adopted} legacy documents, freeing {freed} bytes of duplicates.")
+        if not options["dry_run"]:
+            fixed = recount_references()
+            if fixed:
+                self.stdout.write(self.style.WARNING(f"Corrected ref_count on {fixed} blobs."))
+
+        blobs, files, size = collect_garbage(options["grace_minutes"] * 60, dry_run=options["dry_run"])
+        verb = "Would remove" if options["dry_run"] else "Removed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {blobs} blobs and {files} orphaned files ({size} bytes)."))
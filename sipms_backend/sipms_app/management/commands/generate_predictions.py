@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from sipms_app.bulk import filter_schools, generate_predictions
+from sipms_app.models import School, User
+
+
+class Command(BaseCommand):
+    help = "Generate a prediction for every school, optionally limited to one district or sector."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--created-by", required=True, help="Email of the user the predictions are attributed to.")
+        parser.add_argument("--district", help='District name, e.g. "Gasabo".')
+        parser.add_argument("--location", help='Sector location, e.g. "Gasabo - Kinyinya".')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options["created_by"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['created_by']}")
+
+        schools = filter_schools(School.objects.all(), options["district"], options["location"])
+        stats = generate_predictions(schools, user)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {stats['created']} predictions across {stats['sectors']} sector(s) "
+            f"in {stats['seconds']}s ({stats['rows_per_second']} rows/s)."
+        ))
+
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from sipms_app.imports import import_schools, iter_records
+from sipms_app.models import User
+
+
+class Command(BaseCommand):
+    help = "Create or update schools from a CSV or XLSX file, matching existing ones on name and location."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or XLSX file with a header row.")
+        parser.add_argument("--created-by", required=True, help="Email of the user the import is attributed to.")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="Validate every row without writing.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options["created_by"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['created_by']}")
+
+        with open(options["path"], "rb") as stream:
+            stats = import_schools(
+                iter_records(stream, options["path"]),
+                user=user,
+                chunk_size=options["chunk_size"],
+                dry_run=options["dry_run"],
+            )
+        for error in stats["errors"]:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        if stats["errors_truncated"]:
+            self.stderr.write(f"... {stats['invalid'] - len(stats['errors'])} more invalid row(s)")
+        prefix = "Dry run: " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{stats['created']} created, {stats['updated']} updated, {stats['invalid']} invalid "
+            f"of {stats['rows']} row(s) in {stats['seconds']}s ({stats['rows_per_second']} rows/s)."
+        ))
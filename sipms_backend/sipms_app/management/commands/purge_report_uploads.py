@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from sipms_app.uploads import purge_stale
+
+
+class Command(BaseCommand):
+    help = "Delete resumable report uploads that were never completed, and their partial files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=int,
+            help="Age since the last chunk (default: SIPMS_UPLOAD_STALE_HOURS).",
+        )
+
+    def handle(self, *args, **options):
+        count = purge_stale(options["hours"])
+        self.stdout.write(self.style.SUCCESS(f"Purged {count} stale uploads."))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from sipms_app.rollups import find_drift, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-sector infrastructure gap rollup, or check it for drift with --check."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only compare the stored rollup with live data; exit non-zero on drift.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            drift = find_drift()
+            for location, stored, expected in drift:
+                self.stdout.write(f"{location}: stored={stored} expected={expected}")
+            if drift:
+                raise CommandError(f"{len(drift)} sector(s) out of sync; run rebuild_gap_rollup to fix.")
+            self.stdout.write(self.style.SUCCESS("Rollup is in sync."))
+            return
+
+        count = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollup for {count} sector(s)."))
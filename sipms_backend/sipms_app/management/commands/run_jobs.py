@@ -0,0 +1,55 @@
+import multiprocessing
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from sipms_app.jobs import queue_stats, run_worker
+
+
+def _worker(poll_interval):
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stop.set())
+    signal.signal(signal.SIGINT, lambda *args: stop.set())
+    run_worker(poll_interval=poll_interval, stop=stop)
+
+
+class Command(BaseCommand):
+    help = "Run background job workers against the database-backed queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=getattr(settings, "SIPMS_JOBS_WORKERS", 2),
+            help="Worker processes to fork (default: SIPMS_JOBS_WORKERS).",
+        )
+        parser.add_argument("--poll-interval", type=float, help="Seconds between polls of an empty queue.")
+        parser.add_argument("--once", action="store_true", help="Run every due job in this process, then exit.")
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            processed = run_worker(poll_interval=options["poll_interval"], once=True)
+            self.stdout.write(f"Ran {processed} jobs. Queue: {queue_stats()}")
+            return
+
+        # Children must open their own database connections.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_worker, args=(options["poll_interval"],), daemon=True)
+            for _ in range(max(options["workers"], 1))
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {len(workers)} job workers; Ctrl-C to stop.")
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.join()
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:42
+
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum
+
+
+def seed_rollup(apps, schema_editor):
+    # Existing predictions would otherwise read as zeros until someone runs
+    # `manage.py rebuild_gap_rollup`. The aggregation is a copy of what the
+    # app did at this point, over every prediction, so later changes to
+    # sipms_app.rollups don't change what this migration computes.
+    Prediction = apps.get_model('sipms_app', 'Prediction')
+    BudgetTracking = apps.get_model('sipms_app', 'BudgetTracking')
+    InfrastructureGapRollup = apps.get_model('sipms_app', 'InfrastructureGapRollup')
+
+    rows = {}
+    predictions = Prediction.objects.order_by().values(location=F('school__location')).annotate(
+        total_schools=Count('school', distinct=True),
+        total_predictions=Count('id'),
+        total_required_rooms=Sum('required_rooms'),
+        total_rooms_to_build=Sum('rooms_to_build'),
+        total_estimated_budget=Sum('estimated_budget'),
+        district_approved=Count('id', filter=Q(approved_by_district=True)),
+        mineduc_approved=Count('id', filter=Q(approved_by_mineduc=True)),
+        pending=Count('id', filter=Q(approved_by_district=False, approved_by_mineduc=False)),
+    )
+    for row in predictions:
+        rows[row.pop('location')] = row
+    budgets = BudgetTracking.objects.order_by().values(location=F('project__prediction__school__location')).annotate(
+        total_allocated_budget=Sum('allocated_budget'),
+        total_spent_budget=Sum('spent_budget'),
+    )
+    for row in budgets:
+        rows.setdefault(row.pop('location'), {}).update(row)
+
+    InfrastructureGapRollup.objects.bulk_create(
+        InfrastructureGapRollup(
+            location=location,
+            district=location.partition(' - ')[0],
+            **{field: value or 0 for field, value in values.items()},
+        )
+        for location, values in rows.items()
+        if location
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sipms_app', '0009_actionlog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InfrastructureGapRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.CharField(max_length=255, unique=True)),
+                ('district', models.CharField(db_index=True, max_length=255)),
+                ('total_schools', models.PositiveIntegerField(default=0)),
+                ('total_predictions', models.PositiveIntegerField(default=0)),
+                ('total_required_rooms', models.PositiveIntegerField(default=0)),
+                ('total_rooms_to_build', models.PositiveIntegerField(default=0)),
+                ('total_estimated_budget', models.DecimalField(decimal_places=2, default=0.0, max_digits=18)),
+                ('total_allocated_budget', models.DecimalField(decimal_places=2, default=0.0, max_digits=18)),
+                ('total_spent_budget', models.DecimalField(decimal_places=2, default=0.0, max_digits=18)),
+                ('district_approved', models.PositiveIntegerField(default=0)),
+                ('mineduc_approved', models.PositiveIntegerField(default=0)),
+                ('pending', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['location'],
+            },
+        ),
+        migrations.RunPython(seed_rollup, migrations.RunPython.noop),
+    ]
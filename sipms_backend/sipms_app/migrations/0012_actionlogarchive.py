@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:44
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sipms_app', '0011_actionlog_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActionLogArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(db_index=True)),
+                ('path', models.CharField(max_length=500, unique=True)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('sha256', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-month', '-created_at'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='actionlog',
+            name='timestamp',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:45
+
+from django.db import migrations, models
+
+
+def create_details_gin_index(apps, schema_editor):
+    # Only PostgreSQL can index JSON containment; other backends scan details.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS actionlog_details_gin_idx '
+            'ON sipms_app_actionlog USING gin (details jsonb_path_ops)'
+        )
+
+
+def drop_details_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS actionlog_details_gin_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sipms_app', '0012_actionlogarchive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='actionlog',
+            index=models.Index(fields=['user', '-timestamp'], name='actionlog_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actionlog',
+            index=models.Index(fields=['action', '-timestamp'], name='actionlog_action_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actionlog',
+            index=models.Index(fields=['model_name', '-timestamp'], name='actionlog_model_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actionlog',
+            index=models.Index(fields=['model_name', 'object_id', '-timestamp'], name='actionlog_object_ts_idx'),
+        ),
+        migrations.RunPython(create_details_gin_index, drop_details_gin_index),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:48
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def create_location_trigram_index(apps, schema_editor):
+    # location__icontains is UPPER(location) LIKE UPPER('%...%') on PostgreSQL,
+    # which only a trigram index can serve.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS report_location_trgm_idx '
+            'ON prediction_reports USING gin (UPPER(location) gin_trgm_ops)'
+        )
+
+
+def drop_location_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS report_location_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('sipms_app', '0013_actionlog_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='budgettracking',
+            index=models.Index(fields=['-created_at', '-id'], name='budget_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['role', '-created_at'], name='notification_role_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['-created_at', '-id'], name='notification_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prediction',
+            index=models.Index(fields=['school', '-created_at'], name='prediction_school_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prediction',
+            index=models.Index(fields=['-created_at', '-id'], name='prediction_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionreport',
+            index=models.Index(django.db.models.functions.text.Upper('location'), name='report_location_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionreport',
+            index=models.Index(fields=['status', '-created_at'], name='report_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionreport',
+            index=models.Index(fields=['-created_at', '-id'], name='report_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_at', '-id'], name='project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='school',
+            index=models.Index(fields=['location'], name='school_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='school',
+            index=models.Index(fields=['-created_at', '-id'], name='school_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'sector'], name='user_role_sector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-date_joined', '-id'], name='user_joined_idx'),
+        ),
+        migrations.RunPython(create_location_trigram_index, drop_location_trigram_index),
+    ]
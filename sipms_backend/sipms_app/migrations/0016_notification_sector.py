@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sipms_app', '0015_tableversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='sector',
+            field=models.CharField(blank=True, max_length=40, null=True),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def seed_audience_counters(apps, schema_editor):
+    Notification = apps.get_model('sipms_app', 'Notification')
+    NotificationAudienceCounter = apps.get_model('sipms_app', 'NotificationAudienceCounter')
+    totals = {}
+    for row in Notification.objects.values('role', 'sector').annotate(total=Count('id')):
+        key = (row['role'], row['sector'] or '')
+        totals[key] = totals.get(key, 0) + row['total']
+    NotificationAudienceCounter.objects.bulk_create(
+        NotificationAudienceCounter(role=role, sector=sector, total=total)
+        for (role, sector), total in totals.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sipms_app', '0016_notification_sector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationAudienceCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('SCHOOL', 'School'), ('UMURENGE', 'Umurenge'), ('DISTRICT', 'District'), ('MINEDUC', 'Mineduc'), ('ADMIN', 'Admin')], max_length=20)),
+                ('sector', models.CharField(blank=True, default='', max_length=40)),
+                ('total', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('role', 'sector'), name='notification_audience_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationReadCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_id', models.PositiveBigIntegerField(default=0)),
+                ('seen_total', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='notification_cursor', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(seed_audience_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:58
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_documents(apps, schema_editor):
+    PredictionReport = apps.get_model('sipms_app', 'PredictionReport')
+    for report in PredictionReport.objects.exclude(document='').iterator():
+        storage = report.document.storage
+        if not storage.exists(report.document.name):
+            continue
+        digest = hashlib.sha256()
+        with storage.open(report.document.name, 'rb') as stream:
+            for block in iter(lambda: stream.read(64 * 1024), b''):
+                digest.update(block)
+        report.sha256 = digest.hexdigest()
+        report.size = storage.size(report.document.name)
+        report.save(update_fields=['sha256', 'size'])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sipms_app', '0018_report_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='predictionreport',
+            name='sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='predictionreport',
+            name='size',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(hash_existing_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:06
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def disambiguate_duplicate_schools(apps, schema_editor):
+    # Existing duplicates keep their rows (and predictions); all but the
+    # oldest get their id appended to the name so the key becomes unique.
+    School = apps.get_model('sipms_app', 'School')
+    duplicates = (
+        School.objects.values('name', 'location').annotate(total=Count('id')).filter(total__gt=1)
+    )
+    for key in duplicates:
+        schools = School.objects.filter(name=key['name'], location=key['location']).order_by('id')
+        for school in schools[1:]:
+            school.name = f"{school.name} (#{school.id})"[:255]
+            school.save(update_fields=['name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sipms_app', '0021_job_queue'),
+    ]
+
+    operations = [
+        migrations.RunPython(disambiguate_duplicate_schools, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='school',
+            constraint=models.UniqueConstraint(fields=('name', 'location'), name='school_name_location_unique'),
+        ),
+    ]
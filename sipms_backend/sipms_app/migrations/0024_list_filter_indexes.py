@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sipms_app', '0023_token_claims_user'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='school',
+            name='school_location_idx',
+        ),
+        migrations.AddIndex(
+            model_name='prediction',
+            index=models.Index(condition=models.Q(('rooms_to_build__gt', 0)), fields=['-created_at', '-id'], name='prediction_needs_rooms_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prediction',
+            index=models.Index(fields=['approved_by_district', 'approved_by_mineduc', '-created_at'], name='prediction_approval_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='school',
+            index=models.Index(fields=['location', '-created_at', '-id'], name='school_location_created_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:34
+
+from django.db import migrations
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+
+
+def rebuild_rollup(apps, schema_editor):
+    # The rollup now counts only each school's latest prediction; recompute
+    # rows that still include superseded ones. The aggregation is a copy of
+    # sipms_app.rollups as of this migration, so later changes there don't
+    # change what it computes.
+    Prediction = apps.get_model('sipms_app', 'Prediction')
+    BudgetTracking = apps.get_model('sipms_app', 'BudgetTracking')
+    InfrastructureGapRollup = apps.get_model('sipms_app', 'InfrastructureGapRollup')
+
+    latest = Prediction.objects.filter(school=OuterRef('school')).order_by('-created_at', '-id').values('pk')[:1]
+    predictions = Prediction.objects.filter(pk=Subquery(latest))
+    budgets = BudgetTracking.objects.filter(project__prediction__in=predictions.values('pk'))
+
+    rows = {}
+    sectors = predictions.order_by().values(location=F('school__location')).annotate(
+        total_schools=Count('school', distinct=True),
+        total_predictions=Count('id'),
+        total_required_rooms=Sum('required_rooms'),
+        total_rooms_to_build=Sum('rooms_to_build'),
+        total_estimated_budget=Sum('estimated_budget'),
+        district_approved=Count('id', filter=Q(approved_by_district=True)),
+        mineduc_approved=Count('id', filter=Q(approved_by_mineduc=True)),
+        pending=Count('id', filter=Q(approved_by_district=False, approved_by_mineduc=False)),
+    )
+    for row in sectors:
+        rows[row.pop('location')] = row
+    totals = budgets.order_by().values(location=F('project__prediction__school__location')).annotate(
+        total_allocated_budget=Sum('allocated_budget'),
+        total_spent_budget=Sum('spent_budget'),
+    )
+    for row in totals:
+        rows.setdefault(row.pop('location'), {}).update(row)
+
+    InfrastructureGapRollup.objects.all().delete()
+    InfrastructureGapRollup.objects.bulk_create(
+        InfrastructureGapRollup(
+            location=location,
+            district=location.partition(' - ')[0],
+            **{field: value or 0 for field, value in values.items()},
+        )
+        for location, values in rows.items()
+        if location
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sipms_app', '0024_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_rollup, migrations.RunPython.noop),
+    ]
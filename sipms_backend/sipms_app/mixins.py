@@ -1,5 +1,9 @@
-from .models import ActionLog
+from .audit import record_action
+from .query_planner import apply_fieldset, parse_fieldset, plan_queryset
+from .table_versions import list_validators
 from django.contrib.auth.models import AnonymousUser
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 
 class ActionLogMixin:
     def log_action(self, request, action, model_name, object_id=None, details=None):
@@ -7,10 +11,60 @@ class ActionLogMixin:
         if hasattr(request, 'user') and not isinstance(request.user, AnonymousUser):
             user = request.user
 
-        ActionLog.objects.create(
+        record_action(
             user=user,
             action=action,
             model_name=model_name,
             object_id=object_id,
             details=details
-        )
\ No newline at end of file
+        )
+
+
+class ConditionalListMixin:
+    """
+    Answer If-None-Match/If-Modified-Since on list endpoints with 304 before
+    the queryset is evaluated. ``etag_models`` lists every table whose rows
+    appear in the response.
+    """
+    etag_models = ()
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = list_validators(request, self.etag_models)
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+        not_modified = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=``/``?expand=`` on GET (see ``parse_fieldset``): the response
+    carries only the selected fields and the queryset loads only their
+    columns and joins. Writes always use the full serializer.
+    """
+
+    def get_fieldset(self):
+        if self.request.method != 'GET':
+            return None
+        return parse_fieldset(self.request.query_params)
+
+    def plan(self, queryset):
+        # The cursor is built from the ordering columns, so they are loaded
+        # even when the response leaves them out.
+        ordering = getattr(self, 'cursor_ordering', None) or getattr(self.paginator, 'ordering', ())
+        include = [field.lstrip('-') for field in ordering]
+        return plan_queryset(queryset, self.get_serializer_class(), self.get_fieldset(), include)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            apply_fieldset(getattr(serializer, 'child', serializer), fieldset)
+        return serializer
@@ -1,5 +1,9 @@
+import uuid
+
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import AbstractUser, Group, Permission
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 class School(models.Model):
@@ -12,6 +16,18 @@ class School(models.Model):
     email = models.EmailField(null=True, blank=True)
     phone = models.CharField(max_length=20, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Covers location lookups and one sector's rows in list order.
+            models.Index(fields=['location', '-created_at', '-id'], name='school_location_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='school_created_idx'),
+        ]
+        constraints = [
+            # Natural key for bulk imports, which upsert on it.
+            models.UniqueConstraint(fields=['name', 'location'], name='school_name_location_unique'),
+        ]
+
     def __str__(self):
         return self.name
     
@@ -34,6 +50,9 @@ class User(AbstractUser):
         blank=True,
         related_name="users"
     )
+    # Bumped whenever a field carried in access-token claims changes (see
+    # signals.py); tokens issued at an older version are not trusted.
+    token_version = models.PositiveIntegerField(default=0)
 
     groups = models.ManyToManyField(
         Group,
@@ -53,13 +72,40 @@ class User(AbstractUser):
         related_query_name="user",
     )
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['role', 'sector'], name='user_role_sector_idx'),
+            models.Index(fields=['-date_joined', '-id'], name='user_joined_idx'),
+        ]
+
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username","role","first_name","last_name"]
 
     def __str__(self):
         return f"{self.username} ({self.role})"
 
-    
+
+class TokenClaimsUser(User):
+    """
+    A User built from access-token claims (id, role, sector, school_id)
+    without a query; every other field is deferred. The first read of one
+    loads the whole row at once through ``load_full_user``, which the
+    authentication class sets to its per-token cache.
+    """
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        loader = getattr(self, "load_full_user", None)
+        deferred = self.get_deferred_fields()
+        if loader is None or from_queryset is not None or not deferred.issuperset(fields or deferred):
+            return super().refresh_from_db(using, fields, from_queryset)
+        full = loader()
+        for attname in deferred:
+            setattr(self, attname, getattr(full, attname))
+
+
 class Prediction(models.Model):
     school = models.ForeignKey(School, on_delete=models.CASCADE)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="predictions")
@@ -70,12 +116,36 @@ class Prediction(models.Model):
     approved_by_mineduc = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['school', '-created_at'], name='prediction_school_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='prediction_created_idx'),
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(rooms_to_build__gt=0),
+                name='prediction_needs_rooms_idx',
+            ),
+            models.Index(
+                fields=['approved_by_district', 'approved_by_mineduc', '-created_at'],
+                name='prediction_approval_idx',
+            ),
+        ]
+
+    STUDENTS_PER_ROOM = 35
+    COST_PER_ROOM = 5000000
+
+    @classmethod
+    def estimate(cls, student_population, number_of_rooms):
+        """Return ``(required_rooms, rooms_to_build, estimated_budget)`` for a school."""
+        required_rooms = (student_population + cls.STUDENTS_PER_ROOM - 1) // cls.STUDENTS_PER_ROOM
+        rooms_to_build = max(required_rooms - number_of_rooms, 0)
+        return required_rooms, rooms_to_build, rooms_to_build * cls.COST_PER_ROOM
+
     def save(self, *args, **kwargs):
         if self.school:
-            self.required_rooms = (self.school.student_population + 34) // 35
-            self.rooms_to_build = max(self.required_rooms - self.school.number_of_rooms, 0)
-            cost_per_room = 5000000
-            self.estimated_budget = self.rooms_to_build * cost_per_room
+            self.required_rooms, self.rooms_to_build, self.estimated_budget = self.estimate(
+                self.school.student_population, self.school.number_of_rooms
+            )
         super().save(*args, **kwargs) 
 
 
@@ -98,6 +168,11 @@ class Project(models.Model):
     is_completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='project_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.project_name} ({self.district.username})"
 
@@ -108,6 +183,11 @@ class BudgetTracking(models.Model):
     remaining_budget = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='budget_created_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         self.remaining_budget = self.allocated_budget - self.spent_budget
         super().save(*args, **kwargs)
@@ -125,13 +205,62 @@ class Notification(models.Model):
 
     role = models.CharField(max_length=20, choices=Role.choices)
     sender = models.CharField(max_length=20, choices=Role.choices)
+    # Optional "<District> - <Sector>" target; empty means every sector
+    sector = models.CharField(max_length=40, null=True, blank=True)
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['role', '-created_at'], name='notification_role_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='notification_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.role} - {self.message[:50]}"
     
 
+class NotificationAudienceCounter(models.Model):
+    # Notifications ever addressed to (role, sector); sector "" means every
+    # sector of that role. Lets unread counts be read without counting rows.
+    role = models.CharField(max_length=20, choices=Notification.Role.choices)
+    sector = models.CharField(max_length=40, blank=True, default="")
+    total = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['role', 'sector'], name='notification_audience_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.role} {self.sector or '*'}: {self.total}"
+
+
+class NotificationReadCursor(models.Model):
+    # Per-user read state for the role-wide inbox: everything up to
+    # last_read_id is read, and seen_total is the audience total at that point.
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='notification_cursor')
+    last_read_id = models.PositiveBigIntegerField(default=0)
+    seen_total = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} read up to {self.last_read_id}"
+
+
+class DocumentBlob(models.Model):
+    # One stored copy per distinct document content. PredictionReports point
+    # at it and ref_count tracks how many do; the file goes with the last one.
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} x{self.ref_count}"
+
+
 class PredictionReport(models.Model):
     STATUS_CHOICES = (
         ("pending", "Pending"),
@@ -141,6 +270,14 @@ class PredictionReport(models.Model):
 
     location = models.CharField(max_length=255)
     document = models.FileField(upload_to='prediction_reports/%Y/%m/%d/')
+    # Content hash and byte size of the document, recorded at upload; the
+    # download endpoint uses the hash as a strong ETag.
+    sha256 = models.CharField(max_length=64, blank=True)
+    size = models.PositiveBigIntegerField(null=True, blank=True)
+    # Set for documents in content-addressed storage, where ``document``
+    # names the shared blob file and ``filename`` is what the client sent.
+    blob = models.ForeignKey(DocumentBlob, on_delete=models.PROTECT, null=True, blank=True, related_name='reports')
+    filename = models.CharField(max_length=255, blank=True)
     is_sent_to_mineduc = models.BooleanField(default=False)
     
     # NEW FIELDS
@@ -156,11 +293,49 @@ class PredictionReport(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Prediction Report'
         verbose_name_plural = 'Prediction Reports'
+        indexes = [
+            # location__iexact compares UPPER(location) on PostgreSQL; the
+            # trigram index for location__icontains is added in the migration.
+            models.Index(Upper('location'), name='report_location_upper_idx'),
+            models.Index(fields=['status', '-created_at'], name='report_status_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='report_created_idx'),
+        ]
     
     def __str__(self):
         return f"Report for {self.location} - {self.created_at.strftime('%Y-%m-%d')}"
 
 
+class ReportUpload(models.Model):
+    # A resumable upload: chunks are appended to a partial file under
+    # MEDIA_ROOT until the client completes it and a PredictionReport is made.
+    STATUS_CHOICES = (
+        ("open", "Open"),
+        ("complete", "Complete"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='report_uploads')
+    location = models.CharField(max_length=255)
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True)
+    received = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="open")
+    report = models.OneToOneField(
+        PredictionReport, on_delete=models.SET_NULL, null=True, blank=True, related_name='upload'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='report_upload_stale_idx'),
+        ]
+
+    def __str__(self):
+        return f"Upload {self.filename} ({self.received}/{self.total_size})"
+
+
 class ActionLog(models.Model):
     ACTION_CHOICES = [
         ('CREATE', 'Create'),
@@ -178,7 +353,101 @@ class ActionLog(models.Model):
     model_name = models.CharField(max_length=100) 
     object_id = models.PositiveIntegerField(null=True, blank=True) 
     details = models.JSONField(null=True, blank=True) 
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the action happens, not when the batched audit writer flushes it
+    timestamp = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
+
+    class Meta:
+        # Match the ActionLogListView filters, all ordered by newest first
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='actionlog_user_ts_idx'),
+            models.Index(fields=['action', '-timestamp'], name='actionlog_action_ts_idx'),
+            models.Index(fields=['model_name', '-timestamp'], name='actionlog_model_ts_idx'),
+            models.Index(fields=['model_name', 'object_id', '-timestamp'], name='actionlog_object_ts_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user} {self.action} {self.model_name} {self.object_id} at {self.timestamp}"
+
+
+class ActionLogArchive(models.Model):
+    # A gzip'd JSONL file holding ActionLog rows moved out of the hot table
+    # by the archive_action_logs command. A month may span several files.
+    month = models.DateField(db_index=True)
+    path = models.CharField(max_length=500, unique=True)
+    row_count = models.PositiveIntegerField(default=0)
+    sha256 = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-month', '-created_at']
+
+    def __str__(self):
+        return f"ActionLog archive {self.month:%Y-%m} ({self.row_count} rows)"
+
+
+class InfrastructureGapRollup(models.Model):
+    # One row per sector ("<District> - <Sector>" location), kept in sync by
+    # signals in signals.py and rebuilt by the rebuild_gap_rollup command.
+    location = models.CharField(max_length=255, unique=True)
+    district = models.CharField(max_length=255, db_index=True)
+    total_schools = models.PositiveIntegerField(default=0)
+    total_predictions = models.PositiveIntegerField(default=0)
+    total_required_rooms = models.PositiveIntegerField(default=0)
+    total_rooms_to_build = models.PositiveIntegerField(default=0)
+    total_estimated_budget = models.DecimalField(max_digits=18, decimal_places=2, default=0.00)
+    total_allocated_budget = models.DecimalField(max_digits=18, decimal_places=2, default=0.00)
+    total_spent_budget = models.DecimalField(max_digits=18, decimal_places=2, default=0.00)
+    district_approved = models.PositiveIntegerField(default=0)
+    mineduc_approved = models.PositiveIntegerField(default=0)
+    pending = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['location']
+
+    def __str__(self):
+        return f"Gap rollup for {self.location}"
+
+
+class TableVersion(models.Model):
+    # Bumped by signals on every write to a tracked table; list endpoints
+    # derive their ETag/Last-Modified from it without touching the table.
+    label = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.label} v{self.version}"
+
+
+class Job(models.Model):
+    # A unit of background work run by `manage.py run_jobs`. Rows are
+    # claimed by workers, retried with backoff, and kept for status lookups.
+    STATUS_CHOICES = (
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    )
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    idempotency_key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    result = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import logging
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+STREAM_FIELDS = ("id", "role", "sender", "sector", "message", "created_at")
+
+
+def audience_filter(role, sector):
+    return Q(role=role) & (Q(sector__isnull=True) | Q(sector="") | Q(sector=sector))
+
+
+class Subscriber:
+    def __init__(self, role, sector, queue_size):
+        self.role = role
+        self.sector = sector
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def wants(self, row):
+        return row["role"] == self.role and row["sector"] in (None, "", self.sector)
+
+
+class NotificationHub:
+    """
+    One per process: a single task polls for new Notification rows and fans
+    them out to every connected subscriber, so the database sees one cheap
+    ``id > last_id`` query per interval no matter how many clients listen.
+    """
+
+    def __init__(self, poll_interval=1.0, queue_size=100):
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.subscribers = set()
+        self.last_id = None
+        self._task = None
+
+    async def subscribe(self, role, sector):
+        subscriber = Subscriber(role, sector, self.queue_size)
+        self.subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            if self.last_id is None:
+                self.last_id = await sync_to_async(self._max_id)()
+            self._task = asyncio.create_task(self._poll())
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+    def _max_id(self):
+        return Notification.objects.order_by("-id").values_list("id", flat=True).first() or 0
+
+    def _fetch(self):
+        return list(
+            Notification.objects.filter(id__gt=self.last_id).order_by("id").values(*STREAM_FIELDS)[:500]
+        )
+
+    async def _poll(self):
+        while self.subscribers:
+            try:
+                rows = await sync_to_async(self._fetch)()
+            except Exception:
+                logger.exception("Notification poll failed")
+                rows = []
+            for row in rows:
+                self.last_id = row["id"]
+                self._dispatch(row)
+            await asyncio.sleep(self.poll_interval)
+
+    def _dispatch(self, row):
+        for subscriber in list(self.subscribers):
+            if not subscriber.wants(row):
+                continue
+            try:
+                subscriber.queue.put_nowait(row)
+            except asyncio.QueueFull:
+                # A stalled client is cut off; it resumes with Last-Event-ID.
+                subscriber.overflowed = True
+                self.unsubscribe(subscriber)
+
+
+_hubs = weakref.WeakKeyDictionary()
+
+
+def get_hub():
+    # Hubs are tied to an event loop: one per process under ASGI, while WSGI
+    # runs each async request on its own loop and so gets its own poller.
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = NotificationHub(
+            poll_interval=getattr(settings, "SIPMS_NOTIFICATION_POLL_INTERVAL", 1.0),
+            queue_size=getattr(settings, "SIPMS_NOTIFICATION_QUEUE_SIZE", 100),
+        )
+    return hub
+
+
+def format_event(row):
+    return f"id: {row['id']}\nevent: notification\ndata: {json.dumps(row, cls=DjangoJSONEncoder)}\n\n"
+
+
+def backlog(role, sector, last_id, limit=500):
+    return list(
+        Notification.objects.filter(audience_filter(role, sector), id__gt=last_id)
+        .order_by("id")
+        .values(*STREAM_FIELDS)[:limit]
+    )
+
+
+async def event_stream(role, sector, last_id=None, keepalive=15.0):
+    """Yield SSE frames: missed notifications after ``last_id``, then live ones."""
+    hub = get_hub()
+    subscriber = await hub.subscribe(role, sector)
+    sent_id = last_id or 0
+    try:
+        if last_id is not None:
+            for row in await sync_to_async(backlog)(role, sector, last_id):
+                sent_id = row["id"]
+                yield format_event(row)
+        yield ": connected\n\n"
+        while not subscriber.overflowed:
+            try:
+                row = await asyncio.wait_for(subscriber.queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if row["id"] > sent_id:
+                sent_id = row["id"]
+                yield format_event(row)
+    finally:
+        hub.unsubscribe(subscriber)
@@ -0,0 +1,152 @@
+import binascii
+import datetime
+import hashlib
+import json
+import uuid
+from base64 import b64decode, b64encode
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class StableCursorPagination(CursorPagination):
+    """
+    Keyset pagination over a stable ordering, so deep pages cost the same as
+    the first one. Views can override the default ``-created_at, -id``
+    ordering with a ``cursor_ordering`` attribute; ``id`` is appended when
+    missing so the ordering is unique.
+
+    The cursor holds the value of every ordering column of the boundary row
+    and pages continue with ``(a, id) < (last_a, last_id)`` spelled out as
+    ``a < last_a OR (a = last_a AND id < last_id)``. Unlike DRF's cursor,
+    which keys on the first column and skips ties with a capped offset, any
+    number of rows may share a value.
+
+    Clients may opt in to an ``X-Total-Count`` header with ``?with_count=1``;
+    the count is cached per query so repeated page walks don't re-count.
+    """
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = getattr(settings, "SIPMS_MAX_PAGE_SIZE", 500)
+    count_query_param = "with_count"
+    count_header = "X-Total-Count"
+    count_cache_timeout = getattr(settings, "SIPMS_COUNT_CACHE_TIMEOUT", 60)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.total_count = None
+        if request.query_params.get(self.count_query_param) in ("1", "true", "yes"):
+            self.total_count = self.get_estimated_count(queryset)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor[1]
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(_after(ordering, self.cursor[0]))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            # A reverse cursor comes from a "previous" link, so a page follows.
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "cursor_ordering", None)
+        if ordering:
+            self.ordering = ordering
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering[-1].lstrip("-") not in ("id", "pk"):
+            ordering += ("-id" if ordering[0].startswith("-") else "id",)
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor((self._position(self.page[-1]), False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor((self._position(self.page[0]), True))
+
+    def encode_cursor(self, cursor):
+        position, reverse = cursor
+        payload = json.dumps({"p": [_encode_value(value) for value in position], "r": int(reverse)})
+        encoded = b64encode(payload.encode()).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            payload = json.loads(b64decode(encoded.encode("ascii")).decode())
+            position, reverse = payload["p"], bool(payload["r"])
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _position(self, instance):
+        fields = [field.lstrip("-") for field in self.ordering]
+        if isinstance(instance, dict):
+            return [instance[field] for field in fields]
+        return [getattr(instance, field) for field in fields]
+
+    def get_estimated_count(self, queryset):
+        try:
+            sql = str(queryset.order_by().query)
+        except EmptyResultSet:
+            return 0
+        key = "sipms:count:" + hashlib.md5(sql.encode()).hexdigest()
+        return cache.get_or_set(key, queryset.count, self.count_cache_timeout)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.total_count is not None:
+            response[self.count_header] = str(self.total_count)
+        return response
+
+
+def _after(ordering, position):
+    """Rows strictly after ``position`` in ``ordering`` (a lexicographic keyset comparison)."""
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, position):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= equal & Q(**{f"{name}__{lookup}": value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def _encode_value(value):
+    # Full precision; DjangoJSONEncoder would round datetimes to milliseconds.
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    return value
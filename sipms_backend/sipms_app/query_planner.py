@@ -0,0 +1,135 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+def plan_queryset(queryset, serializer_class, fieldset=None, include=()):
+    """
+    Shape ``queryset`` for ``serializer_class``: join every nested
+    serializer with ``select_related``/``prefetch_related`` and load only the
+    columns the response reads, so listing N rows costs a fixed number of
+    queries and never fetches write-only columns such as password hashes.
+    With a ``fieldset`` (see ``parse_fieldset``) only the selected columns
+    and expanded relations are planned; ``include`` adds columns read
+    outside the serializer, such as the pagination ordering.
+    """
+    related, prefetch, only = _plan(serializer_class, queryset.model, fieldset)
+    if related:
+        queryset = queryset.select_related(*related)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset.only(*only, *include)
+
+
+# Bounded because fieldsets come from query strings.
+@lru_cache(maxsize=1024)
+def _plan(serializer_class, model, fieldset=None):
+    related, prefetch, only = [], [], []
+    serializer = serializer_class()
+    if fieldset is not None:
+        apply_fieldset(serializer, fieldset)
+    _walk(serializer, model, "", related, prefetch, only)
+    return tuple(related), tuple(prefetch), tuple(only)
+
+
+def _walk(serializer, model, prefix, related, prefetch, only):
+    columns = {model._meta.pk.name}
+    complete = True
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            # Properties, methods and "*" sources may read any column.
+            complete = False
+            continue
+
+        path = prefix + model_field.name
+        if isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+            prefetch.append(path)
+        elif isinstance(field, serializers.BaseSerializer):
+            columns.add(model_field.name)
+            related.append(path)
+            _walk(field, model_field.related_model, path + "__", related, prefetch, only)
+        else:
+            columns.add(model_field.name)
+
+    if not complete:
+        columns.update(f.name for f in model._meta.concrete_fields)
+    only.extend(prefix + column for column in sorted(columns))
+
+
+def parse_fieldset(params):
+    """
+    Read ``?fields=`` and ``?expand=`` into a hashable fieldset, or None
+    when neither is given (the full response).
+
+    ``fields=id,name,school.location`` keeps only those fields; a dotted
+    path selects inside a nested object and expands it. ``expand=school``
+    embeds that nested object; any nested object not expanded is rendered
+    as its primary key, so it costs no join.
+    """
+    fields, expand = params.get("fields"), params.get("expand")
+    if fields is None and expand is None:
+        return None
+    root = _node()
+    for path in _paths(expand):
+        node = root
+        for part in path:
+            node = node["expand"].setdefault(part, _node())
+    for path in _paths(fields):
+        node = root
+        for part in path[:-1]:
+            node["fields"] = (node["fields"] or set()) | {part}
+            node = node["expand"].setdefault(part, _node())
+        node["fields"] = (node["fields"] or set()) | {path[-1]}
+    return _freeze(root)
+
+
+def _node():
+    return {"fields": None, "expand": {}}
+
+
+def _paths(value):
+    return [tuple(path.strip().split(".")) for path in (value or "").split(",") if path.strip()]
+
+
+def _freeze(node):
+    fields = tuple(sorted(node["fields"])) if node["fields"] is not None else None
+    return fields, tuple(sorted((name, _freeze(child)) for name, child in node["expand"].items()))
+
+
+def apply_fieldset(serializer, fieldset, prefix=""):
+    """
+    Prune ``serializer.fields`` in place to ``fieldset``. Unexpanded nested
+    serializers become read-only primary keys. Unknown names are a 400.
+    """
+    selected, expanded = fieldset
+    expanded = dict(expanded)
+    fields = serializer.fields
+    readable = {name for name, field in fields.items() if not field.write_only}
+    unknown = (set(selected or ()) | expanded.keys()) - readable
+    if unknown:
+        raise ValidationError({"fields": f"Unknown field(s): {', '.join(sorted(prefix + name for name in unknown))}"})
+
+    for name in list(fields):
+        field = fields[name]
+        if field.write_only:
+            continue
+        if selected is not None and name not in selected:
+            del fields[name]
+            continue
+        many = isinstance(field, serializers.ListSerializer)
+        nested = field.child if many else field
+        if not isinstance(nested, serializers.BaseSerializer):
+            if name in expanded:
+                raise ValidationError({"expand": f"{prefix}{name} is not a nested object."})
+            continue
+        if name in expanded:
+            apply_fieldset(nested, expanded[name], f"{prefix}{name}.")
+        else:
+            source = {} if field.source == name else {"source": field.source}
+            fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, many=many, **source)
@@ -0,0 +1,67 @@
+from django.db import transaction
+
+from .aggregates import APPROVAL_KEYS, TOTAL_KEYS, budget_rows, latest_per_school, sector_rows, split_location
+from .models import BudgetTracking, InfrastructureGapRollup, Prediction
+
+ROLLUP_FIELDS = TOTAL_KEYS + APPROVAL_KEYS
+
+
+def compute_rows(locations=None):
+    """
+    Live per-sector figures, optionally restricted to ``locations``. Like the
+    exports, only each school's latest prediction and its budgets count.
+    """
+    predictions = latest_per_school(Prediction.objects.all())
+    budgets = BudgetTracking.objects.filter(project__prediction__in=predictions.values("pk"))
+    if locations is not None:
+        predictions = predictions.filter(school__location__in=locations)
+        budgets = budgets.filter(project__prediction__school__location__in=locations)
+
+    rows = {}
+    for row in sector_rows(predictions):
+        rows[row["location"]] = row
+    for row in budget_rows(budgets):
+        rows.setdefault(row["location"], {}).update(row)
+    return {location: _rollup_values(location, row) for location, row in rows.items()}
+
+
+def _rollup_values(location, row):
+    values = {field: row.get(field) or 0 for field in ROLLUP_FIELDS}
+    values["district"] = split_location(location)[0]
+    return values
+
+
+def refresh_locations(locations):
+    """Recompute the rollup rows of the given sectors only."""
+    locations = {location for location in locations if location}
+    if not locations:
+        return
+    rows = compute_rows(locations)
+    with transaction.atomic():
+        InfrastructureGapRollup.objects.filter(location__in=locations - rows.keys()).delete()
+        for location, values in rows.items():
+            InfrastructureGapRollup.objects.update_or_create(location=location, defaults=values)
+
+
+def rebuild():
+    rows = compute_rows()
+    with transaction.atomic():
+        InfrastructureGapRollup.objects.all().delete()
+        InfrastructureGapRollup.objects.bulk_create(
+            InfrastructureGapRollup(location=location, **values) for location, values in rows.items()
+        )
+    return len(rows)
+
+
+def find_drift():
+    """Return ``(location, stored, expected)`` for every sector that disagrees."""
+    expected = compute_rows()
+    stored = {
+        row.pop("location"): row
+        for row in InfrastructureGapRollup.objects.values("location", "district", *ROLLUP_FIELDS)
+    }
+    return [
+        (location, stored.get(location), expected.get(location))
+        for location in sorted(expected.keys() | stored.keys())
+        if stored.get(location) != expected.get(location)
+    ]
@@ -1,23 +1,71 @@
+import copy
+import os
+import re
+
 from rest_framework import serializers
+from django.db import transaction
+from django.urls import reverse
+from django.utils.text import get_valid_filename
 from django.contrib.auth.password_validation import validate_password
-from rest_framework_simplejwt.tokens import RefreshToken
 from .models import *
-from datetime import timedelta
+from .blobs import store_blob, stream_sha256
+from .login import find_user, issue_tokens, slim_user_data, verify_password
+from .uploads import chunk_size, max_upload_size
+
+
+def _clone_field(field):
+    """
+    Copy an unbound field for a new serializer instance. ``deepcopy`` re-runs
+    the field's constructor; a shallow copy with its own validator list,
+    error messages and style is enough for leaf fields. Nested serializers
+    and fields that bind a child (ListField, ManyRelatedField) are deep-copied.
+    """
+    if isinstance(field, serializers.BaseSerializer) or hasattr(field, "child") or hasattr(field, "child_relation"):
+        return copy.deepcopy(field)
+    clone = copy.copy(field)
+    clone.validators = list(field.validators)
+    clone.error_messages = dict(field.error_messages)
+    clone.style = dict(field.style)
+    return clone
+
 
+class CachedFieldMapSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer whose field map (model introspection and declared
+    fields) is built once per class. Each instance binds its own copies, so
+    no two instances share validators, error_messages or bound child fields.
+    """
 
-class SchoolSerializer(serializers.ModelSerializer):
+    def prepare_fields(self, fields):
+        """
+        Adjust this instance's field copies. A deep copy rebuilds a field
+        from its constructor arguments, so attribute changes made to the
+        class's map would be lost on nested fields; they are applied here.
+        """
+        return fields
+
+    def get_fields(self):
+        cls = type(self)
+        prototype = cls.__dict__.get("_field_map")
+        if prototype is None:
+            prototype = cls._field_map = super().get_fields()
+        return self.prepare_fields({name: _clone_field(field) for name, field in prototype.items()})
+
+
+class SchoolSerializer(CachedFieldMapSerializer):
     class Meta:
         model = School
         fields = "__all__"
 
-    def __init__(self, *args, **kwargs):
-        super(SchoolSerializer, self).__init__(*args, **kwargs)
-        for field in self.fields.values():
+    def prepare_fields(self, fields):
+        # Every column is optional and may be null or blank.
+        for field in fields.values():
             field.required = False
             field.allow_null = True
             field.allow_blank = True
-            
-class UserSerializer(serializers.ModelSerializer):
+        return fields
+
+class UserSerializer(CachedFieldMapSerializer):
     school = SchoolSerializer(read_only=True)
     school_id = serializers.PrimaryKeyRelatedField(
         queryset=School.objects.all(),
@@ -63,24 +111,21 @@ class UserLoginSerializer(serializers.Serializer):
     user = UserSerializer(read_only=True)
 
     def validate(self, data):
-        try:
-            user = User.objects.get(email=data["email"])
-        except User.DoesNotExist:
+        user = find_user(data["email"])
+        # Popped so the plaintext is not echoed back in the response body.
+        if not verify_password(user, data.pop("password")):
             raise serializers.ValidationError("Invalid credentials")
-        if not user.check_password(data["password"]):
-            raise serializers.ValidationError("Invalid credentials")
-        refresh = RefreshToken.for_user(user)
-        refresh.access_token.set_exp(lifetime=timedelta(minutes=30))
-
-        data["token"] = {
-            "refresh": str(refresh),
-            "access": str(refresh.access_token),
-        }
-        data["user"] = UserSerializer(user).data
+        data["token"] = issue_tokens(user)
+        # Kept for the caller's audit log; the slim body has no email.
+        self.authenticated_user = user
+        if self.context.get("slim"):
+            data["user"] = slim_user_data(user)
+        else:
+            data["user"] = UserSerializer(user).data
         return data
 
 
-class UserRegisterSerializer(serializers.ModelSerializer):
+class UserRegisterSerializer(CachedFieldMapSerializer):
     password = serializers.CharField(write_only=True, required=False, validators=[validate_password])
     school = SchoolSerializer(read_only=True)
     school_id = serializers.PrimaryKeyRelatedField(
@@ -113,7 +158,7 @@ class UserRegisterSerializer(serializers.ModelSerializer):
         return user
 
 
-class PredictionSerializer(serializers.ModelSerializer):
+class PredictionSerializer(CachedFieldMapSerializer):
     school = SchoolSerializer(read_only=True)
     school_id = serializers.PrimaryKeyRelatedField(
         queryset=School.objects.all(), write_only=True
@@ -133,24 +178,31 @@ class PredictionSerializer(serializers.ModelSerializer):
 
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(CachedFieldMapSerializer):
     class Meta:
         model = Project
         fields = "__all__"
 
-class BudgetTrackingSerializer(serializers.ModelSerializer):
+class BudgetTrackingSerializer(CachedFieldMapSerializer):
     class Meta:
         model = BudgetTracking
         fields = "__all__"
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(CachedFieldMapSerializer):
     class Meta:
         model = Notification
         fields = "__all__"
 
 
-class PredictionReportSerializer(serializers.ModelSerializer):
+class InboxNotificationSerializer(NotificationSerializer):
+    is_read = serializers.SerializerMethodField()
+
+    def get_is_read(self, obj):
+        return obj.id <= self.context.get("last_read_id", 0)
+
+
+class PredictionReportSerializer(CachedFieldMapSerializer):
     document_url = serializers.SerializerMethodField()
     created_by_name = serializers.SerializerMethodField()
     
@@ -161,30 +213,83 @@ class PredictionReportSerializer(serializers.ModelSerializer):
     
     def get_document_url(self, obj):
         request = self.context.get('request')
-        if obj.document and hasattr(obj.document, 'url'):
+        if obj.document:
+            url = reverse('prediction-report-download', args=[obj.id])
             if request:
-                return request.build_absolute_uri(obj.document.url)
-            return obj.document.url
+                return request.build_absolute_uri(url)
+            return url
         return None
     
     def get_created_by_name(self, obj):
         if obj.created_by:
             return f"{obj.created_by.first_name} {obj.created_by.last_name}".strip() or obj.created_by.username
         return None
-class PredictionReportCreateSerializer(serializers.ModelSerializer):
+class PredictionReportCreateSerializer(CachedFieldMapSerializer):
     class Meta:
         model = PredictionReport
         fields = ['location', 'document', 'created_by']
     
     def validate_document(self, value):
         # Allow all file types
-        if value.size > 10 * 1024 * 1024:
+        if value.size > max_upload_size():
+            raise serializers.ValidationError("File size cannot exceed 10MB")
+        return value
+
+    def create(self, validated_data):
+        document = validated_data.pop('document')
+        digest = stream_sha256(document)
+        document.seek(0)
+        with transaction.atomic():
+            blob = store_blob(document, digest, document.size, document.name)
+            return PredictionReport.objects.create(
+                blob=blob,
+                document=blob.name,
+                filename=get_valid_filename(os.path.basename(document.name)),
+                sha256=digest,
+                size=document.size,
+                **validated_data
+            )
+
+
+class ReportUploadSerializer(CachedFieldMapSerializer):
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportUpload
+        fields = ['id', 'location', 'filename', 'total_size', 'sha256', 'received', 'chunk_size', 'status', 'report', 'created_at']
+        read_only_fields = ['received', 'status', 'report']
+
+    def get_chunk_size(self, obj):
+        return chunk_size()
+
+    def validate_filename(self, value):
+        value = get_valid_filename(os.path.basename(value))
+        if not value:
+            raise serializers.ValidationError("Invalid filename.")
+        return value
+
+    def validate_total_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("total_size must be positive.")
+        if value > max_upload_size():
             raise serializers.ValidationError("File size cannot exceed 10MB")
         return value
+
+    def validate_sha256(self, value):
+        value = value.lower()
+        if value and not re.fullmatch(r"[0-9a-f]{64}", value):
+            raise serializers.ValidationError("Must be a hex SHA-256 digest.")
+        return value
     
 
 
-class ActionLogSerializer(serializers.ModelSerializer):
+class JobSerializer(CachedFieldMapSerializer):
+    class Meta:
+        model = Job
+        fields = ['id', 'task', 'status', 'attempts', 'max_attempts', 'run_at', 'last_error', 'result', 'created_at', 'finished_at']
+
+
+class ActionLogSerializer(CachedFieldMapSerializer):
     user = UserSerializer(read_only=True)
     class Meta:
         model = ActionLog
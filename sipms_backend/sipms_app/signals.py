@@ -0,0 +1,142 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from .authentication import full_user_cache
+
+from .blobs import add_reference, release_reference
+from .caching import school_cache, user_cache
+from .inbox import record_delivery, record_removal
+from .models import BudgetTracking, Notification, Prediction, PredictionReport, School, TokenClaimsUser, User
+from .rollups import refresh_locations
+from .table_versions import bump
+
+# Keep InfrastructureGapRollup in step with the rows it summarizes. Only the
+# sectors touched by a change are recomputed.
+
+
+@receiver(post_init, sender=School)
+def remember_school_location(sender, instance, **kwargs):
+    instance._rollup_location = instance.__dict__.get("location")
+
+
+@receiver(post_save, sender=School)
+def school_saved(sender, instance, created, **kwargs):
+    # Prediction figures are frozen at save time, so only a move between
+    # sectors changes the rollup.
+    old_location = instance._rollup_location
+    instance._rollup_location = instance.location
+    if not created and old_location != instance.location:
+        refresh_locations({old_location, instance.location})
+
+
+@receiver(post_delete, sender=School)
+def school_deleted(sender, instance, **kwargs):
+    refresh_locations({instance.location})
+
+
+@receiver(post_init, sender=Prediction)
+def remember_prediction_school(sender, instance, **kwargs):
+    instance._rollup_school_id = instance.__dict__.get("school_id")
+
+
+def _school_locations(school_ids):
+    return set(School.objects.filter(pk__in=school_ids).values_list("location", flat=True))
+
+
+@receiver([post_save, post_delete], sender=Prediction)
+def prediction_changed(sender, instance, **kwargs):
+    school_ids = {instance._rollup_school_id, instance.school_id} - {None}
+    instance._rollup_school_id = instance.school_id
+    refresh_locations(_school_locations(school_ids))
+
+
+@receiver([post_save, post_delete], sender=BudgetTracking)
+def budget_changed(sender, instance, **kwargs):
+    locations = School.objects.filter(prediction__project=instance.project_id).values_list("location", flat=True)
+    refresh_locations(set(locations))
+
+
+# Drop cached School/User representations when the underlying rows change.
+# Users embed their school, so a school change also evicts its users.
+
+
+# pre_delete: deleting a school nulls users.school_id before post_delete runs.
+@receiver([post_save, pre_delete], sender=School)
+def evict_school(sender, instance, **kwargs):
+    school_cache.invalidate(instance.pk)
+    user_cache.invalidate(*User.objects.filter(school_id=instance.pk).values_list("pk", flat=True))
+
+
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender=TokenClaimsUser)
+def evict_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+    full_user_cache.invalidate_user(instance.pk)
+
+
+# Access tokens carry these fields as claims (authentication.py); changing
+# any of them bumps token_version so older tokens fall back to the full row.
+TOKEN_CLAIM_FIELDS = ("role", "sector", "school_id", "is_active", "password")
+
+
+@receiver(post_init, sender=User)
+@receiver(post_init, sender=TokenClaimsUser)
+def remember_token_claims(sender, instance, **kwargs):
+    instance._token_claims = tuple(instance.__dict__.get(field) for field in TOKEN_CLAIM_FIELDS)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=TokenClaimsUser)
+def bump_token_version(sender, instance, created, **kwargs):
+    # __dict__, not getattr, so deferred fields are compared without loading.
+    claims = tuple(instance.__dict__.get(field) for field in TOKEN_CLAIM_FIELDS)
+    changed = not created and claims != instance._token_claims
+    instance._token_claims = claims
+    if changed:
+        User.objects.filter(pk=instance.pk).update(token_version=F("token_version") + 1)
+        instance.refresh_from_db(fields=["token_version"])
+
+
+@receiver(pre_delete, sender=School)
+def bump_school_users_token_version(sender, instance, **kwargs):
+    # The delete nulls users.school_id with a bulk UPDATE, which sends no
+    # User signals.
+    User.objects.filter(school_id=instance.pk).update(token_version=F("token_version") + 1)
+
+
+# Version counters behind the ETags of ConditionalListMixin views.
+
+
+@receiver([post_save, post_delete], sender=School)
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender=Notification)
+@receiver([post_save, post_delete], sender=PredictionReport)
+def bump_table_version(sender, **kwargs):
+    bump(sender)
+
+
+@receiver(post_save, sender=Notification)
+def count_notification_delivery(sender, instance, created, **kwargs):
+    if created:
+        record_delivery(instance)
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_notification_delivery(sender, instance, **kwargs):
+    record_removal(instance)
+
+
+@receiver(post_save, sender=PredictionReport)
+def count_blob_reference(sender, instance, created, **kwargs):
+    if created and instance.blob_id:
+        add_reference(instance.blob_id)
+
+
+@receiver(post_delete, sender=PredictionReport)
+def release_document(sender, instance, **kwargs):
+    # Covers cascades from User deletion as well as the detail endpoint.
+    if instance.blob_id:
+        release_reference(instance.blob_id)
+    elif instance.document:
+        instance.document.delete(save=False)
@@ -0,0 +1,38 @@
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.http import quote_etag
+
+from .models import TableVersion
+
+
+def bump(model):
+    """Record a write to ``model``'s table. Call after bulk writes that skip signals."""
+    label = model._meta.label
+    now = timezone.now()
+    if TableVersion.objects.filter(label=label).update(version=F("version") + 1, updated_at=now):
+        return
+    try:
+        with transaction.atomic():
+            TableVersion.objects.create(label=label, version=1, updated_at=now)
+    except IntegrityError:
+        TableVersion.objects.filter(label=label).update(version=F("version") + 1, updated_at=now)
+
+
+def list_validators(request, models):
+    """
+    ``(etag, last_modified)`` for a list response built from ``models``:
+    one primary-key lookup, independent of how many rows the tables hold.
+    """
+    labels = sorted(model._meta.label for model in models)
+    versions = dict.fromkeys(labels, (0, None))
+    for row in TableVersion.objects.filter(label__in=labels):
+        versions[row.label] = (row.version, row.updated_at)
+
+    fingerprint = "|".join(f"{label}:{versions[label][0]}" for label in labels)
+    fingerprint += "|" + request.get_full_path()
+    etag = quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
+    timestamps = [updated_at for _, updated_at in versions.values() if updated_at]
+    return etag, max(timestamps) if timestamps else None
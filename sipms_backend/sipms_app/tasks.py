@@ -0,0 +1,76 @@
+from django.utils.dateparse import parse_datetime
+
+from .jobs import task
+from .exports import generate_report
+from .models import ActionLog, Notification, PredictionReport, User
+
+# Side effects of report workflow endpoints. Each handler runs in its own
+# transaction, so a retry never leaves a half-written notification or log.
+
+
+def _audit(user_id, action, report_id, details, timestamp):
+    ActionLog.objects.create(
+        user_id=user_id,
+        action=action,
+        model_name="PredictionReport",
+        object_id=report_id,
+        details=details,
+        timestamp=parse_datetime(timestamp),
+    )
+
+
+def _notify_author(report, sender, message):
+    author = report.created_by
+    Notification.objects.create(role=author.role, sender=sender, sector=author.sector or None, message=message)
+
+
+@task("report.uploaded")
+def report_uploaded(report_id, user_id, timestamp, action="UPLOAD", size=None):
+    details = {"location": PredictionReport.objects.filter(pk=report_id).values_list("location", flat=True).first()}
+    if size is not None:
+        details["size"] = size
+    _audit(user_id, action, report_id, details, timestamp)
+    return {"logged": action}
+
+
+@task("report.sent")
+def report_sent(report_id, user_id, timestamp, sender=Notification.Role.DISTRICT):
+    _audit(user_id, "SEND", report_id, {"sent_to_mineduc": True}, timestamp)
+    report = PredictionReport.objects.filter(pk=report_id).only("id", "location").first()
+    if report is None:
+        return {"notified": None}
+    Notification.objects.create(
+        role=Notification.Role.MINEDUC,
+        sender=sender,
+        message=f"Prediction report for {report.location} is awaiting review.",
+    )
+    return {"notified": Notification.Role.MINEDUC}
+
+
+@task("report.reviewed")
+def report_reviewed(report_id, user_id, timestamp, status, reason=None):
+    details = {"status": status}
+    if status == "denied":
+        details["reason"] = reason
+    _audit(user_id, "APPROVE" if status == "approved" else "DENY", report_id, details, timestamp)
+    report = PredictionReport.objects.select_related("created_by").filter(pk=report_id).first()
+    if report is None:
+        return {"notified": None}
+    message = f"Your prediction report for {report.location} was {status}."
+    if reason:
+        message += f" Reason: {reason}"
+    _notify_author(report, Notification.Role.MINEDUC, message)
+    return {"notified": report.created_by.role}
+
+
+# Streams every matching prediction, so it runs outside the job transaction;
+# the report and its audit row are written together at the end.
+@task("report.export", atomic=False)
+def report_export(user_id, timestamp, format, district=None, location=None):
+    def audit(report, rows):
+        _audit(user_id, "CREATE", report.id, {"location": report.location, "export": format, "rows": rows}, timestamp)
+
+    report, rows = generate_report(
+        User.objects.get(pk=user_id), format, district=district, location=location, on_created=audit
+    )
+    return {"report_id": report.id, "rows": rows, "size": report.size}
@@ -1,3 +1,769 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers as drf_serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from . import jobs
+from .archival import archive_before, read_archive, retention_cutoff
+from .audit import AuditLogWriter
+from .authentication import ClaimsJWTAuthentication, ClaimsRefreshToken
+from .benchmarks import BUDGETS_US, CASES, measure_field_maps
+from .blobs import adopt_legacy_documents, collect_garbage, document_storage, store_blob
+from .caching import SerializedCache
+from .downloads import parse_range
+from .exports import latest_predictions
+from .management.commands.audit_query_plans import FULL_SORT, SEQUENTIAL_SCAN
+from .models import (
+    ActionLog, DocumentBlob, Job, Notification, NotificationAudienceCounter, Prediction, PredictionReport, School,
+    TokenClaimsUser, User,
+)
+from .query_planner import plan_queryset
+from .serializers import PredictionSerializer, SchoolSerializer
+
+
+class PredictionListQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="planner", email="planner@example.com", password="x", role="DISTRICT"
+        )
+
+    def create_predictions(self, count):
+        start = School.objects.count()
+        for i in range(start, start + count):
+            school = School.objects.create(name=f"School {i}", location="Gasabo", student_population=100)
+            self.user.school = school
+            self.user.save()
+            Prediction.objects.create(school=school, created_by=self.user)
+
+    def test_query_count_is_independent_of_row_count(self):
+        self.create_predictions(2)
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/predictions/")
+        self.assertEqual(len(response.data["results"]), 2)
+
+        self.create_predictions(10)
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/predictions/")
+        self.assertEqual(len(response.data["results"]), 12)
+
+    def test_fields_and_expand_prune_the_response_and_its_query(self):
+        self.create_predictions(2)
+        with self.assertNumQueries(1), CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/predictions/", {"fields": "id,rooms_to_build,school.name"})
+        row = response.data["results"][0]
+        self.assertEqual(set(row), {"id", "rooms_to_build", "school"})
+        self.assertEqual(set(row["school"]), {"name"})
+        self.assertNotIn("estimated_budget", queries[0]["sql"])
+        self.assertNotIn("sipms_app_user", queries[0]["sql"])
+
+        row = self.client.get("/api/predictions/", {"fields": "id,school,created_by"}).data["results"][0]
+        self.assertIsInstance(row["school"], int)
+        self.assertIsInstance(row["created_by"], int)
+        row = self.client.get("/api/predictions/", {"expand": "school"}).data["results"][0]
+        self.assertEqual(row["school"]["name"], "School 1")
+        self.assertIsInstance(row["created_by"], int)
+
+        self.create_predictions(10)
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/predictions/", {"fields": "id,school.name,created_by.email"})
+        self.assertEqual(len(response.data["results"]), 12)
+
+    def test_unknown_fields_are_rejected(self):
+        for params in ({"fields": "id,bogus"}, {"fields": "school.bogus"}, {"expand": "rooms_to_build"}):
+            response = self.client.get("/api/predictions/", params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_password_hash_is_not_loaded(self):
+        self.create_predictions(1)
+        prediction = plan_queryset(Prediction.objects.all(), PredictionSerializer).get()
+        self.assertIn("password", prediction.created_by.get_deferred_fields())
+
+
+class ApiParityTests(TestCase):
+    """
+    Backend-sensitive API behaviour. Run once per backend:
+    `python manage.py test` and `SIPMS_DB_ENGINE=postgres python manage.py test`
+    against the server from docker-compose.postgres.yml.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="parity", email="parity@example.com", password="x", role="MINEDUC"
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_cursor_pagination_walks_every_row_once(self):
+        for i in range(7):
+            School.objects.create(name=f"School {i}", location="Gasabo - Kinyinya")
+        seen = []
+        url = "/api/schools/?page_size=3"
+        while url:
+            page = self.client.get(url).data
+            seen.extend(school["id"] for school in page["results"])
+            url = page["next"]
+        self.assertEqual(sorted(seen), sorted(School.objects.values_list("id", flat=True)))
+
+    def test_cursor_pagination_pages_through_tied_rows(self):
+        School.objects.bulk_create(School(name=f"School {i}", location="Gasabo - Kinyinya") for i in range(1200))
+        School.objects.update(created_at=timezone.now())
+        pages = []
+        url = "/api/schools/?page_size=500"
+        while url:
+            page = self.client.get(url).data
+            pages.append([school["id"] for school in page["results"]])
+            url = page["next"]
+        seen = [pk for ids in pages for pk in ids]
+        self.assertEqual([len(ids) for ids in pages], [500, 500, 200])
+        self.assertEqual(seen, sorted(School.objects.values_list("id", flat=True), reverse=True))
+
+        previous = self.client.get(page["previous"]).data
+        self.assertEqual([school["id"] for school in previous["results"]], pages[1])
+        self.assertEqual(self.client.get("/api/schools/", {"cursor": "bogus"}).status_code, 404)
+
+    def walk(self, url):
+        ids = []
+        while url:
+            page = self.client.get(url).data
+            ids.extend(row["id"] for row in page["results"])
+            url = page["next"]
+        return ids
+
+    def test_orderings_on_tied_columns_page_through_every_row(self):
+        for i in range(10):
+            School.objects.create(
+                name=f"School {i}", location="Gasabo - Kinyinya", student_population=[35, 70, 350][i % 3], number_of_rooms=0
+            )
+        self.client.post("/api/predictions/bulk/", {"district": "Gasabo"}, format="json")
+
+        by_population = School.objects.order_by("student_population", "id").values_list("id", flat=True)
+        self.assertEqual(self.walk("/api/schools/?ordering=student_population&page_size=3"), list(by_population))
+        by_budget = Prediction.objects.order_by("-estimated_budget", "-id").values_list("id", flat=True)
+        self.assertEqual(self.walk("/api/predictions/?ordering=-estimated_budget&page_size=3"), list(by_budget))
+        self.assertEqual(self.client.get("/api/schools/", {"ordering": "email"}).status_code, 400)
+
+    def test_report_location_lookup_is_case_insensitive(self):
+        PredictionReport.objects.create(
+            location="Gasabo - Kinyinya", document="prediction_reports/report.pdf", created_by=self.user
+        )
+        response = self.client.get("/api/prediction-reports/by-location/gasabo - kinyinya/")
+        self.assertEqual(len(response.data["data"]), 1)
+
+    def test_action_log_details_filter_matches_strings_and_numbers(self):
+        ActionLog.objects.create(action="APPROVE", model_name="PredictionReport", details={"status": "approved"})
+        ActionLog.objects.create(action="CREATE", model_name="Prediction", details={"school": 5})
+        ActionLog.objects.create(action="DENY", model_name="PredictionReport", details={"status": "denied"})
+
+        approved = self.client.get("/api/action-logs/", {"details.status": "approved"}).data["results"]
+        self.assertEqual([log["action"] for log in approved], ["APPROVE"])
+        by_school = self.client.get("/api/action-logs/", {"details.school": "5"}).data["results"]
+        self.assertEqual([log["action"] for log in by_school], ["CREATE"])
+
+    def test_impossible_dates_are_rejected(self):
+        response = self.client.get("/api/action-logs/", {"since": "2024-02-30"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("since", response.data)
+        response = self.client.get("/api/predictions/", {"until": "2024-02-30T10:00:00"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_report_can_be_resent_after_a_denial(self):
+        report = PredictionReport.objects.create(
+            location="Gasabo - Kinyinya", document="prediction_reports/report.pdf", created_by=self.user
+        )
+        url = f"/api/send-to-mineduc/{report.id}/"
+        first = self.client.post(url).data["job_id"]
+        self.assertEqual(self.client.post(url).data["job_id"], first)
+        self.client.post(f"/api/prediction-reports/mineduc/deny/{report.id}/", {"reason": "Missing budget"})
+        second = self.client.post(url).data["job_id"]
+        self.assertNotEqual(second, first)
+        self.assertEqual(Job.objects.filter(task="report.sent", status="succeeded").count(), 2)
+
+    def test_bulk_generation_feeds_district_summary(self):
+        School.objects.create(name="A", location="Gasabo - Kinyinya", student_population=350, number_of_rooms=4)
+        School.objects.create(name="B", location="Gasabo - Remera", student_population=70, number_of_rooms=0)
+        School.objects.create(name="C", location="Kicukiro - Niboye", student_population=35, number_of_rooms=0)
+
+        response = self.client.post("/api/predictions/bulk/", {"district": "Gasabo"}, format="json")
+        self.assertEqual(response.data["data"]["created"], 2)
+
+        summary = self.client.get("/api/district-summary/", {"district": "Gasabo"}).data
+        self.assertEqual(summary["total_schools"], 2)
+        self.assertEqual(summary["total_rooms_to_build"], 8)
+        self.assertEqual(summary["total_estimated_budget"], Decimal("40000000.00"))
+        self.assertEqual([sector["sector"] for sector in summary["districts"][0]["sectors"]], ["Kinyinya", "Remera"])
+
+    def test_location_filters_accept_a_stored_user_sector(self):
+        School.objects.create(name="A", location="Gasabo - Kinyinya")
+        School.objects.create(name="B", location="Gasabo - Remera")
+        School.objects.create(name="C", location="Kicukiro - Niboye")
+        officer = User.objects.create_user(
+            username="officer", email="officer@example.com", password="x", role="UMURENGE", sector="Gasabo - Kinyinya"
+        )
+
+        def names(**params):
+            return sorted(school["name"] for school in self.client.get("/api/schools/", params).data["results"])
+
+        self.assertEqual(names(sector=officer.sector), ["A"])
+        self.assertEqual(names(sector=officer.sector.upper()), ["A"])
+        self.assertEqual(names(sector="kinyinya"), ["A"])
+        self.assertEqual(names(district="gasabo"), ["A", "B"])
+
+    def test_repeated_bulk_runs_count_each_school_once(self):
+        School.objects.create(name="A", location="Gasabo - Kinyinya", student_population=350, number_of_rooms=4)
+        self.client.post("/api/predictions/bulk/", {"district": "Gasabo"}, format="json")
+        self.client.post("/api/predictions/bulk/", {"district": "Gasabo"}, format="json")
+        self.assertEqual(Prediction.objects.count(), 2)
+
+        summary = self.client.get("/api/district-summary/", {"district": "Gasabo"}).data
+        self.assertEqual(summary["total_schools"], 1)
+        self.assertEqual(summary["total_rooms_to_build"], 6)
+        self.assertEqual(summary["total_estimated_budget"], Decimal("30000000.00"))
+        self.assertEqual(latest_predictions("Gasabo").count(), 1)
+
+
+    def test_bulk_predictions_page_through_once_each(self):
+        School.objects.bulk_create(
+            School(name=f"School {i}", location="Gasabo - Kinyinya", student_population=i) for i in range(1200)
+        )
+        self.client.post("/api/predictions/bulk/", {"district": "Gasabo"}, format="json")
+        seen = self.walk("/api/predictions/?page_size=500")
+        self.assertEqual(len(seen), 1200)
+        self.assertEqual(sorted(seen), sorted(Prediction.objects.values_list("id", flat=True)))
+
+
+class SchoolImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="importer", email="importer@example.com", password="x", role="MINEDUC")
+        )
+
+    def upload(self, text, **data):
+        document = ContentFile(text.encode(), name="schools.csv")
+        return self.client.post("/api/schools/import/", {"file": document, **data}, format="multipart")
+
+    def test_rows_are_created_then_updated_on_name_and_location(self):
+        response = self.upload("name,location,student_population\nA,Gasabo - Kinyinya,100\nB,Gasabo - Remera,50\n")
+        self.assertEqual((response.data["data"]["created"], response.data["data"]["updated"]), (2, 0))
+        response = self.upload("name,location,student_population\nA,Gasabo - Kinyinya,120\nC,Gasabo - Remera,10\n")
+        self.assertEqual((response.data["data"]["created"], response.data["data"]["updated"]), (1, 1))
+        self.assertEqual(School.objects.get(name="A").student_population, 120)
+        self.assertEqual(School.objects.count(), 3)
+
+    def test_blank_cells_keep_stored_values(self):
+        School.objects.create(
+            name="A", location="Gasabo - Kinyinya", student_population=100, head_teacher="Ann", email="a@example.com"
+        )
+        School.objects.create(
+            name="B", location="Gasabo - Remera", student_population=50, head_teacher="Ben", email="b@example.com"
+        )
+        self.upload(
+            "name,location,student_population,head_teacher,email\n"
+            "A,Gasabo - Kinyinya,,Alice,\n"
+            "B,Gasabo - Remera,60,,b2@example.com\n"
+        )
+        a, b = School.objects.order_by("name")
+        self.assertEqual((a.student_population, a.head_teacher, a.email), (100, "Alice", "a@example.com"))
+        self.assertEqual((b.student_population, b.head_teacher, b.email), (60, "Ben", "b2@example.com"))
+
+    def test_invalid_rows_are_reported_and_dry_runs_write_nothing(self):
+        response = self.upload(
+            "name,location,student_population\nA,Gasabo - Kinyinya,lots\nB,Gasabo - Remera,5\n", dry_run="1"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["invalid"], 1)
+        self.assertEqual(response.data["data"]["errors"][0]["line"], 2)
+        self.assertFalse(School.objects.exists())
+
+
+class QueryPlanAuditTests(TestCase):
+    def test_list_queries_pass_a_strict_audit(self):
+        output = io.StringIO()
+        call_command("audit_query_plans", "--strict", stdout=output)
+        self.assertIn("schools by location: ok", output.getvalue())
+
+    def test_only_full_scans_and_sorts_are_flagged(self):
+        self.assertTrue(SEQUENTIAL_SCAN.search("2 0 0 SCAN sipms_app_school"))
+        self.assertTrue(SEQUENTIAL_SCAN.search("Seq Scan on sipms_app_school  (cost=0.00..1.01 rows=1 width=4)"))
+        self.assertFalse(SEQUENTIAL_SCAN.search("5 0 0 SCAN sipms_app_school USING INDEX school_created_idx"))
+        self.assertFalse(SEQUENTIAL_SCAN.search("4 0 0 SEARCH prediction_reports USING INDEX report_status_idx"))
+        self.assertTrue(FULL_SORT.search("35 0 0 USE TEMP B-TREE FOR ORDER BY"))
+        self.assertFalse(FULL_SORT.search("67 0 0 USE TEMP B-TREE FOR RIGHT PART OF ORDER BY"))
+
+class AuditSpoolTests(TestCase):
+    def test_replay_skips_records_already_written(self):
+        with tempfile.TemporaryDirectory() as directory:
+            writer = AuditLogWriter(spool_path=os.path.join(directory, "audit.jsonl"))
+            # A spool left behind by an earlier process that had the same pid.
+            orphan = writer._spool_file(os.getpid())
+            record = {"user_id": None, "model_name": "School", "object_id": None, "details": None,
+                      "timestamp": "2026-01-01T00:00:00+00:00"}
+            with open(orphan, "w") as spool:
+                spool.write(json.dumps({"seq": 1, "record": {**record, "action": "CREATE"}}) + "\n")
+                spool.write(json.dumps({"seq": 2, "record": {**record, "action": "DELETE"}}) + "\n")
+                spool.write(json.dumps({"done": [1]}) + "\n")
+
+            writer._replay_spools()
+
+            self.assertEqual(list(ActionLog.objects.values_list("action", flat=True)), ["DELETE"])
+            self.assertEqual(os.listdir(directory), [])
+
+
+class ActionLogArchiveTests(TestCase):
+    def test_old_months_round_trip_through_archives(self):
+        now = timezone.make_aware(datetime(2026, 10, 18, 12, 0))
+        old = [
+            ActionLog.objects.create(action="CREATE", model_name="School", details={"name": "A"}),
+            ActionLog.objects.create(action="UPDATE", model_name="School", object_id=7),
+            ActionLog.objects.create(action="DELETE", model_name="School"),
+        ]
+        stamps = [datetime(2026, 2, 3, 8, 0), datetime(2026, 2, 20, 9, 30), datetime(2026, 3, 31, 23, 0)]
+        for log, stamp in zip(old, stamps):
+            ActionLog.objects.filter(pk=log.pk).update(timestamp=timezone.make_aware(stamp))
+        recent = ActionLog.objects.create(action="CREATE", model_name="Prediction")
+
+        with tempfile.TemporaryDirectory() as directory, self.settings(SIPMS_ACTIONLOG_ARCHIVE_DIR=directory):
+            cutoff = retention_cutoff(months=6, now=now)
+            self.assertEqual(cutoff, timezone.make_aware(datetime(2026, 4, 1)))
+            archives = archive_before(cutoff)
+
+            self.assertEqual([(archive.month, archive.row_count) for archive in archives],
+                             [(date(2026, 2, 1), 2), (date(2026, 3, 1), 1)])
+            self.assertEqual(list(ActionLog.objects.values_list("pk", flat=True)), [recent.pk])
+            restored = [row for archive in archives for row in read_archive(archive)]
+            self.assertEqual([row["id"] for row in restored], [log.pk for log in old])
+            self.assertEqual(restored[0]["details"], {"name": "A"})
+            self.assertEqual(restored[1]["object_id"], 7)
+            self.assertEqual(parse_datetime(restored[2]["timestamp"]), timezone.make_aware(stamps[2]))
+
+
+class InboxCounterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="sector", email="sector@example.com", password="x", role="UMURENGE",
+            sector="Gasabo - Kinyinya",
+        )
+        self.client.force_authenticate(self.user)
+
+    def notify(self, sector=None):
+        return Notification.objects.create(role="UMURENGE", sender="DISTRICT", sector=sector, message="m")
+
+    def test_deleting_notifications_keeps_unread_count_in_step(self):
+        read = self.notify("Gasabo - Kinyinya")
+        self.client.post("/api/inbox/read/")
+        unread = self.notify()
+        self.notify("Gasabo - Remera")
+        self.assertEqual(self.client.get("/api/inbox/unread-count/").data["unread"], 1)
+
+        read.delete()
+        self.assertEqual(self.client.get("/api/inbox/unread-count/").data["unread"], 1)
+        unread.delete()
+        self.assertEqual(self.client.get("/api/inbox/unread-count/").data["unread"], 0)
+        self.assertEqual(sum(NotificationAudienceCounter.objects.values_list("total", flat=True)), 1)
+
+
+class NotificationStreamTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username="listener", email="listener@example.com", password="x", role="MINEDUC")
+        self.token = str(ClaimsRefreshToken.for_user(user).access_token)
+        self.notification = Notification.objects.create(role="MINEDUC", sender="DISTRICT", message="Report sent")
+
+    async def test_stream_sends_missed_notifications_first(self):
+        response = await AsyncClient().get("/api/notifications/stream/", {"token": self.token, "last_id": "0"})
+        self.assertEqual(response.status_code, 200)
+        frames = aiter(response.streaming_content)
+        first = await anext(frames)
+        await frames.aclose()
+        self.assertTrue(first.startswith(f"id: {self.notification.id}\nevent: notification\n".encode()))
+        self.assertIn(b"Report sent", first)
+
+    def test_wsgi_requests_are_told_to_poll(self):
+        response = APIClient().get("/api/notifications/stream/", {"token": self.token})
+        self.assertEqual(response.status_code, 501)
+
+class ReportUploadTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = self.settings(MEDIA_ROOT=media.name, SIPMS_JOBS_EAGER=False)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="uploader", email="uploader@example.com", password="x", role="UMURENGE"
+        )
+        self.client.force_authenticate(self.user)
+
+    def start(self, content, sha256=None):
+        response = self.client.post("/api/prediction-reports/uploads/", {
+            "location": "Gasabo - Kinyinya", "filename": "report.pdf", "total_size": len(content),
+            "sha256": sha256 or hashlib.sha256(content).hexdigest(),
+        }, format="json")
+        return f"/api/prediction-reports/uploads/{response.data['data']['id']}/"
+
+    def put(self, url, offset, chunk, checksum=None):
+        return self.client.generic(
+            "PUT", url, chunk, content_type="application/octet-stream",
+            HTTP_X_UPLOAD_OFFSET=str(offset), HTTP_X_CHUNK_SHA256=checksum or hashlib.sha256(chunk).hexdigest(),
+        )
+
+    def upload(self, content):
+        url = self.start(content)
+        self.put(url, 0, content)
+        return self.client.post(url + "complete/")
+
+    def test_upload_resumes_after_a_partial_chunk(self):
+        content = b"%PDF-1.4 resumable body"
+        url = self.start(content)
+        self.assertEqual(self.put(url, 0, content[:8]).status_code, 200)
+        self.assertEqual(self.put(url, 4, content[4:]).status_code, 409)
+        self.assertEqual(self.client.get(url)["X-Upload-Offset"], "8")
+        self.assertEqual(self.client.post(url + "complete/").status_code, 400)
+
+        self.assertEqual(self.put(url, 8, content[8:]).status_code, 200)
+        response = self.client.post(url + "complete/")
+        self.assertEqual(response.status_code, 201)
+        report = PredictionReport.objects.get()
+        self.assertEqual((report.sha256, report.size), (hashlib.sha256(content).hexdigest(), len(content)))
+        self.assertTrue(Job.objects.filter(idempotency_key=f"report.uploaded:{report.pk}").exists())
+        # Completing again returns the same report without a second job.
+        self.assertEqual(self.client.post(url + "complete/").status_code, 200)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_checksum_mismatches_are_rejected(self):
+        content = b"%PDF-1.4 checksum body"
+        url = self.start(content, sha256=hashlib.sha256(b"something else").hexdigest())
+        self.assertEqual(self.put(url, 0, content, checksum="0" * 64).status_code, 400)
+        self.assertEqual(self.client.get(url)["X-Upload-Offset"], "0")
+
+        self.assertEqual(self.put(url, 0, content).status_code, 200)
+        response = self.client.post(url + "complete/")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("sha256", response.data)
+        self.assertEqual(self.client.get(url)["X-Upload-Offset"], "0")
+        self.assertFalse(PredictionReport.objects.exists())
+        self.assertFalse(Job.objects.exists())
+
+    def test_identical_documents_share_a_blob_until_the_last_reference_goes(self):
+        content = b"%PDF-1.4 shared body"
+        self.upload(content)
+        self.upload(content)
+        blob = DocumentBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        path = document_storage().path(blob.name)
+
+        first, second = PredictionReport.objects.all()
+        first.delete()
+        self.assertEqual(DocumentBlob.objects.get().ref_count, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(DocumentBlob.objects.exists())
+        self.assertFalse(os.path.exists(path))
+
+    def test_collect_garbage_removes_unreferenced_blobs_and_stray_files(self):
+        self.upload(b"%PDF-1.4 kept body")
+        kept = DocumentBlob.objects.get()
+        # A blob whose report never committed, and a file nothing names.
+        orphan = store_blob(ContentFile(b"orphan"), hashlib.sha256(b"orphan").hexdigest(), 6, "orphan.pdf")
+        stray = document_storage().save("prediction_reports/stray.pdf", ContentFile(b"stray"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            blobs, _, _ = collect_garbage(grace_seconds=0)
+        self.assertEqual(blobs, 1)
+        self.assertEqual(list(DocumentBlob.objects.all()), [kept])
+        self.assertFalse(document_storage().exists(orphan.name))
+        self.assertFalse(document_storage().exists(stray))
+        self.assertTrue(document_storage().exists(kept.name))
+
+
+    def test_adopting_legacy_documents_changes_the_report_list_etag(self):
+        name = document_storage().save("prediction_reports/legacy.pdf", ContentFile(b"%PDF-1.4 legacy body"))
+        PredictionReport.objects.create(location="Gasabo - Kinyinya", document=name, created_by=self.user)
+        etag = self.client.get("/api/prediction-reports/")["ETag"]
+        self.assertEqual(adopt_legacy_documents()[0], 1)
+        response = self.client.get("/api/prediction-reports/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_downloads_serve_single_byte_ranges(self):
+        content = b"%PDF-1.4 ranged body"
+        self.upload(content)
+        url = reverse("prediction-report-download", args=[PredictionReport.objects.get().pk])
+        response = self.client.get(url, HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 2-5/{len(content)}")
+        self.assertEqual(b"".join(response.streaming_content), content[2:6])
+        response = self.client.get(url, HTTP_RANGE=f"bytes={len(content)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(content)}")
+
+
+class ConditionalListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="etag", email="etag@example.com", password="x", role="MINEDUC")
+        )
+        School.objects.create(name="A", location="Gasabo - Kinyinya")
+
+    def test_matching_etag_gets_304_without_querying_rows(self):
+        response = self.client.get("/api/schools/")
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(1):
+            cached = self.client.get("/api/schools/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+        # The ETag covers the query string, so another page is not a match.
+        other_page = self.client.get("/api/schools/", {"page_size": 1}, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(other_page.status_code, 200)
+
+    def test_saves_and_bulk_writes_change_the_etag(self):
+        etags = [self.client.get("/api/schools/")["ETag"]]
+        School.objects.create(name="B", location="Gasabo - Remera")
+        etags.append(self.client.get("/api/schools/")["ETag"])
+        document = ContentFile(b"name,location\nC,Gasabo - Remera\n", name="schools.csv")
+        self.client.post("/api/schools/import/", {"file": document}, format="multipart")
+        etags.append(self.client.get("/api/schools/")["ETag"])
+        School.objects.get(name="C").delete()
+        etags.append(self.client.get("/api/schools/")["ETag"])
+        self.assertEqual(len(set(etags)), 4)
+        self.assertEqual(self.client.get("/api/schools/", HTTP_IF_NONE_MATCH=etags[0]).status_code, 200)
+
+
+
+class ByteRangeTests(SimpleTestCase):
+    def test_single_suffix_and_open_ended_ranges(self):
+        self.assertEqual(parse_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_range("bytes=900-2000", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=-5000", 1000), (0, 999))
+        self.assertEqual(parse_range("bytes=400-", 1000), (400, 999))
+
+    def test_unsatisfiable_and_unsupported_ranges(self):
+        self.assertIs(parse_range("bytes=1000-", 1000), False)
+        self.assertIs(parse_range("bytes=5-2", 1000), False)
+        self.assertIs(parse_range("bytes=-0", 1000), False)
+        self.assertIs(parse_range("bytes=-10", 0), False)
+        self.assertIs(parse_range("bytes=0-", 0), False)
+        self.assertIsNone(parse_range("", 1000))
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 1000))
+        self.assertIsNone(parse_range("items=0-1", 1000))
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        override = self.settings(SIPMS_JOBS_EAGER=False, SIPMS_JOBS_RETRY_BASE_SECONDS=10)
+        override.enable()
+        self.addCleanup(override.disable)
+        calls = []
+
+        def flaky(fail_times):
+            calls.append(fail_times)
+            if len(calls) <= fail_times:
+                raise RuntimeError("transient")
+            return {"calls": len(calls)}
+
+        patcher = mock.patch.dict(jobs.TASKS, {"test.flaky": flaky})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_due(self):
+        Job.objects.filter(status="queued").update(run_at=timezone.now())
+        job, = jobs.claim("worker")
+        return jobs.execute(job)
+
+    def fail_due(self):
+        with self.assertLogs(jobs.logger, "WARNING"):
+            self.assertFalse(self.run_due())
+
+    def test_failed_attempts_back_off_then_succeed(self):
+        job = jobs.enqueue("test.flaky", {"fail_times": 2}, max_attempts=3)
+        before = timezone.now()
+        self.fail_due()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("queued", 1))
+        self.assertIn("RuntimeError: transient", job.last_error)
+        # Base 10s, doubled per attempt, with +/-20% jitter.
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=8))
+        self.assertEqual(jobs.claim("worker"), [])
+
+        self.fail_due()
+        job.refresh_from_db()
+        self.assertGreaterEqual(job.run_at, timezone.now() + timedelta(seconds=15))
+        self.assertTrue(self.run_due())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.result), ("succeeded", 3, {"calls": 3}))
+
+    def test_last_attempt_fails_permanently(self):
+        job = jobs.enqueue("test.flaky", {"fail_times": 5}, max_attempts=1)
+        self.fail_due()
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertIsNotNone(job.finished_at)
+
+    def test_expired_leases_are_requeued_or_failed(self):
+        retry = jobs.enqueue("test.flaky", {"fail_times": 0}, max_attempts=2)
+        spent = jobs.enqueue("test.flaky", {"fail_times": 0}, max_attempts=1)
+        live = jobs.enqueue("test.flaky", {"fail_times": 0}, max_attempts=2)
+        jobs.claim("dead-worker", limit=3)
+        Job.objects.exclude(pk=live.pk).update(locked_at=timezone.now() - timedelta(seconds=120))
+
+        self.assertEqual(jobs.release_expired(lease_seconds=60), 1)
+        statuses = dict(Job.objects.values_list("pk", "status"))
+        self.assertEqual(statuses, {retry.pk: "queued", spent.pk: "failed", live.pk: "running"})
+
+
+    def test_a_requeued_job_is_not_run_or_finished_by_its_old_worker(self):
+        job = jobs.enqueue("test.flaky", {"fail_times": 0})
+        stale, = jobs.claim("dead-worker")
+        Job.objects.update(locked_at=timezone.now() - timedelta(seconds=120))
+        jobs.release_expired(lease_seconds=60)
+        with self.assertLogs(jobs.logger, "WARNING"):
+            self.assertFalse(jobs.execute(stale))
+        self.assertEqual(Job.objects.get(pk=job.pk).status, "queued")
+
+        def requeued_midway():
+            # Stands in for release_expired and a second claim during the run.
+            School.objects.create(name="Side effect", location="Gasabo - Kinyinya")
+            Job.objects.update(locked_by="other-worker")
+
+        with mock.patch.dict(jobs.TASKS, {"test.flaky": requeued_midway}):
+            Job.objects.update(payload={})
+            running, = jobs.claim("worker")
+            with self.assertLogs(jobs.logger, "WARNING"):
+                self.assertFalse(jobs.execute(running))
+        # The handler's writes roll back with the success it could not record.
+        self.assertNotEqual(Job.objects.get(pk=job.pk).status, "succeeded")
+        self.assertFalse(School.objects.exists())
+
+class LoginTests(TestCase):
+    def test_slim_login_logs_the_email(self):
+        user = User.objects.create_user(username="slim", email="slim@example.com", password="Secret-123", role="SCHOOL")
+        response = APIClient().post("/api/login/?slim=1", {"email": "slim@example.com", "password": "Secret-123"},
+                                    format="json")
+        self.assertEqual(response.data["user"], {"id": user.pk, "role": "SCHOOL", "sector": None, "school_id": None})
+        log = ActionLog.objects.get(action="LOGIN")
+        self.assertEqual((log.object_id, log.details), (user.pk, {"email": "slim@example.com"}))
+
+
+class TokenClaimsTests(TestCase):
+    def setUp(self):
+        self.school = School.objects.create(name="Claims", location="Gasabo - Remera")
+        self.user = User.objects.create_user(
+            username="claims", email="claims@example.com", password="x", role="SCHOOL", school=self.school
+        )
+        self.auth = ClaimsJWTAuthentication()
+        self.token = self.auth.get_validated_token(str(ClaimsRefreshToken.for_user(self.user).access_token))
+
+    def test_claims_are_trusted_until_the_user_changes(self):
+        user = self.auth.get_user(self.token)
+        self.assertIsInstance(user, TokenClaimsUser)
+        self.assertEqual((user.role, user.school_id), ("SCHOOL", self.school.pk))
+
+        self.user.role = "DISTRICT"
+        self.user.save()
+        user = self.auth.get_user(self.token)
+        self.assertNotIsInstance(user, TokenClaimsUser)
+        self.assertEqual(user.role, "DISTRICT")
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+    def test_deleting_the_school_stales_its_users_claims(self):
+        self.school.delete()
+        user = self.auth.get_user(self.token)
+        self.assertNotIsInstance(user, TokenClaimsUser)
+        self.assertIsNone(user.school_id)
+
+
+class SerializedCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.school = School.objects.create(name="Cached", location="Gasabo - Remera")
+
+    def test_cache_hit_costs_no_queries(self):
+        self.client.get(f"/api/schools/detail/{self.school.pk}/")
+        with self.assertNumQueries(0):
+            response = self.client.get(f"/api/schools/detail/{self.school.pk}/")
+        self.assertEqual(response.data["name"], "Cached")
+
+    def test_save_evicts_school_and_its_users(self):
+        user = User.objects.create_user(
+            username="cached", email="cached@example.com", password="x", school=self.school
+        )
+        self.client.get(f"/api/users/detail/{user.pk}/")
+        self.school.name = "Renamed"
+        self.school.save()
+        self.assertEqual(self.client.get(f"/api/schools/detail/{self.school.pk}/").data["name"], "Renamed")
+        self.assertEqual(self.client.get(f"/api/users/detail/{user.pk}/").data["school"]["name"], "Renamed")
+
+    def test_writes_evict_entries_read_through_another_instance(self):
+        # A second instance on the shared backend, as another worker would hold.
+        other = SerializedCache("school", SchoolSerializer)
+        self.assertEqual(other.get(self.school.pk, lambda: self.school)["name"], "Cached")
+        user = User.objects.create_user(username="writer", email="writer@example.com", password="x", role="MINEDUC")
+        self.client.force_authenticate(user)
+
+        def load():
+            return School.objects.get(pk=self.school.pk)
+
+        self.client.patch(f"/api/schools/{self.school.pk}/", {"name": "Renamed"}, format="json")
+        self.assertEqual(other.get(self.school.pk, load)["name"], "Renamed")
+
+        # Bulk imports bypass signals and evict explicitly.
+        document = ContentFile(b"name,location,student_population\nRenamed,Gasabo - Remera,420\n", name="schools.csv")
+        self.client.post("/api/schools/import/", {"file": document}, format="multipart")
+        self.assertEqual(other.get(self.school.pk, load)["student_population"], 420)
+        self.assertEqual(other.hits, 0)
+
+    def test_local_memory_cache_is_bypassed_outside_single_process_setups(self):
+        with self.settings(SIPMS_SERIALIZED_CACHE_LOCAL=False, DEBUG=False):
+            self.client.get(f"/api/schools/detail/{self.school.pk}/")
+            with self.assertNumQueries(1):
+                self.client.get(f"/api/schools/detail/{self.school.pk}/")
+
+
+class SerializerBenchmarkTests(SimpleTestCase):
+    def test_field_map_is_built_once_per_class(self):
+        SchoolSerializer()
+        with mock.patch.object(drf_serializers.ModelSerializer, "get_fields") as get_fields:
+            first, second = SchoolSerializer(), SchoolSerializer()
+            self.assertIsNot(first.fields["name"], second.fields["name"])
+        get_fields.assert_not_called()
+        self.assertFalse(first.fields["name"].required)
+        self.assertTrue(first.fields["name"].allow_blank)
+
+    def test_instances_do_not_share_field_state(self):
+        first, second = SchoolSerializer(), SchoolSerializer()
+        name = first.fields["name"]
+        self.assertIsNot(name.validators, second.fields["name"].validators)
+        self.assertIsNot(name.error_messages, second.fields["name"].error_messages)
+
+    def test_cached_field_maps_cost_at_most_half_a_rebuild(self):
+        timings = measure_field_maps(repeat=50)
+        cached = sum(cached for cached, _ in timings.values())
+        uncached = sum(uncached for _, uncached in timings.values())
+        self.assertLessEqual(cached, uncached * 0.5, timings)
+
+    def test_every_benchmarked_serializer_has_a_budget(self):
+        # Timings are checked by `manage.py benchmark_serializers --check`.
+        self.assertEqual(set(BUDGETS_US), {serializer.__name__ for serializer, _, _ in CASES})
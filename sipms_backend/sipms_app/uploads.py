@@ -0,0 +1,176 @@
+import hashlib
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import APIException, ValidationError
+
+from .blobs import READ_BLOCK_SIZE, LocalFile, store_blob, stream_sha256
+from .models import PredictionReport, ReportUpload
+
+
+class UploadOffsetConflict(APIException):
+    status_code = 409
+    default_detail = "Chunk offset does not match the bytes received so far."
+    default_code = "offset_conflict"
+
+
+def max_upload_size():
+    return getattr(settings, "SIPMS_UPLOAD_MAX_SIZE", 10 * 1024 * 1024)
+
+
+def chunk_size():
+    return getattr(settings, "SIPMS_UPLOAD_CHUNK_SIZE", 1024 * 1024)
+
+
+def upload_dir():
+    path = getattr(settings, "SIPMS_UPLOAD_TEMP_DIR", None) or os.path.join(settings.MEDIA_ROOT, "uploads", "partial")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def partial_path(upload):
+    return os.path.join(upload_dir(), f"{upload.pk}.part")
+
+
+def file_sha256(path):
+    with open(path, "rb") as stream:
+        return stream_sha256(stream)
+
+
+def write_chunk(upload, offset, stream, checksum):
+    """
+    Append one chunk read from ``stream`` at byte ``offset``. The body is
+    spooled and hashed before any lock is taken, so a slow client never holds
+    the upload row; only the local copy into the partial file is serialized.
+    Returns the refreshed upload.
+    """
+    if not checksum:
+        raise ValidationError({"checksum": "X-Chunk-SHA256 header is required."})
+    spool_path = os.path.join(upload_dir(), f"{upload.pk}.{uuid.uuid4().hex}.chunk")
+    limit = chunk_size()
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(spool_path, "wb") as spool:
+            for block in iter(lambda: stream.read(READ_BLOCK_SIZE), b""):
+                size += len(block)
+                if size > limit:
+                    raise ValidationError({"chunk": f"Chunks cannot exceed {limit} bytes."})
+                digest.update(block)
+                spool.write(block)
+        if size == 0:
+            raise ValidationError({"chunk": "Empty chunk."})
+        if digest.hexdigest() != checksum.strip().lower():
+            raise ValidationError({"checksum": "Chunk checksum mismatch; resend the chunk."})
+
+        with transaction.atomic():
+            locked = ReportUpload.objects.select_for_update().get(pk=upload.pk)
+            if locked.status != "open":
+                raise ValidationError({"upload": "Upload is already complete."})
+            if locked.received != offset:
+                raise UploadOffsetConflict(
+                    f"Expected offset {locked.received}, got {offset}."
+                )
+            if offset + size > locked.total_size:
+                raise ValidationError({"chunk": "Chunk runs past the declared total_size."})
+            _write_at(partial_path(locked), offset, spool_path)
+            locked.received = offset + size
+            locked.save(update_fields=["received", "updated_at"])
+        return locked
+    finally:
+        if os.path.exists(spool_path):
+            os.remove(spool_path)
+
+
+def _write_at(path, offset, spool_path):
+    # Writing at the offset (not appending) and truncating after discards any
+    # bytes left by a copy whose row update never committed.
+    mode = "r+b" if os.path.exists(path) else "wb"
+    with open(path, mode) as dest, open(spool_path, "rb") as src:
+        dest.seek(offset)
+        for block in iter(lambda: src.read(READ_BLOCK_SIZE), b""):
+            dest.write(block)
+        dest.truncate()
+        dest.flush()
+        os.fsync(dest.fileno())
+
+
+def complete(upload, on_created=None):
+    """
+    Verify the assembled file against the declared size and checksum and turn
+    it into a PredictionReport. Completing twice returns the same report. A
+    checksum mismatch resets the upload so the client starts over.
+    ``on_created(report)`` runs in the transaction that creates the report,
+    so work it queues commits or rolls back together with the report.
+    """
+    with transaction.atomic():
+        locked = ReportUpload.objects.select_for_update().get(pk=upload.pk)
+        if locked.status == "complete":
+            return locked.report, False
+        path = partial_path(locked)
+        if locked.received != locked.total_size or not os.path.exists(path):
+            raise ValidationError(
+                {"upload": f"Upload incomplete: {locked.received} of {locked.total_size} bytes received."}
+            )
+        if os.path.getsize(path) != locked.total_size:
+            raise ValidationError({"upload": "Assembled file size does not match total_size."})
+        digest = file_sha256(path)
+        corrupt = bool(locked.sha256) and digest != locked.sha256
+        if corrupt:
+            os.remove(path)
+            locked.received = 0
+            locked.save(update_fields=["received", "updated_at"])
+        else:
+            report = _create_report(locked, path, digest)
+            if on_created is not None:
+                on_created(report)
+    if corrupt:
+        # Raised outside the transaction so the reset offset is kept.
+        raise ValidationError({"sha256": "Assembled file checksum mismatch; upload restarted."})
+    return report, True
+
+
+def _create_report(upload, path, digest):
+    # A document already in blob storage is not written again; the partial
+    # file is simply dropped.
+    with open(path, "rb") as stream:
+        blob = store_blob(LocalFile(stream), digest, upload.total_size, upload.filename)
+    if os.path.exists(path):
+        os.remove(path)
+    report = PredictionReport.objects.create(
+        location=upload.location,
+        created_by_id=upload.created_by_id,
+        blob=blob,
+        document=blob.name,
+        filename=upload.filename,
+        sha256=digest,
+        size=upload.total_size,
+    )
+
+    upload.sha256 = digest
+    upload.status = "complete"
+    upload.report = report
+    upload.save(update_fields=["sha256", "status", "report", "updated_at"])
+    return report
+
+
+def abort(upload):
+    path = partial_path(upload)
+    if os.path.exists(path):
+        os.remove(path)
+    upload.delete()
+
+
+def purge_stale(hours=None, now=None):
+    """Delete open uploads untouched for ``hours`` along with their partial files."""
+    if hours is None:
+        hours = getattr(settings, "SIPMS_UPLOAD_STALE_HOURS", 48)
+    cutoff = (now or timezone.now()) - timedelta(hours=hours)
+    stale = list(ReportUpload.objects.filter(status="open", updated_at__lt=cutoff))
+    for upload in stale:
+        abort(upload)
+    return len(stale)
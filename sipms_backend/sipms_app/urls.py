@@ -9,26 +9,41 @@ urlpatterns = [
     path('users/detail/<int:id>/', UserDetailView.as_view(), name='user-detail'),
     path("login/", LoginView.as_view(), name="login"),
     path("schools/", SchoolListCreateView.as_view(), name="schools"),
+    path('schools/import/', SchoolImportView.as_view(), name='school-import'),
     path('schools/<int:pk>/', SchoolRetrieveUpdateDestroyView.as_view(), name='school-detail'),
     path('schools/detail/<int:pk>/', SchoolDetailView.as_view(), name='school-detail'),
+    path('cache/metrics/', CacheMetricsView.as_view(), name='cache-metrics'),
     path("predictions/", PredictionListCreateView.as_view(), name="predictions"),
+    path("predictions/bulk/", PredictionBulkGenerateView.as_view(), name="predictions-bulk"),
     path("predictions/<int:pk>/approve/", PredictionApprovalUpdateView.as_view(), name="prediction-approve"),
     path("projects/", ProjectListCreateView.as_view(), name="projects"),
     path("budget/", BudgetTrackingListCreateView.as_view(), name="budget"),
     path("district-summary/", DistrictSummaryView.as_view(), name="district-summary"),
     path('notifications/', NotificationListCreateView.as_view(), name='notification-list-create'),
+    path('notifications/stream/', notification_stream, name='notification-stream'),
     path('notifications/<int:id>/', NotificationDetailView.as_view(), name='notification-detail'),
+    path('inbox/', InboxListView.as_view(), name='inbox'),
+    path('inbox/unread-count/', InboxUnreadCountView.as_view(), name='inbox-unread-count'),
+    path('inbox/read/', InboxMarkReadView.as_view(), name='inbox-read'),
 
     path('prediction-reports/', PredictionReportListCreateView.as_view(), name='prediction-report-list-create'),
     path('prediction-reports/upload/', PredictionReportUploadView.as_view(),name='prediction-report-upload'),
+    path('prediction-reports/export/', PredictionReportExportView.as_view(), name='prediction-report-export'),
+    path('prediction-reports/uploads/', ReportUploadCreateView.as_view(), name='report-upload-create'),
+    path('prediction-reports/uploads/<uuid:pk>/', ReportUploadDetailView.as_view(), name='report-upload-detail'),
+    path('prediction-reports/uploads/<uuid:pk>/complete/', ReportUploadCompleteView.as_view(), name='report-upload-complete'),
 
     path('prediction-reports/<int:pk>/', PredictionReportDetailView.as_view(), name='prediction-report-detail'),
+    path('prediction-reports/<int:pk>/download/', PredictionReportDownloadView.as_view(), name='prediction-report-download'),
     path('prediction-reports/by-location/<str:location>/', get_reports_by_location, name='reports-by-location'),
 
     path('send-to-mineduc/<int:report_id>/', send_to_mineduc, name='send-to-mineduc'),
     path("prediction-reports/mineduc/approve/<int:id>/", approve_report),
     path("prediction-reports/mineduc/deny/<int:id>/", deny_report),
+    path('jobs/', JobStatsView.as_view(), name='job-stats'),
+    path('jobs/<int:pk>/', JobDetailView.as_view(), name='job-detail'),
      path('action-logs/', ActionLogListView.as_view(), name='action-logs'),
+     path('action-logs/metrics/', ActionLogMetricsView.as_view(), name='action-log-metrics'),
 
 ]
 
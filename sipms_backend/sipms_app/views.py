@@ -3,12 +3,35 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view
 from rest_framework.views import APIView
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from asgiref.sync import sync_to_async
 from django.core.files.base import ContentFile
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from .models import *
 from .serializers import *
-from .mixins import ActionLogMixin
+from .aggregates import build_rollup
+from .audit import get_writer
+from .authentication import ClaimsJWTAuthentication, full_user_cache
+from .bulk import filter_schools, generate_predictions
+from .caching import school_cache, user_cache
+from .downloads import document_response
+from .exports import FORMATS as EXPORT_FORMATS
+from .filters import filter_action_logs, filter_prediction_list, filter_school_list, filter_user_list, parse_int, parse_ordering
+from .filters import PREDICTION_ORDERING, SCHOOL_ORDERING
+from .imports import import_schools, iter_records
+from .inbox import get_cursor, mark_read, unread_count, visible_notifications
+from .jobs import enqueue, queue_stats
+from .login import use_slim_response
+from .mixins import ActionLogMixin, ConditionalListMixin, SparseFieldsetMixin
+from .notification_stream import event_stream
+from .query_planner import plan_queryset
+from .rollups import ROLLUP_FIELDS
+from .uploads import abort as abort_upload, complete as complete_upload, write_chunk
 
 # --- Mixin for Action Logging ---
 
@@ -34,10 +57,14 @@ class RegisterView(ActionLogMixin, generics.CreateAPIView):
         else:
             return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
-class UserListView(generics.ListAPIView):
+class UserListView(SparseFieldsetMixin, generics.ListAPIView):
     queryset = User.objects.all()
     serializer_class = UserRegisterSerializer
     permission_classes = [permissions.AllowAny]
+    cursor_ordering = ('-date_joined', '-id')
+
+    def get_queryset(self):
+        return self.plan(filter_user_list(super().get_queryset(), self.request.query_params))
 
 class UserDetailView(generics.RetrieveAPIView):
     queryset = User.objects.all()
@@ -45,6 +72,9 @@ class UserDetailView(generics.RetrieveAPIView):
     permission_classes = [permissions.AllowAny]
     lookup_field = 'id'
 
+    def retrieve(self, request, *args, **kwargs):
+        return Response(user_cache.get(kwargs['id'], self.get_object))
+
 class UserRetrieveUpdateDestroyView(ActionLogMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -62,7 +92,7 @@ class UserRetrieveUpdateDestroyView(ActionLogMixin, generics.RetrieveUpdateDestr
                 action='UPDATE',
                 model_name='User',
                 object_id=instance.id,
-                details={'updated_fields': request.data.keys()}
+                details={'updated_fields': list(request.data.keys())}
             )
             return Response({"message": "User updated successfully!", "data": serializer.data})
         else:
@@ -85,30 +115,39 @@ class LoginView(ActionLogMixin, generics.GenericAPIView):
     serializer_class = UserLoginSerializer
     permission_classes = [permissions.AllowAny]
 
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'slim': use_slim_response(self.request)}
+
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        user_data = serializer.validated_data.get('user', {})
-        user_id = user_data.get('id')
-        user_email = user_data.get('email')
+        user = serializer.authenticated_user
 
         self.log_action(
             request,
             action='LOGIN',
             model_name='User',
-            object_id=user_id,
-            details={'email': user_email}
+            object_id=user.id,
+            details={'email': user.email}
         )
 
         return Response(serializer.validated_data)
 
 
 # --- School Views ---
-class SchoolListCreateView(ActionLogMixin, generics.ListCreateAPIView):
+class SchoolListCreateView(ActionLogMixin, ConditionalListMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     queryset = School.objects.all()
     serializer_class = SchoolSerializer
     permission_classes = [permissions.AllowAny]
+    etag_models = (School,)
+
+    @property
+    def cursor_ordering(self):
+        return parse_ordering(self.request.query_params, SCHOOL_ORDERING)
+
+    def get_queryset(self):
+        return self.plan(filter_school_list(super().get_queryset(), self.request.query_params))
 
     def perform_create(self, serializer):
         school = serializer.save()
@@ -134,7 +173,7 @@ class SchoolRetrieveUpdateDestroyView(ActionLogMixin, generics.RetrieveUpdateDes
             action='UPDATE',
             model_name='School',
             object_id=school.id,
-            details={'updated_fields': self.request.data.keys()}
+            details={'updated_fields': list(self.request.data.keys())}
         )
 
     def perform_destroy(self, instance):
@@ -152,12 +191,56 @@ class SchoolDetailView(generics.RetrieveAPIView):
     serializer_class = SchoolSerializer
     permission_classes = [permissions.AllowAny]
 
+    def retrieve(self, request, *args, **kwargs):
+        return Response(school_cache.get(kwargs['pk'], self.get_object))
+
+class SchoolImportView(APIView):
+    """Upsert schools from an uploaded CSV/XLSX file; ``dry_run`` only validates."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({
+                'success': False,
+                'message': 'Attach the CSV or XLSX file as "file".'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+        stats = import_schools(
+            iter_records(upload.file, upload.name),
+            user=request.user,
+            chunk_size=parse_int(request.data, 'chunk_size') or 1000,
+            dry_run=dry_run,
+        )
+        return Response({
+            'success': not stats['invalid'],
+            'message': f"{stats['created']} created, {stats['updated']} updated, {stats['invalid']} invalid",
+            'data': stats,
+        }, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
+class CacheMetricsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response({
+            "school": school_cache.metrics(),
+            "user": user_cache.metrics(),
+            "token_user": full_user_cache.metrics(),
+        })
+
 # --- Prediction Views ---
-class PredictionListCreateView(ActionLogMixin, generics.ListCreateAPIView):
+class PredictionListCreateView(ActionLogMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     queryset = Prediction.objects.all()
     serializer_class = PredictionSerializer
     permission_classes = [permissions.AllowAny]
 
+    @property
+    def cursor_ordering(self):
+        return parse_ordering(self.request.query_params, PREDICTION_ORDERING)
+
+    def get_queryset(self):
+        return self.plan(filter_prediction_list(super().get_queryset(), self.request.query_params))
+
     def perform_create(self, serializer):
         prediction = serializer.save(created_by=self.request.user)
         # Log the creation
@@ -169,6 +252,22 @@ class PredictionListCreateView(ActionLogMixin, generics.ListCreateAPIView):
             details={'school': prediction.school.id}
         )
 
+class PredictionBulkGenerateView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        schools = filter_schools(
+            School.objects.all(),
+            district=request.data.get("district"),
+            location=request.data.get("location"),
+        )
+        stats = generate_predictions(schools, request.user)
+        return Response({
+            "success": True,
+            "message": f"{stats['created']} predictions generated",
+            "data": stats,
+        }, status=status.HTTP_201_CREATED)
+
 class PredictionApprovalUpdateView(ActionLogMixin, generics.UpdateAPIView):
     queryset = Prediction.objects.all()
     permission_classes = [permissions.IsAuthenticated]
@@ -241,23 +340,32 @@ class DistrictSummaryView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        umurenge_id = request.query_params.get("umurenge")
-        predictions = Prediction.objects.filter(school__umurenge_id=umurenge_id)
-        total_rooms = sum([p.rooms_to_build for p in predictions])
-        total_budget = sum([p.estimated_budget for p in predictions])
+        umurenge = request.query_params.get("umurenge")
+        district = request.query_params.get("district")
+        sectors = InfrastructureGapRollup.objects.all()
+        if umurenge:
+            sectors = sectors.filter(location__iexact=umurenge)
+        if district:
+            sectors = sectors.filter(district__iexact=district)
+
+        rollup = build_rollup(sectors.values("location", *ROLLUP_FIELDS))
+        national = rollup["national"]
         data = {
-            "umurenge": umurenge_id,
-            "total_schools": predictions.count(),
-            "total_rooms_to_build": total_rooms,
-            "total_estimated_budget": total_budget,
+            "umurenge": umurenge,
+            "district": district,
+            "total_schools": national["total_schools"],
+            "total_rooms_to_build": national["total_rooms_to_build"],
+            "total_estimated_budget": national["total_estimated_budget"],
+            **rollup,
         }
         return Response(data)
 
 # --- Notification Views ---
-class NotificationListCreateView(ActionLogMixin, generics.ListCreateAPIView):
+class NotificationListCreateView(ActionLogMixin, ConditionalListMixin, generics.ListCreateAPIView):
     queryset = Notification.objects.all().order_by('-created_at')
     serializer_class = NotificationSerializer
     permission_classes = [permissions.AllowAny]
+    etag_models = (Notification,)
 
     def perform_create(self, serializer):
         notification = serializer.save()
@@ -270,6 +378,41 @@ class NotificationListCreateView(ActionLogMixin, generics.ListCreateAPIView):
             details={'title': notification.title}
         )
 
+async def notification_stream(request):
+    """
+    Server-Sent Events feed of notifications addressed to the caller's role
+    and sector. EventSource cannot set headers, so the access token may be
+    passed as ?token=. Reconnects resume from Last-Event-ID (or ?last_id=).
+
+    Only served through asgi.py (see its docstring). Under WSGI Django drains
+    an async stream before sending a byte, so this returns 501 and clients
+    fall back to polling /api/notifications/.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({
+            'detail': 'Live notifications need the ASGI server; poll /api/notifications/ instead.'
+        }, status=501)
+    authenticator = ClaimsJWTAuthentication()
+    try:
+        header = authenticator.get_header(request)
+        raw_token = request.GET.get('token') or (header and authenticator.get_raw_token(header))
+        if not raw_token:
+            return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+        validated = authenticator.get_validated_token(raw_token)
+        user = await sync_to_async(authenticator.get_user)(validated)
+    except (InvalidToken, AuthenticationFailed) as exc:
+        return JsonResponse({'detail': str(exc)}, status=401)
+
+    last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_id')
+    last_id = int(last_id) if last_id and last_id.isdigit() else None
+    response = StreamingHttpResponse(
+        event_stream(user.role, user.sector, last_id),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 class NotificationDetailView(ActionLogMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
@@ -284,7 +427,7 @@ class NotificationDetailView(ActionLogMixin, generics.RetrieveUpdateDestroyAPIVi
             action='UPDATE',
             model_name='Notification',
             object_id=notification.id,
-            details={'updated_fields': self.request.data.keys()}
+            details={'updated_fields': list(self.request.data.keys())}
         )
 
     def perform_destroy(self, instance):
@@ -297,11 +440,72 @@ class NotificationDetailView(ActionLogMixin, generics.RetrieveUpdateDestroyAPIVi
         )
         instance.delete()
 
+# --- Inbox Views ---
+class InboxListView(generics.ListAPIView):
+    serializer_class = InboxNotificationSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = visible_notifications(self.request.user)
+        since = parse_int(self.request.query_params, 'since')
+        if since is not None:
+            queryset = queryset.filter(id__gt=since)
+        if self.request.query_params.get('unread') in ('1', 'true'):
+            queryset = queryset.filter(id__gt=self.get_read_cursor().last_read_id)
+        return queryset
+
+    def get_read_cursor(self):
+        if not hasattr(self, '_read_cursor'):
+            self._read_cursor = get_cursor(self.request.user)
+        return self._read_cursor
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['last_read_id'] = self.get_read_cursor().last_read_id
+        return context
+
+class InboxUnreadCountView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        cursor = get_cursor(request.user)
+        return Response({
+            'unread': unread_count(request.user, cursor),
+            'last_read_id': cursor.last_read_id,
+        })
+
+class InboxMarkReadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        up_to_id = parse_int(request.data, 'up_to_id')
+        cursor = mark_read(request.user, up_to_id)
+        return Response({
+            'unread': unread_count(request.user, cursor),
+            'last_read_id': cursor.last_read_id,
+        })
+
 # --- Prediction Report Views ---
-class PredictionReportListCreateView(ActionLogMixin, generics.ListCreateAPIView):
+def queue_report_job(request, task_name, report, idempotency_key=None, **payload):
+    """
+    Queue the side effects of a report action. A client-supplied
+    Idempotency-Key header takes precedence over the caller's natural key.
+    """
+    client_key = request.headers.get('Idempotency-Key')
+    if client_key:
+        idempotency_key = f"{task_name}:{request.user.pk}:{client_key}"
+    return enqueue(task_name, {
+        'report_id': report.id,
+        'user_id': request.user.pk if request.user.is_authenticated else None,
+        'timestamp': timezone.now().isoformat(),
+        **payload,
+    }, idempotency_key=idempotency_key)
+
+class PredictionReportListCreateView(ConditionalListMixin, generics.ListCreateAPIView):
     queryset = PredictionReport.objects.all()
     serializer_class = PredictionReportSerializer
     permission_classes = [permissions.AllowAny]
+    etag_models = (PredictionReport, User)
 
     def get_queryset(self):
         queryset = PredictionReport.objects.all()
@@ -313,15 +517,9 @@ class PredictionReportListCreateView(ActionLogMixin, generics.ListCreateAPIView)
     def create(self, request, *args, **kwargs):
         serializer = PredictionReportCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        report = serializer.save()
-        # Log the creation
-        self.log_action(
-            request,
-            action='CREATE',
-            model_name='PredictionReport',
-            object_id=report.id,
-            details={'location': report.location}
-        )
+        with transaction.atomic():
+            report = serializer.save()
+            queue_report_job(request, 'report.uploaded', report, f'report.uploaded:{report.id}', action='CREATE')
         output_serializer = PredictionReportSerializer(report, context={'request': request})
         return Response({
             'success': True,
@@ -351,14 +549,45 @@ class PredictionReportDetailView(ActionLogMixin, generics.RetrieveDestroyAPIView
             model_name='PredictionReport',
             object_id=instance.id
         )
-        if instance.document:
-            instance.document.delete()
+        # The post_delete signal releases the document blob.
         instance.delete()
         return Response({
             'success': True,
             'message': 'Report deleted successfully'
         }, status=status.HTTP_200_OK)
 
+class PredictionReportDownloadView(APIView):
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, pk):
+        return document_response(request, get_object_or_404(PredictionReport, pk=pk))
+
+class PredictionReportExportView(APIView):
+    """Queue a CSV/XLSX/PDF export of the latest predictions; the job result names the report."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        fmt = (request.data.get('format') or 'csv').lower()
+        if fmt not in EXPORT_FORMATS:
+            return Response({
+                'success': False,
+                'message': f"format must be one of {', '.join(EXPORT_FORMATS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        client_key = request.headers.get('Idempotency-Key')
+        job = enqueue('report.export', {
+            'user_id': request.user.pk,
+            'timestamp': timezone.now().isoformat(),
+            'format': fmt,
+            'district': request.data.get('district') or None,
+            'location': request.data.get('location') or None,
+        }, idempotency_key=f"report.export:{request.user.pk}:{client_key}" if client_key else None)
+        return Response({
+            'success': True,
+            'message': 'Export queued',
+            'job_id': job.id,
+            'data': JobSerializer(job).data
+        }, status=status.HTTP_202_ACCEPTED)
+
 @api_view(['GET'])
 def get_reports_by_location(request, location):
     reports = PredictionReport.objects.filter(location__iexact=location)
@@ -368,21 +597,15 @@ def get_reports_by_location(request, location):
         'data': serializer.data
     }, status=status.HTTP_200_OK)
 
-class PredictionReportUploadView(ActionLogMixin, APIView):
+class PredictionReportUploadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
         serializer = PredictionReportCreateSerializer(data=request.data)
         if serializer.is_valid():
-            report = serializer.save()
-            # Log the upload
-            self.log_action(
-                request,
-                action='UPLOAD',
-                model_name='PredictionReport',
-                object_id=report.id,
-                details={'location': report.location}
-            )
+            with transaction.atomic():
+                report = serializer.save()
+                queue_report_job(request, 'report.uploaded', report, f'report.uploaded:{report.id}')
             response_data = PredictionReportSerializer(
                 report, context={'request': request}
             ).data
@@ -397,68 +620,157 @@ class PredictionReportUploadView(ActionLogMixin, APIView):
             "errors": serializer.errors
         }, status=status.HTTP_400_BAD_REQUEST)
 
+class ReportUploadCreateView(generics.CreateAPIView):
+    """Start a resumable upload; chunks are then PUT to the returned id."""
+    serializer_class = ReportUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(created_by=request.user)
+        return Response({
+            'success': True,
+            'data': serializer.data
+        }, status=status.HTTP_201_CREATED)
+
+class ReportUploadDetailView(APIView):
+    """
+    GET reports the resume offset. PUT appends the raw request body at
+    ``X-Upload-Offset`` after checking it against ``X-Chunk-SHA256``.
+    DELETE abandons the upload.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_upload(self, request, pk):
+        return get_object_or_404(ReportUpload, pk=pk, created_by=request.user)
+
+    def respond(self, upload):
+        response = Response({'success': True, 'data': ReportUploadSerializer(upload).data})
+        response['X-Upload-Offset'] = str(upload.received)
+        return response
+
+    def get(self, request, pk):
+        return self.respond(self.get_upload(request, pk))
+
+    def put(self, request, pk):
+        upload = self.get_upload(request, pk)
+        offset = parse_int(request.headers, 'X-Upload-Offset')
+        if offset is None:
+            return Response({'success': False, 'message': 'X-Upload-Offset header is required'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if request.stream is None:
+            return Response({'success': False, 'message': 'Empty chunk'}, status=status.HTTP_400_BAD_REQUEST)
+        upload = write_chunk(upload, offset, request.stream, request.headers.get('X-Chunk-SHA256'))
+        return self.respond(upload)
+
+    def delete(self, request, pk):
+        abort_upload(self.get_upload(request, pk))
+        return Response({'success': True, 'message': 'Upload cancelled'}, status=status.HTTP_200_OK)
+
+class ReportUploadCompleteView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, pk):
+        upload = get_object_or_404(ReportUpload, pk=pk, created_by=request.user)
+        # Not wrapped in a transaction: a checksum failure must keep the
+        # upload's reset offset when it raises. The job is queued inside the
+        # transaction that creates the report instead.
+        report, created = complete_upload(upload, on_created=lambda report: queue_report_job(
+            request, 'report.uploaded', report, f'report.uploaded:{report.id}', size=upload.total_size
+        ))
+        return Response({
+            "success": True,
+            "message": "PDF uploaded successfully",
+            "data": PredictionReportSerializer(report, context={'request': request}).data
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
 @api_view(['POST'])
 def send_to_mineduc(request, report_id):
     try:
-        report = PredictionReport.objects.get(id=report_id)
-        report.is_sent_to_mineduc = True
-        report.save()
-        # Log the send
-        ActionLog.objects.create(
-            user=request.user if request.user.is_authenticated else None,
-            action='SEND',
-            model_name='PredictionReport',
-            object_id=report.id,
-            details={'sent_to_mineduc': True}
-        )
-        return Response({'success': True, 'message': 'Report sent to MINEDUC'})
+        with transaction.atomic():
+            report = PredictionReport.objects.get(id=report_id)
+            report.is_sent_to_mineduc = True
+            report.save()
+            # A retried send before the next review reuses the queued job; a
+            # re-send after a review is a new submission and gets its own.
+            review = Job.objects.filter(
+                task='report.reviewed', payload__report_id=report.id
+            ).order_by('-id').values_list('id', flat=True).first()
+            # Audit log and MINEDUC notification run in the job queue
+            job = queue_report_job(
+                request, 'report.sent', report, f'report.sent:{report.id}:{review or 0}',
+                sender=getattr(request.user, 'role', None) or Notification.Role.DISTRICT,
+            )
+        return Response({'success': True, 'message': 'Report sent to MINEDUC', 'job_id': job.id})
     except PredictionReport.DoesNotExist:
         return Response({'success': False, 'message': 'Report not found'}, status=404)
 
 @api_view(['POST'])
 def approve_report(request, id):
-    report = get_object_or_404(PredictionReport, id=id)
-    report.status = "approved"
-    report.denial_reason = None
-    report.approved_at = timezone.now()
-    report.save()
-    # Log the approve
-    ActionLog.objects.create(
-        user=request.user if request.user.is_authenticated else None,
-        action='APPROVE',
-        model_name='PredictionReport',
-        object_id=report.id,
-        details={'status': 'approved'}
-    )
+    with transaction.atomic():
+        report = get_object_or_404(PredictionReport, id=id)
+        report.status = "approved"
+        report.denial_reason = None
+        report.approved_at = timezone.now()
+        report.save()
+        # Audit log and author notification run in the job queue
+        job = queue_report_job(request, 'report.reviewed', report, status='approved')
     return Response({
         "success": True,
-        "message": "Report approved successfully"
+        "message": "Report approved successfully",
+        "job_id": job.id
     })
 
 @api_view(['POST'])
 def deny_report(request, id):
-    report = get_object_or_404(PredictionReport, id=id)
     reason = request.data.get("reason", "")
-    report.status = "denied"
-    report.denial_reason = reason
-    report.approved_at = None
-    report.save()
-    # Log the deny
-    ActionLog.objects.create(
-        user=request.user if request.user.is_authenticated else None,
-        action='DENY',
-        model_name='PredictionReport',
-        object_id=report.id,
-        details={'status': 'denied', 'reason': reason}
-    )
+    with transaction.atomic():
+        report = get_object_or_404(PredictionReport, id=id)
+        report.status = "denied"
+        report.denial_reason = reason
+        report.approved_at = None
+        report.save()
+        # Audit log and author notification run in the job queue
+        job = queue_report_job(request, 'report.reviewed', report, status='denied', reason=reason)
     return Response({
         "success": True,
         "message": "Report denied",
-        "reason": reason
+        "reason": reason,
+        "job_id": job.id
     })
 
+# --- Job Views ---
+class JobDetailView(generics.RetrieveAPIView):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response({
+            'success': True,
+            'data': self.get_serializer(self.get_object()).data
+        }, status=status.HTTP_200_OK)
+
+class JobStatsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response(queue_stats())
+
 # --- Action Log View ---
 class ActionLogListView(generics.ListAPIView):
     queryset = ActionLog.objects.all().order_by('-timestamp')
     serializer_class = ActionLogSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = ('-timestamp', '-id')
+
+    def get_queryset(self):
+        queryset = filter_action_logs(super().get_queryset(), self.request.query_params)
+        return plan_queryset(queryset, self.get_serializer_class())
+
+class ActionLogMetricsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response(get_writer().metrics())
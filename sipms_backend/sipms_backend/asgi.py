@@ -3,6 +3,11 @@ ASGI config for sipms_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the API through this module, e.g. with
+``uvicorn sipms_backend.asgi:application``, for the notification stream
+(/api/notifications/stream/) to work; under WSGI (runserver, gunicorn's
+sync workers) it answers 501 and the frontend polls instead.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
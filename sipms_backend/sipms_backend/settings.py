@@ -1,6 +1,9 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 
+from corsheaders.defaults import default_headers
+
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -47,20 +50,104 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'sipms_app.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
-    
+    'DEFAULT_PAGINATION_CLASS': 'sipms_app.pagination.StableCursorPagination',
+    'PAGE_SIZE': 50,
 }
 
+# Upper bound for ?page_size= and lifetime of the cached ?with_count= totals
+SIPMS_MAX_PAGE_SIZE = 500
+SIPMS_COUNT_CACHE_TIMEOUT = 60
+
+# ActionLog rows are queued and written in batches off the request path.
+# Tests write inline so assertions can see the rows inside their transaction
+# (see TEST_SETTINGS in sipms_backend/test_runner.py).
+SIPMS_AUDIT_ASYNC = True
+SIPMS_AUDIT_BATCH_SIZE = 200
+SIPMS_AUDIT_FLUSH_INTERVAL = 1.0
+SIPMS_AUDIT_QUEUE_SIZE = 10000
+SIPMS_AUDIT_ENQUEUE_TIMEOUT = 0.05
+SIPMS_AUDIT_SPOOL_PATH = None  # e.g. BASE_DIR / 'audit_spool.jsonl' for crash durability; each process writes audit_spool.<pid>.jsonl
+
+# archive_action_logs keeps this many full months of ActionLog in the table
+# and moves older months into gzip'd JSONL files under the archive directory.
+SIPMS_ACTIONLOG_RETENTION_MONTHS = 6
+SIPMS_ACTIONLOG_ARCHIVE_DIR = BASE_DIR / 'archives' / 'action_logs'
+
+# Report documents are uploaded in checksummed chunks of at most
+# SIPMS_UPLOAD_CHUNK_SIZE bytes, appended to a partial file under
+# SIPMS_UPLOAD_TEMP_DIR. It defaults to MEDIA_ROOT/uploads/partial; keep it on
+# the MEDIA_ROOT filesystem so completion is a rename rather than a copy.
+SIPMS_UPLOAD_MAX_SIZE = 10 * 1024 * 1024
+SIPMS_UPLOAD_CHUNK_SIZE = 1024 * 1024
+SIPMS_UPLOAD_TEMP_DIR = None
+SIPMS_UPLOAD_STALE_HOURS = 48
+
+# Background jobs live in the database and are run by `manage.py run_jobs`.
+# Eager mode runs each job inline when it is queued (tests, or
+# SIPMS_JOBS_EAGER=1 for a single-process dev server with no worker).
+SIPMS_JOBS_EAGER = os.environ.get('SIPMS_JOBS_EAGER') == '1'
+SIPMS_JOBS_WORKERS = int(os.environ.get('SIPMS_JOBS_WORKERS', '2'))
+SIPMS_JOBS_MAX_ATTEMPTS = 5
+SIPMS_JOBS_RETRY_BASE_SECONDS = 5
+SIPMS_JOBS_RETRY_MAX_SECONDS = 3600
+SIPMS_JOBS_LEASE_SECONDS = 300
+SIPMS_JOBS_POLL_INTERVAL = 1.0
+
+# Report downloads are cached privately for this long and revalidated by
+# content-hash ETag. Set SIPMS_DOCUMENT_ACCEL_REDIRECT to an nginx internal
+# location aliased to MEDIA_ROOT (e.g. '/protected-media/') to let the proxy
+# send the file.
+SIPMS_DOCUMENT_MAX_AGE = 3600
+SIPMS_DOCUMENT_ACCEL_REDIRECT = os.environ.get('SIPMS_DOCUMENT_ACCEL_REDIRECT') or None
+
+# Legacy multipart uploads spool to disk instead of being held in memory.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 256 * 1024
+
+PASSWORD_HASHERS = [
+    'sipms_app.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# PBKDF2 iterations per password hash. None keeps Django's default
+# (1,000,000); a lower cost is an explicit deployment choice made with
+# SIPMS_PASSWORD_ITERATIONS (600,000 is OWASP's PBKDF2-SHA256 floor). The
+# hash is nearly all of a login's cost. Changing it rehashes each account on
+# its next successful login. `manage.py benchmark_login` on one vCPU, per
+# worker process:
+#   1,000,000 -> ~2.0 logins/s    600,000 -> ~3.3/s    260,000 -> ~7.3/s
+# (lookup ~1.7 ms, JWT ~0.6 ms, full response ~2.3 ms, slim ~0.01 ms)
+SIPMS_PASSWORD_ITERATIONS = (
+    int(os.environ['SIPMS_PASSWORD_ITERATIONS']) if os.environ.get('SIPMS_PASSWORD_ITERATIONS') else None
+)
+# Answer POST /api/login/ with {id, role, sector, school_id} instead of the
+# nested user and school unless the client passes slim=0.
+SIPMS_LOGIN_SLIM = os.environ.get('SIPMS_LOGIN_SLIM') == '1'
+
+# Access tokens carry role, sector, school_id, is_active and token_version, so
+# authenticated requests only read (token_version, is_active) by primary key
+# instead of the full user row and school. Requests that read other user
+# fields load the row once per token into an in-process LRU of this many entries.
+SIPMS_JWT_USER_CACHE_SIZE = 1024
+
+# `manage.py test` applies TEST_SETTINGS from this runner on top of these.
+TEST_RUNNER = 'sipms_backend.test_runner.SipmsTestRunner'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=30),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
 }
 
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_HEADERS = (*default_headers, 'x-upload-offset', 'x-chunk-sha256')
+CORS_EXPOSE_HEADERS = ['X-Total-Count', 'X-Upload-Offset', 'Content-Range', 'Accept-Ranges', 'ETag']
 
 ROOT_URLCONF = 'sipms_backend.urls'
 
@@ -88,12 +175,83 @@ WSGI_APPLICATION = 'sipms_backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'ds.sqlite3',
+# SIPMS_DB_ENGINE=postgres selects PostgreSQL (psycopg 3); anything else keeps
+# the bundled SQLite file. The API test suite is backend-agnostic, so
+# `SIPMS_DB_ENGINE=postgres python manage.py test` checks parity with SQLite;
+# docker-compose.postgres.yml starts a matching server. The PostgreSQL-only
+# paths (GIN containment, connection pool, statement timeout) are only
+# exercised by that run, not by the default SQLite one.
+SIPMS_DB_ENGINE = os.environ.get('SIPMS_DB_ENGINE', 'sqlite')
+
+if SIPMS_DB_ENGINE == 'postgres':
+    DB_POOL_MAX_SIZE = int(os.environ.get('SIPMS_DB_POOL_MAX_SIZE', '10'))
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('SIPMS_DB_NAME', 'sipms'),
+            'USER': os.environ.get('SIPMS_DB_USER', 'sipms'),
+            'PASSWORD': os.environ.get('SIPMS_DB_PASSWORD', ''),
+            'HOST': os.environ.get('SIPMS_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('SIPMS_DB_PORT', '5432'),
+            # Django's pool and persistent connections are mutually exclusive
+            'CONN_MAX_AGE': 0 if DB_POOL_MAX_SIZE else int(os.environ.get('SIPMS_DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'options': '-c statement_timeout={}'.format(
+                    os.environ.get('SIPMS_DB_STATEMENT_TIMEOUT_MS', '15000')
+                ),
+            },
+        }
+    }
+    if DB_POOL_MAX_SIZE:
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('SIPMS_DB_POOL_MIN_SIZE', '2')),
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': int(os.environ.get('SIPMS_DB_POOL_TIMEOUT', '10')),
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SIPMS_DB_NAME', BASE_DIR / 'ds.sqlite3'),
+            'OPTIONS': {
+                # WAL lets readers run alongside the single writer; writers
+                # wait up to `timeout` seconds instead of failing with
+                # "database is locked", and IMMEDIATE takes the write lock at
+                # BEGIN so transactions never deadlock upgrading it.
+                'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+                'timeout': int(os.environ.get('SIPMS_DB_BUSY_TIMEOUT', '20')),
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
     }
+
+
+# "serialized" holds School/User API representations (see sipms_app/caching.py).
+# LocMem is a per-process LRU bounded by MAX_ENTRIES; set SIPMS_CACHE_REDIS_URL
+# to share it between workers. Bump VERSION when those serializers change.
+# Invalidation can't reach another process's LocMem, so with DEBUG off the
+# serialized cache stays unused on LocMem unless SIPMS_SERIALIZED_CACHE_LOCAL
+# declares a single-process deployment.
+SIPMS_SERIALIZED_CACHE_LOCAL = False
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'serialized': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sipms-serialized',
+        'TIMEOUT': 600,
+        'VERSION': 1,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
 }
+if os.environ.get('SIPMS_CACHE_REDIS_URL'):
+    CACHES['serialized'].update({
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['SIPMS_CACHE_REDIS_URL'],
+        'OPTIONS': {},
+    })
 
 
 # Password validation
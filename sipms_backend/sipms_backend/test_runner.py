@@ -0,0 +1,25 @@
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+# Applied for the whole `manage.py test` run.
+TEST_SETTINGS = {
+    # Write ActionLog rows inline so tests see them inside their transaction.
+    "SIPMS_AUDIT_ASYNC": False,
+    # Run jobs as they are queued; tests that exercise the queue turn it off.
+    "SIPMS_JOBS_EAGER": True,
+    # Hashing at production cost would dominate the suite's runtime.
+    "SIPMS_PASSWORD_ITERATIONS": 1000,
+    # The suite runs in one process, where LocMem invalidation is complete.
+    "SIPMS_SERIALIZED_CACHE_LOCAL": True,
+}
+
+
+class SipmsTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._test_settings = override_settings(**TEST_SETTINGS)
+        self._test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._test_settings.disable()
+        super().teardown_test_environment(**kwargs)
@@ -54,6 +54,28 @@ const handleError = (error) => {
     }
 };
 
+const UPLOAD_RETRIES = 5;
+const NOTIFICATION_POLL_MS = 30000;
+
+const sha256Hex = async (buffer) => {
+    const digest = await crypto.subtle.digest("SHA-256", buffer);
+    return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, "0")).join("");
+};
+
+// List endpoints are cursor-paginated and each list call returns one page:
+// { success, data, next, total }. Pass `next` back as `cursor` to fetch the
+// following page; `total` is only set when params include with_count: 1.
+const fetchPage = async (url, params = {}, cursor = null) => {
+    const response = cursor ? await api.get(cursor) : await api.get(url, { params });
+    const count = response.headers["x-total-count"];
+    return {
+        success: true,
+        data: response.data.results ?? response.data,
+        next: response.data.next ?? null,
+        total: count === undefined ? null : Number(count),
+    };
+};
+
 export const authService = {
     async register(userData) {
         try {
@@ -89,10 +111,9 @@ export const authService = {
 };
 
 export const userService = {
-    async list() {
+    async list(params = {}, cursor = null) {
         try {
-            const response = await api.get("/users/");
-            return { success: true, data: response.data };
+            return await fetchPage("/users/", params, cursor);
         } catch (error) {
             const errorResult = handleError(error);
             return errorResult;
@@ -141,10 +162,11 @@ export const userService = {
 };
 
 export const schoolService = {
-    async getAllSchools() {
+    // params: location, district, sector, search, student_population_min/_max,
+    // number_of_rooms_min/_max, since/until, ordering, fields, expand
+    async getAllSchools(params = {}, cursor = null) {
         try {
-            const response = await api.get("/schools/");
-            return { success: true, data: response.data };
+            return await fetchPage("/schools/", params, cursor);
         } catch (error) {
             return handleError(error);
         }
@@ -181,10 +203,11 @@ export const schoolService = {
 };
 
 export const predictionService = {
-    async getAllPredictions() {
+    // params: school, location, district, sector, needs_rooms, approved_by_district,
+    // approved_by_mineduc, rooms_to_build_min/_max, since/until, ordering, fields, expand
+    async getAllPredictions(params = {}, cursor = null) {
         try {
-            const response = await api.get("/predictions/");
-            return { success: true, data: response.data };
+            return await fetchPage("/predictions/", params, cursor);
         } catch (error) {
             return handleError(error);
         }
@@ -202,10 +225,9 @@ export const predictionService = {
 
 
 export const actionLogService = {
-    async getAllactionLogs() {
+    async getAllactionLogs(params = {}, cursor = null) {
         try {
-            const response = await api.get("/action-logs/");
-            return { success: true, data: response.data };
+            return await fetchPage("/action-logs/", params, cursor);
         } catch (error) {
             return handleError(error);
         }
@@ -215,18 +237,67 @@ export const actionLogService = {
 
 export const predictionReportService = {
 
+    // Uploads in checksummed chunks; a dropped chunk is retried from the
+    // offset the server last acknowledged instead of resending the file.
+    // created_by is taken from the authenticated user on the server.
     async create(location, pdfBlob, created_by) {
-        const formData = new FormData();
-        formData.append("location", location);
-        formData.append("document", pdfBlob, `School_Predictions_Report_${location}.pdf`);
-        formData.append("created_by", created_by);
-
-        const response = await api.post("/prediction-reports/upload/", formData, {
-            headers: { "Content-Type": "multipart/form-data" },
+        const { data: started } = await api.post("/prediction-reports/uploads/", {
+            location,
+            filename: `School_Predictions_Report_${location}.pdf`,
+            total_size: pdfBlob.size,
+            sha256: await sha256Hex(await pdfBlob.arrayBuffer()),
         });
+        const { id, chunk_size } = started.data;
+        const url = `/prediction-reports/uploads/${id}/`;
+
+        let offset = 0;
+        let failures = 0;
+        while (offset < pdfBlob.size) {
+            const chunk = await pdfBlob.slice(offset, offset + chunk_size).arrayBuffer();
+            try {
+                const response = await api.put(url, chunk, {
+                    headers: {
+                        "Content-Type": "application/octet-stream",
+                        "X-Upload-Offset": offset,
+                        "X-Chunk-SHA256": await sha256Hex(chunk),
+                    },
+                });
+                offset = response.data.data.received;
+                failures = 0;
+            } catch (error) {
+                if (++failures > UPLOAD_RETRIES || (error.response && error.response.status !== 409)) {
+                    throw error;
+                }
+                await new Promise((resolve) => setTimeout(resolve, 500 * 2 ** failures));
+                const { data } = await api.get(url);
+                offset = data.data.received;
+            }
+        }
+
+        const response = await api.post(`${url}complete/`);
         return response.data;
     },
 
+    // Queues a server-side export and polls the job until the generated
+    // report exists. filters: { district, location }.
+    async exportPredictions(format = "csv", filters = {}) {
+        try {
+            const { data } = await api.post("/prediction-reports/export/", { format, ...filters });
+            let job = data.data;
+            while (job.status === "queued" || job.status === "running") {
+                await new Promise((resolve) => setTimeout(resolve, 1000));
+                job = (await api.get(`/jobs/${job.id}/`)).data.data;
+            }
+            if (job.status !== "succeeded") {
+                return { success: false, message: "Export failed", details: job };
+            }
+            const report = await api.get(`/prediction-reports/${job.result.report_id}/`);
+            return { success: true, data: report.data.data };
+        } catch (error) {
+            return handleError(error);
+        }
+    },
+
     async sendToMineduc(reportId) {
         try {
             const response = await api.post(`/send-to-mineduc/${reportId}/`);
@@ -311,10 +382,9 @@ export const predictionReportService = {
 };
 
 export const projectService = {
-    async list() {
+    async list(params = {}, cursor = null) {
         try {
-            const response = await api.get("/projects/");
-            return { success: true, data: response.data };
+            return await fetchPage("/projects/", params, cursor);
         } catch (error) {
             return handleError(error);
         }
@@ -331,10 +401,9 @@ export const projectService = {
 };
 
 export const budgetService = {
-    async list() {
+    async list(params = {}, cursor = null) {
         try {
-            const response = await api.get("/budget-tracking/");
-            return { success: true, data: response.data };
+            return await fetchPage("/budget-tracking/", params, cursor);
         } catch (error) {
             return handleError(error);
         }
@@ -351,9 +420,42 @@ export const budgetService = {
 };
 
 export const notificationService = {
-    async getAllNotifications() {
-        const res = await api.get("/notifications/");
-        return { success: true, data: res.data };
+    async getAllNotifications(params = {}, cursor = null) {
+        try {
+            return await fetchPage("/notifications/", params, cursor);
+        } catch (error) {
+            return handleError(error);
+        }
+    },
+
+    // Live feed for the current user's role/sector; returns an unsubscribe function.
+    // EventSource reconnects on its own and resumes via Last-Event-ID. A server
+    // without ASGI answers 501, which closes the stream for good; the first page
+    // of notifications is polled instead.
+    subscribe(onNotification) {
+        const token = localStorage.getItem("access_token");
+        const source = new EventSource(
+            `${API_BASE_URL}/notifications/stream/?token=${encodeURIComponent(token || "")}`
+        );
+        let timer = null;
+        source.addEventListener("notification", (event) => onNotification(JSON.parse(event.data)));
+        source.onerror = () => {
+            if (source.readyState !== EventSource.CLOSED || timer) return;
+            const role = getCurrentUser()?.role?.toUpperCase();
+            timer = setInterval(async () => {
+                const result = await notificationService.getAllNotifications();
+                if (!result.success) return;
+                // Oldest first, so the newest ends up on top.
+                result.data
+                    .filter((notification) => notification.role?.toUpperCase() === role)
+                    .reverse()
+                    .forEach(onNotification);
+            }, NOTIFICATION_POLL_MS);
+        };
+        return () => {
+            source.close();
+            clearInterval(timer);
+        };
     },
 
     async sendNotification(data) {
@@ -368,9 +470,10 @@ export const notificationService = {
 };
 
 export const summaryService = {
-    async getDistrictSummary(umurengeId) {
+    // Server-side totals for dashboards. params: umurenge, district
+    async getDistrictSummary(params = {}) {
         try {
-            const response = await api.get(`/district-summary/?umurenge=${umurengeId}`);
+            const response = await api.get("/district-summary/", { params });
             return { success: true, data: response.data };
         } catch (error) {
             return handleError(error);
@@ -11,6 +11,7 @@ import {
     X
 } from "lucide-react";
 import { actionLogService } from '../../api';
+import LoadMoreButton from '../layout/LoadMoreButton';
 import { toast } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
 
@@ -22,8 +23,8 @@ export default function ActionLogs() {
     const [searchTerm, setSearchTerm] = useState('');
     const [actionFilter, setActionFilter] = useState('');
     const [showFilters, setShowFilters] = useState(false);
-    const [currentPage, setCurrentPage] = useState(1);
-    const [logsPerPage] = useState(10);
+    const [next, setNext] = useState(null);
+    const [total, setTotal] = useState(null);
 
     const ACTION_CHOICES = [
         { value: 'CREATE', label: 'Create', color: 'bg-green-100 text-green-800 border-green-200' },
@@ -36,16 +37,20 @@ export default function ActionLogs() {
         { value: 'OTHER', label: 'Other', color: 'bg-gray-100 text-gray-800 border-gray-200' },
     ];
 
+    // The action filter runs on the server; search narrows the loaded rows.
     useEffect(() => {
         fetchLogs();
-    }, []);
+    }, [actionFilter]);
 
-    const fetchLogs = async () => {
+    const fetchLogs = async (cursor = null) => {
         setIsLoading(true);
         try {
-            const result = await actionLogService.getAllactionLogs();
+            const params = { with_count: 1, ...(actionFilter && { action: actionFilter }) };
+            const result = await actionLogService.getAllactionLogs(params, cursor);
             if (result.success) {
-                setLogs(result.data);
+                setLogs((current) => (cursor ? current.concat(result.data) : result.data));
+                setNext(result.next);
+                setTotal(result.total);
             }
         } catch (error) {
             toast.error("Error fetching action logs");
@@ -95,96 +100,9 @@ export default function ActionLogs() {
             log.model_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
             log.action?.toLowerCase().includes(searchTerm.toLowerCase());
 
-        const matchesAction = !actionFilter || log.action === actionFilter;
-
-        return matchesSearch && matchesAction;
+        return matchesSearch;
     });
 
-    const indexOfLastLog = currentPage * logsPerPage;
-    const indexOfFirstLog = indexOfLastLog - logsPerPage;
-    const currentLogs = filteredLogs.slice(indexOfFirstLog, indexOfLastLog);
-    const totalPages = Math.ceil(filteredLogs.length / logsPerPage);
-
-    const paginate = (pageNumber) => setCurrentPage(pageNumber);
-
-    const Pagination = ({ totalPages, currentPage, paginate }) => {
-        const pageNumbers = [];
-        const maxVisiblePages = 5;
-
-        let startPage = Math.max(1, currentPage - Math.floor(maxVisiblePages / 2));
-        let endPage = Math.min(totalPages, startPage + maxVisiblePages - 1);
-
-        if (endPage - startPage + 1 < maxVisiblePages) {
-            startPage = Math.max(1, endPage - maxVisiblePages + 1);
-        }
-
-        for (let i = startPage; i <= endPage; i++) {
-            pageNumbers.push(i);
-        }
-
-        return (
-            <div className="flex justify-between items-center mt-4">
-                <p className="text-sm text-gray-600">
-                    Showing {indexOfFirstLog + 1} to {Math.min(indexOfLastLog, filteredLogs.length)} of {filteredLogs.length} logs
-                </p>
-                <div className="flex gap-1">
-                    <button
-                        className="px-3 py-1 rounded-lg border border-gray-300 hover:bg-gray-100 disabled:opacity-50 disabled:cursor-not-allowed"
-                        onClick={() => paginate(Math.max(currentPage - 1, 1))}
-                        disabled={currentPage === 1}
-                    >
-                        &lt;
-                    </button>
-
-                    {startPage > 1 && (
-                        <>
-                            <button
-                                onClick={() => paginate(1)}
-                                className="px-3 py-1 rounded-lg border border-gray-300 hover:bg-gray-100"
-                            >
-                                1
-                            </button>
-                            {startPage > 2 && <span className="px-2 py-1">...</span>}
-                        </>
-                    )}
-
-                    {pageNumbers.map((number) => (
-                        <button
-                            key={number}
-                            onClick={() => paginate(number)}
-                            className={`px-3 py-1 rounded-lg border ${currentPage === number
-                                ? 'bg-blue-600 text-white border-blue-600'
-                                : 'border-gray-300 hover:bg-gray-100'
-                                }`}
-                        >
-                            {number}
-                        </button>
-                    ))}
-
-                    {endPage < totalPages && (
-                        <>
-                            {endPage < totalPages - 1 && <span className="px-2 py-1">...</span>}
-                            <button
-                                onClick={() => paginate(totalPages)}
-                                className="px-3 py-1 rounded-lg border border-gray-300 hover:bg-gray-100"
-                            >
-                                {totalPages}
-                            </button>
-                        </>
-                    )}
-
-                    <button
-                        className="px-3 py-1 rounded-lg border border-gray-300 hover:bg-gray-100 disabled:opacity-50 disabled:cursor-not-allowed"
-                        onClick={() => paginate(Math.min(currentPage + 1, totalPages))}
-                        disabled={currentPage === totalPages}
-                    >
-                        &gt;
-                    </button>
-                </div>
-            </div>
-        );
-    };
-
     return (
         <div className="bg-gradient-to-br from-gray-50 to-gray-100 min-h-screen p-6">
             <div className="max-w-7xl mx-auto">
@@ -202,7 +120,7 @@ export default function ActionLogs() {
                         </div>
                         <div className="flex items-center gap-3">
                             <span className="bg-blue-100 text-blue-800 px-4 py-2 rounded-xl font-medium">
-                                Total: {filteredLogs.length} logs
+                                Total: {total ?? filteredLogs.length} logs
                             </span>
                         </div>
                     </div>
@@ -217,7 +135,7 @@ export default function ActionLogs() {
                                 type="text"
                                 placeholder="Search by user, model name, action..."
                                 value={searchTerm}
-                                onChange={(e) => { setSearchTerm(e.target.value); setCurrentPage(1); }}
+                                onChange={(e) => setSearchTerm(e.target.value)}
                                 className="w-full pl-12 pr-4 py-3 border border-gray-200 rounded-xl focus:ring-2 focus:ring-blue-500 focus:border-transparent outline-none transition-all"
                             />
                         </div>
@@ -244,7 +162,7 @@ export default function ActionLogs() {
                                 <span className="text-sm font-medium text-gray-700">Action Type:</span>
                                 <div className="flex flex-wrap gap-2">
                                     <button
-                                        onClick={() => { setActionFilter(''); setCurrentPage(1); }}
+                                        onClick={() => setActionFilter('')}
                                         className={`px-3 py-1.5 rounded-lg text-sm font-medium transition-colors ${!actionFilter
                                             ? 'bg-gray-900 text-white'
                                             : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
@@ -255,7 +173,7 @@ export default function ActionLogs() {
                                     {ACTION_CHOICES.map((action) => (
                                         <button
                                             key={action.value}
-                                            onClick={() => { setActionFilter(action.value); setCurrentPage(1); }}
+                                            onClick={() => setActionFilter(action.value)}
                                             className={`px-3 py-1.5 rounded-lg text-sm font-medium transition-colors ${actionFilter === action.value
                                                 ? 'bg-gray-900 text-white'
                                                 : `${action.color} hover:opacity-80`
@@ -267,7 +185,7 @@ export default function ActionLogs() {
                                 </div>
                                 {actionFilter && (
                                     <button
-                                        onClick={() => { setActionFilter(''); setCurrentPage(1); }}
+                                        onClick={() => setActionFilter('')}
                                         className="text-sm text-red-600 hover:text-red-800 flex items-center gap-1"
                                     >
                                         <X className="w-4 h-4" />
@@ -296,7 +214,7 @@ export default function ActionLogs() {
                             </thead>
 
                             <tbody className="divide-y divide-gray-100">
-                                {isLoading ? (
+                                {isLoading && logs.length === 0 ? (
                                     <tr>
                                         <td colSpan="7" className="px-6 py-16 text-center">
                                             <div className="flex flex-col items-center justify-center">
@@ -305,7 +223,7 @@ export default function ActionLogs() {
                                             </div>
                                         </td>
                                     </tr>
-                                ) : currentLogs.length === 0 ? (
+                                ) : filteredLogs.length === 0 ? (
                                     <tr>
                                         <td colSpan="7" className="px-6 py-16 text-center">
                                             <div className="flex flex-col items-center">
@@ -316,9 +234,9 @@ export default function ActionLogs() {
                                         </td>
                                     </tr>
                                 ) : (
-                                    currentLogs.map((log, index) => (
+                                    filteredLogs.map((log, index) => (
                                         <tr key={log.id} className="hover:bg-blue-50/50 transition-colors text-sm">
-                                            <td className="px-6 py-3 text-gray-500">{indexOfFirstLog + index + 1}</td>
+                                            <td className="px-6 py-3 text-gray-500">{index + 1}</td>
                                             <td className="px-6 py-3">
                                                 <div className="flex items-center gap-2">
                                                     <div className="w-8 h-8 bg-gray-200 rounded-full flex items-center justify-center">
@@ -372,9 +290,13 @@ export default function ActionLogs() {
                         </table>
                     </div>
                 </div>
-                {totalPages > 1 && (
-                    <Pagination totalPages={totalPages} currentPage={currentPage} paginate={paginate} />
-                )}
+                <LoadMoreButton
+                    next={next}
+                    isLoading={isLoading}
+                    onLoadMore={fetchLogs}
+                    loaded={logs.length}
+                    total={total}
+                />
             </div>
 
             {/* Detail Modal */}
@@ -4,11 +4,15 @@ import {
     PieChart, Pie, Cell, Line, ComposedChart
 } from 'recharts';
 import { Users, School, Wallet, Hammer } from 'lucide-react';
-import { schoolService, userService, predictionService } from '../../api';
+import { schoolService, userService, predictionService, summaryService } from '../../api';
+import { getRoles } from '../../constants/roles';
 
 const Dashboard = () => {
     const [schools, setSchools] = useState([]);
-    const [users, setUsers] = useState([]);
+    const [schoolCount, setSchoolCount] = useState(0);
+    const [userCount, setUserCount] = useState(0);
+    const [roleCounts, setRoleCounts] = useState({});
+    const [summary, setSummary] = useState(null);
     const [predictions, setPredictions] = useState([]);
     const [loading, setLoading] = useState(true);
 
@@ -16,14 +20,29 @@ const Dashboard = () => {
         const fetchData = async () => {
             try {
                 setLoading(true);
-                const schoolRes = await schoolService.getAllSchools();
-                if (schoolRes.success) setSchools(schoolRes.data);
-
-                const userRes = await userService.list();
-                setUsers(userRes.data || userRes);
-
-                const predRes = await predictionService.getAllPredictions();
-                setPredictions(predRes.data || predRes);
+                // Counts and totals are computed on the server; only the
+                // rows shown on screen are fetched.
+                const schoolRes = await schoolService.getAllSchools({ with_count: 1, page_size: 5 });
+                if (schoolRes.success) {
+                    setSchools(schoolRes.data);
+                    setSchoolCount(schoolRes.total);
+                }
+
+                const userRes = await userService.list({ with_count: 1, page_size: 1, fields: "id" });
+                if (userRes.success) setUserCount(userRes.total);
+
+                const counts = {};
+                for (const role of getRoles()) {
+                    const roleRes = await userService.list({ role, with_count: 1, page_size: 1, fields: "id" });
+                    if (roleRes.success && roleRes.total) counts[role] = roleRes.total;
+                }
+                setRoleCounts(counts);
+
+                const summaryRes = await summaryService.getDistrictSummary();
+                if (summaryRes.success) setSummary(summaryRes.data);
+
+                const predRes = await predictionService.getAllPredictions({ ordering: '-estimated_budget', page_size: 10 });
+                if (predRes.success) setPredictions(predRes.data);
 
             } catch (error) {
                 console.error('Error loading dashboard data:', error);
@@ -34,12 +53,10 @@ const Dashboard = () => {
         fetchData();
     }, []);
 
-    const totalBudget = predictions.reduce((sum, item) => sum + parseFloat(item.estimated_budget || 0), 0);
-    const totalRoomsToBuild = predictions.reduce((sum, item) => sum + (item.rooms_to_build || 0), 0);
+    const totalBudget = parseFloat(summary?.total_estimated_budget || 0);
+    const totalRoomsToBuild = summary?.total_rooms_to_build || 0;
 
     const constructionData = predictions
-        .sort((a, b) => parseFloat(b.estimated_budget) - parseFloat(a.estimated_budget))
-        .slice(0, 10)
         .map((p) => ({
             name: `School ${p.school}`,
             budget: parseFloat(p.estimated_budget),
@@ -47,12 +64,6 @@ const Dashboard = () => {
             required: p.required_rooms
         }));
 
-    const roleCounts = users.reduce((acc, user) => {
-        const role = user.role || 'Unknown';
-        acc[role] = (acc[role] || 0) + 1;
-        return acc;
-    }, {});
-
     const userRoleData = Object.keys(roleCounts).map(role => ({
         name: role,
         value: roleCounts[role]
@@ -77,7 +88,7 @@ const Dashboard = () => {
                     </div>
                     <div>
                         <p className="text-gray-500 text-sm">Registered Schools</p>
-                        <h3 className="text-2xl font-bold">{schools.length}</h3>
+                        <h3 className="text-2xl font-bold">{schoolCount}</h3>
                     </div>
                 </div>
 
@@ -109,7 +120,7 @@ const Dashboard = () => {
                     </div>
                     <div>
                         <p className="text-gray-500 text-sm">System Users</p>
-                        <h3 className="text-2xl font-bold">{users.length}</h3>
+                        <h3 className="text-2xl font-bold">{userCount}</h3>
                     </div>
                 </div>
             </div>
@@ -176,7 +187,7 @@ const Dashboard = () => {
                             </tr>
                         </thead>
                         <tbody>
-                            {schools.slice(0, 5).map((school, idx) => (
+                            {schools.map((school, idx) => (
                                 <tr key={idx} className="border-b border-gray-50 hover:bg-gray-50">
                                     <td className="p-4 font-medium text-gray-900">{school.name}</td>
                                     <td className="p-4">{school.location}</td>
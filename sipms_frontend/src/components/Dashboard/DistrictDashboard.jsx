@@ -4,11 +4,12 @@ import {
     PieChart, Pie, Cell
 } from 'recharts';
 import { Bell, CheckCircle, AlertCircle, FileText, DollarSign } from 'lucide-react';
-import { predictionService, schoolService, notificationService } from '../../api';
+import { predictionService, notificationService, summaryService } from '../../api';
 
 const DistrictDashboard = () => {
+    const [summary, setSummary] = useState(null);
     const [predictions, setPredictions] = useState([]);
-    const [schools, setSchools] = useState([]);
+    const [pendingApprovals, setPendingApprovals] = useState([]);
     const [notifications, setNotifications] = useState([]);
     const [loading, setLoading] = useState(true);
 
@@ -17,14 +18,19 @@ const DistrictDashboard = () => {
             try {
                 setLoading(true);
 
-                const predRes = await predictionService.getAllPredictions();
-                setPredictions(predRes.data || predRes);
+                // Totals come from the server-side rollup; only the few
+                // rows on screen are fetched as list pages.
+                const summaryRes = await summaryService.getDistrictSummary();
+                if (summaryRes.success) setSummary(summaryRes.data);
 
-                const schoolRes = await schoolService.getAllSchools();
-                if (schoolRes.success) setSchools(schoolRes.data);
+                const predRes = await predictionService.getAllPredictions({ page_size: 7 });
+                if (predRes.success) setPredictions(predRes.data);
 
-                const notifRes = await notificationService.getAllNotifications();
-                setNotifications(notifRes.data || notifRes);
+                const pendingRes = await predictionService.getAllPredictions({ approved_by_district: false, page_size: 5 });
+                if (pendingRes.success) setPendingApprovals(pendingRes.data);
+
+                const notifRes = await notificationService.getAllNotifications({ page_size: 10 });
+                if (notifRes.success) setNotifications(notifRes.data);
 
             } catch (error) {
                 console.error('Error loading district data:', error);
@@ -36,16 +42,17 @@ const DistrictDashboard = () => {
         fetchData();
     }, []);
 
-    const pendingApprovals = predictions.filter(p => !p.approved_by_district);
-    const totalBudgetRequest = predictions.reduce((sum, p) => sum + parseFloat(p.estimated_budget || 0), 0);
+    const totalPredictions = summary?.national.total_predictions || 0;
+    const approvedCount = summary?.national.approvals.district_approved || 0;
+    const pendingCount = totalPredictions - approvedCount;
+    const totalBudgetRequest = parseFloat(summary?.total_estimated_budget || 0);
 
     const approvalStatusData = [
-        { name: 'Approved', value: predictions.filter(p => p.approved_by_district).length },
-        { name: 'Pending', value: pendingApprovals.length },
+        { name: 'Approved', value: approvedCount },
+        { name: 'Pending', value: pendingCount },
     ];
 
     const budgetBySchoolData = predictions
-        .slice(0, 7)
         .map(p => ({
             name: `School ${p.school}`,
             budget: parseFloat(p.estimated_budget)
@@ -79,7 +86,7 @@ const DistrictDashboard = () => {
                     </div>
                     <div>
                         <p className="text-gray-500 text-sm">Pending Approvals</p>
-                        <h3 className="text-2xl font-bold text-gray-800">{pendingApprovals.length}</h3>
+                        <h3 className="text-2xl font-bold text-gray-800">{pendingCount}</h3>
                     </div>
                 </div>
 
@@ -101,7 +108,7 @@ const DistrictDashboard = () => {
                     </div>
                     <div>
                         <p className="text-gray-500 text-sm">Total Applications</p>
-                        <h3 className="text-2xl font-bold text-gray-800">{predictions.length}</h3>
+                        <h3 className="text-2xl font-bold text-gray-800">{totalPredictions}</h3>
                     </div>
                 </div>
             </div>
@@ -147,7 +154,7 @@ const DistrictDashboard = () => {
                     </div>
                     <div className="text-center mt-2">
                         <p className="text-sm text-gray-500">
-                            <span className="font-bold text-gray-800">{Math.round((predictions.filter(p => p.approved_by_district).length / predictions.length) * 100) || 0}%</span> of requests approved
+                            <span className="font-bold text-gray-800">{Math.round((approvedCount / totalPredictions) * 100) || 0}%</span> of requests approved
                         </p>
                     </div>
                 </div>
@@ -170,7 +177,7 @@ const DistrictDashboard = () => {
                                 </tr>
                             </thead>
                             <tbody>
-                                {pendingApprovals.slice(0, 5).map((item, idx) => (
+                                {pendingApprovals.map((item, idx) => (
                                     <tr key={idx} className="border-b border-gray-50 hover:bg-gray-50">
                                         <td className="p-4 font-medium">{item.school?.name || "Unknown School"}</td>
                                         <td className="p-4">{item.rooms_to_build}</td>
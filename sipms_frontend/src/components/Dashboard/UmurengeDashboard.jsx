@@ -4,14 +4,19 @@ import {
     PieChart, Pie, Cell
 } from 'recharts';
 import { Users, Building, ClipboardCheck, MapPin } from 'lucide-react';
-import { schoolService, userService, predictionService, getCurrentUser } from '../../api';
+import { schoolService, userService, predictionService, summaryService, getCurrentUser } from '../../api';
 import { USER_ROLES } from '../../constants/roles';
+import LoadMoreButton from '../layout/LoadMoreButton';
 
 
 const UmurengeDashboard = () => {
-    const [schools, setSchools] = useState([]);
+    const [schoolCount, setSchoolCount] = useState(0);
     const [users, setUsers] = useState([]);
+    const [userCount, setUserCount] = useState(0);
+    const [usersNext, setUsersNext] = useState(null);
     const [predictions, setPredictions] = useState([]);
+    const [predictionCount, setPredictionCount] = useState(0);
+    const [sectorTotals, setSectorTotals] = useState(null);
     const [loading, setLoading] = useState(true);
 
     const loggedUser = getCurrentUser();
@@ -21,40 +26,24 @@ const UmurengeDashboard = () => {
             try {
                 setLoading(true);
 
-                const predRes = await predictionService.getAllPredictions();
-                let allPredictions = predRes.data || predRes;
+                // Filtering and counting happen on the server; only the
+                // first page of each list is fetched.
+                const sectorParams = loggedUser.sector ? { sector: loggedUser.sector } : {};
+                const predRes = await predictionService.getAllPredictions({ ...sectorParams, with_count: 1 });
+                if (predRes.success) {
+                    setPredictions(predRes.data);
+                    setPredictionCount(predRes.total);
+                }
 
-                const schoolRes = await schoolService.getAllSchools();
-                let allSchools = [];
-                if (schoolRes.success) {
-                    allSchools = schoolRes.data;
+                const schoolRes = await schoolService.getAllSchools({ ...sectorParams, with_count: 1, page_size: 1, fields: 'id' });
+                if (schoolRes.success) setSchoolCount(schoolRes.total);
 
-                    if (loggedUser.sector) {
-                        allSchools = allSchools.filter(s =>
-                            s.location && s.location.toLowerCase().includes(loggedUser.sector.toLowerCase())
-                        );
-                    }
-                    setSchools(allSchools);
+                if (loggedUser.sector) {
+                    const summaryRes = await summaryService.getDistrictSummary({ umurenge: loggedUser.sector });
+                    if (summaryRes.success) setSectorTotals(summaryRes.data.national);
                 }
 
-                const sectorSchoolIds = allSchools.map(s => s.id);
-                const sectorPredictions = allPredictions.filter(p => {
-                    const pSchoolId = typeof p.school === 'object' ? p.school.id : p.school;
-                    return sectorSchoolIds.includes(pSchoolId);
-                });
-                setPredictions(sectorPredictions);
-
-                const result = await userService.list();
-                if (result.success) {
-                    let filtered = result.data;
-
-                    if (loggedUser?.role === "UMURENGE") {
-                        filtered = filtered.filter(
-                            (u) => u.role === USER_ROLES.SCHOOL
-                        );
-                    }
-                    setUsers(filtered);
-                }
+                await fetchUsers();
 
             } catch (error) {
                 console.error('Error loading Umurenge data:', error);
@@ -66,14 +55,26 @@ const UmurengeDashboard = () => {
         fetchData();
     }, []);
 
+    const fetchUsers = async (cursor = null) => {
+        const params = { ...(loggedUser.sector && { sector: loggedUser.sector }), with_count: 1 };
+        if (loggedUser?.role === "UMURENGE") params.role = USER_ROLES.SCHOOL;
+        const result = await userService.list(params, cursor);
+        if (result.success) {
+            setUsers((current) => (cursor ? current.concat(result.data) : result.data));
+            setUsersNext(result.next);
+            setUserCount(result.total);
+        }
+    };
+
     const budgetData = predictions.map(p => ({
         name: p.school?.name || `School ${p.school}`,
         budget: parseFloat(p.estimated_budget)
     }));
 
+    const approvedCount = sectorTotals?.approvals.district_approved || 0;
     const statusData = [
-        { name: 'Pending Sector', value: predictions.filter(p => !p.approved_by_district).length },
-        { name: 'Approved', value: predictions.filter(p => p.approved_by_district).length },
+        { name: 'Pending Sector', value: (sectorTotals?.total_predictions || 0) - approvedCount },
+        { name: 'Approved', value: approvedCount },
     ];
 
     const COLORS = ['#FFBB28', '#00C49F'];
@@ -98,7 +99,7 @@ const UmurengeDashboard = () => {
                     </div>
                     <div>
                         <p className="text-gray-500 text-sm">Sector Schools</p>
-                        <h3 className="text-2xl font-bold">{schools.length}</h3>
+                        <h3 className="text-2xl font-bold">{schoolCount}</h3>
                     </div>
                 </div>
 
@@ -108,7 +109,7 @@ const UmurengeDashboard = () => {
                     </div>
                     <div>
                         <p className="text-gray-500 text-sm">Head Schools</p>
-                        <h3 className="text-2xl font-bold">{users.length}</h3>
+                        <h3 className="text-2xl font-bold">{userCount}</h3>
                     </div>
                 </div>
 
@@ -118,7 +119,7 @@ const UmurengeDashboard = () => {
                     </div>
                     <div>
                         <p className="text-gray-500 text-sm">Active Requests</p>
-                        <h3 className="text-2xl font-bold">{predictions.length}</h3>
+                        <h3 className="text-2xl font-bold">{predictionCount}</h3>
                     </div>
                 </div>
             </div>
@@ -204,6 +205,7 @@ const UmurengeDashboard = () => {
                         </tbody>
                     </table>
                 </div>
+                <LoadMoreButton next={usersNext} onLoadMore={fetchUsers} loaded={users.length} total={userCount} />
             </div>
         </div>
     );
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { Loader2, Eye, Bell, Shield, Calendar, MessageSquare, X } from "lucide-react";
 import { notificationService, getCurrentUser } from '../../api';
+import LoadMoreButton from '../layout/LoadMoreButton';
 import 'react-toastify/dist/ReactToastify.css';
 
 export default function NotificationList() {
@@ -8,16 +9,23 @@ export default function NotificationList() {
     const [isLoading, setIsLoading] = useState(false);
     const [showModal, setShowModal] = useState(false);
     const [selectedNotification, setSelectedNotification] = useState(null);
+    const [next, setNext] = useState(null);
 
 
     useEffect(() => {
         fetchNotifications();
+        return notificationService.subscribe((notification) => {
+            setNotifications((current) => [
+                notification,
+                ...current.filter((existing) => existing.id !== notification.id),
+            ]);
+        });
     }, []);
 
-    const fetchNotifications = async () => {
+    const fetchNotifications = async (cursor = null) => {
         setIsLoading(true);
         try {
-            const result = await notificationService.getAllNotifications();
+            const result = await notificationService.getAllNotifications({}, cursor);
 
             if (result.success) {
                 const user = getCurrentUser();
@@ -26,7 +34,8 @@ export default function NotificationList() {
                     (notification) => notification.role?.toUpperCase() === role || notification.sender?.toUpperCase() === role
                 );
 
-                setNotifications(filteredData);
+                setNotifications((current) => (cursor ? current.concat(filteredData) : filteredData));
+                setNext(result.next);
             }
         } catch (error) {
             console.error("Error fetching notifications:", error);
@@ -143,7 +152,7 @@ export default function NotificationList() {
                                 </tr>
                             </thead>
                             <tbody className="divide-y divide-gray-100">
-                                {isLoading ? (
+                                {isLoading && notifications.length === 0 ? (
                                     <tr>
                                         <td colSpan="5" className="px-6 py-16 text-center">
                                             <div className="flex flex-col items-center justify-center">
@@ -210,6 +219,7 @@ export default function NotificationList() {
                             </tbody>
                         </table>
                     </div>
+                    <LoadMoreButton next={next} isLoading={isLoading} onLoadMore={fetchNotifications} />
                 </div>
             </div>
 
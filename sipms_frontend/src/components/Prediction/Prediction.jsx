@@ -17,29 +17,37 @@ import {
     Phone,
 } from "lucide-react";
 import { schoolService, predictionService, getCurrentUser } from "../../api";
+import LoadMoreButton from "../layout/LoadMoreButton";
 
 export default function CreatePrediction() {
     const navigate = useNavigate();
     const [schools, setSchools] = useState([]);
+    const [nextSchools, setNextSchools] = useState(null);
+    const [isLoadingSchools, setIsLoadingSchools] = useState(false);
     const [selectedSchool, setSelectedSchool] = useState("");
     const [selectedSchoolDetails, setSelectedSchoolDetails] = useState(null);
     const [isLoading, setIsLoading] = useState(false);
     const [success, setSuccess] = useState(false);
 
     useEffect(() => {
-        const fetchData = async () => {
-            try {
-                const res = await schoolService.getAllSchools();
-                const allSchools = res.data || [];
-                setSchools(allSchools);
-            } catch (error) {
-                console.error("Error fetching data:", error);
-                toast.error("Failed to load schools.");
-            }
-        };
-        fetchData();
+        fetchSchools();
     }, []);
 
+    const fetchSchools = async (cursor = null) => {
+        setIsLoadingSchools(true);
+        try {
+            const res = await schoolService.getAllSchools({ fields: "id,name", ordering: "name" }, cursor);
+            const page = res.data || [];
+            setSchools((current) => (cursor ? current.concat(page) : page));
+            setNextSchools(res.next);
+        } catch (error) {
+            console.error("Error fetching data:", error);
+            toast.error("Failed to load schools.");
+        } finally {
+            setIsLoadingSchools(false);
+        }
+    };
+
     const fetchSchoolDetails = async (schoolId) => {
         try {
             const res = await schoolService.getById(schoolId);
@@ -134,6 +142,7 @@ export default function CreatePrediction() {
                                             </option>
                                         ))}
                                     </select>
+                                    <LoadMoreButton next={nextSchools} isLoading={isLoadingSchools} onLoadMore={fetchSchools} />
                                 </div>
                             </div>
 
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { Eye, Send, Plus, Search, Filter, TrendingUp, Building2, Users, DollarSign } from "lucide-react";
 import { predictionService, getCurrentUser, notificationService } from '../../api';
+import LoadMoreButton from '../layout/LoadMoreButton';
 import { toast } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
 
@@ -14,17 +15,17 @@ export default function PredictionManagement() {
     const [searchTerm, setSearchTerm] = useState('');
     const userdata = getCurrentUser();
 
-    const [currentPage, setCurrentPage] = useState(1);
-    const schoolsPerPage = 2;
+    const [next, setNext] = useState(null);
+    const [total, setTotal] = useState(null);
 
     useEffect(() => {
         fetchPredictions();
     }, []);
 
-    const fetchPredictions = async () => {
+    const fetchPredictions = async (cursor = null) => {
         setIsLoading(true);
         try {
-            const result = await predictionService.getAllPredictions();
+            const result = await predictionService.getAllPredictions({ with_count: 1 }, cursor);
             if (result.success) {
                 let data = result.data;
                 const user = getCurrentUser();
@@ -61,7 +62,9 @@ export default function PredictionManagement() {
                     return { ...pred, detail, remaining_students, status };
                 });
 
-                setPredictions(enhancedData);
+                setPredictions((current) => (cursor ? current.concat(enhancedData) : enhancedData));
+                setNext(result.next);
+                setTotal(result.total);
             }
         } catch (error) {
             console.error("Error fetching predictions:", error);
@@ -72,25 +75,19 @@ export default function PredictionManagement() {
 
     // Statistics calculations
     const stats = {
-        totalPredictions: predictions.length,
+        totalPredictions: total ?? predictions.length,
         totalRoomsNeeded: predictions.reduce((sum, p) => sum + (p.rooms_to_build || 0), 0),
         totalBudget: predictions.reduce((sum, p) => sum + (p.estimated_budget || 0), 0),
         totalStudents: predictions.reduce((sum, p) => sum + (p.school?.student_population || 0), 0),
     };
 
-    // Filter predictions by search
+    // Filter the loaded predictions by search
     const filteredPredictions = predictions.filter(pred =>
         pred.school?.name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
         pred.created_by?.role?.toLowerCase().includes(searchTerm.toLowerCase())
     );
 
 
-    const indexOfLastSchool = currentPage * schoolsPerPage;
-    const indexOfFirstSchool = indexOfLastSchool - schoolsPerPage;
-    const currentPredictions = filteredPredictions.slice(indexOfFirstSchool, indexOfLastSchool);
-    const totalPages = Math.ceil(filteredPredictions.length / schoolsPerPage);
-    const paginate = (pageNumber) => setCurrentPage(pageNumber);
-
     // ----- Detail Modal -----
     const handleOpenDetailModal = (prediction) => {
         setSelectedPrediction(prediction);
@@ -138,41 +135,6 @@ export default function PredictionManagement() {
     };
 
 
-    const Pagination = ({ totalPages, currentPage, paginate }) => {
-        const pageNumbers = [];
-        for (let i = 1; i <= totalPages; i++) {
-            pageNumbers.push(i);
-        }
-
-        return (
-            <div className="flex justify-end mt-4 gap-1">
-                <button
-                    className="px-3 py-1 rounded-lg border border-gray-300 mr-2 hover:bg-gray-100 disabled:opacity-50"
-                    onClick={() => paginate(Math.max(currentPage - 1, 1))}
-                    disabled={currentPage === 1}
-                >
-                    &lt;
-                </button>
-                {pageNumbers.map(number => (
-                    <button
-                        key={number}
-                        onClick={() => paginate(number)}
-                        className={`px-3 py-1 rounded-lg border ${currentPage === number ? 'bg-blue-600 text-white border-blue-600' : 'border-gray-300 hover:bg-gray-100'}`}
-                    >
-                        {number}
-                    </button>
-                ))}
-                <button
-                    className="px-3 py-1 rounded-lg border border-gray-300 ml-2 hover:bg-gray-100 disabled:opacity-50"
-                    onClick={() => paginate(Math.min(currentPage + 1, totalPages))}
-                    disabled={currentPage === totalPages}
-                >
-                    &gt;
-                </button>
-            </div>
-        );
-    };
-
     const getStatusColor = (status) => {
         switch (status) {
             case 'surplus': return 'bg-green-100 text-green-800 border-green-200';
@@ -321,7 +283,7 @@ export default function PredictionManagement() {
                                 </tr>
                             </thead>
                             <tbody className="divide-y divide-gray-100">
-                                {isLoading ? (
+                                {isLoading && predictions.length === 0 ? (
                                     <tr>
                                         <td colSpan="8" className="px-6 py-16 text-center">
                                             <div className="flex flex-col items-center justify-center">
@@ -330,7 +292,7 @@ export default function PredictionManagement() {
                                             </div>
                                         </td>
                                     </tr>
-                                ) : currentPredictions.length === 0 ? (
+                                ) : filteredPredictions.length === 0 ? (
                                     <tr>
                                         <td colSpan="8" className="px-6 py-16 text-center">
                                             <div className="flex flex-col items-center justify-center">
@@ -343,7 +305,7 @@ export default function PredictionManagement() {
                                         </td>
                                     </tr>
                                 ) : (
-                                    currentPredictions.map((prediction, index) => (
+                                    filteredPredictions.map((prediction, index) => (
                                         <tr key={prediction.id} className="hover:bg-blue-50/50 transition-colors">
                                             <td className="px-6 py-4 text-sm font-medium text-gray-900">{index + 1}</td>
                                             <td className="px-6 py-4">
@@ -386,9 +348,13 @@ export default function PredictionManagement() {
                         </table>
                     </div>
                 </div>
-                {totalPages > 1 && (
-                    <Pagination totalPages={totalPages} currentPage={currentPage} paginate={paginate} />
-                )}
+                <LoadMoreButton
+                    next={next}
+                    isLoading={isLoading}
+                    onLoadMore={fetchPredictions}
+                    loaded={predictions.length}
+                    total={total}
+                />
             </div>
 
             {showDetailModal && selectedPrediction && (
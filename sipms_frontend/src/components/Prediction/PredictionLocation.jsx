@@ -1,4 +1,4 @@
-import { useEffect, useState } from "react";
+import { useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { toast } from "react-toastify";
 import {
@@ -14,44 +14,40 @@ import {
 } from "lucide-react";
 import { schoolService, predictionService, predictionReportService, getCurrentUser } from "../../api";
 import html2pdf from "html2pdf.js";
+import { getDistricts, getSectorsByDistrict, formatLocation } from "../../constants/locations";
+import LoadMoreButton from "../layout/LoadMoreButton";
 
 export default function CreatePredictionByLocation() {
     const navigate = useNavigate();
-    const [locations, setLocations] = useState([]);
     const [selectedLocation, setSelectedLocation] = useState("");
     const [schoolsInLocation, setSchoolsInLocation] = useState([]);
+    const [nextSchools, setNextSchools] = useState(null);
     const [isLoading, setIsLoading] = useState(false);
     const [success, setSuccess] = useState(false);
 
-    useEffect(() => {
-        const fetchLocations = async () => {
-            try {
-                const res = await schoolService.getAllSchools();
-                const allSchools = res.data || [];
-                const uniqueLocations = [...new Set(allSchools.map((s) => s.location))];
-                setLocations(uniqueLocations);
-            } catch (error) {
-                console.error("Error fetching locations:", error);
-                toast.error("Failed to load locations.");
-            }
-        };
-        fetchLocations();
-    }, []);
+    const locations = getDistricts().flatMap((district) =>
+        getSectorsByDistrict(district).map((sector) => formatLocation(district, sector))
+    );
 
-    const handleLocationChange = async (e) => {
-        const location = e.target.value;
-        setSelectedLocation(location);
-        if (!location) return setSchoolsInLocation([]);
+    const fetchSchoolsInLocation = async (location, cursor = null) => {
         try {
-            const res = await schoolService.getAllSchools();
-            const filtered = res.data.filter((s) => s.location === location);
-            setSchoolsInLocation(filtered);
+            const res = await schoolService.getAllSchools({ location, ordering: "name" }, cursor);
+            setSchoolsInLocation((current) => (cursor ? current.concat(res.data) : res.data));
+            setNextSchools(res.next);
         } catch (error) {
             console.error("Error fetching schools by location:", error);
             toast.error("Failed to filter schools.");
         }
     };
 
+    const handleLocationChange = async (e) => {
+        const location = e.target.value;
+        setSelectedLocation(location);
+        setNextSchools(null);
+        if (!location) return setSchoolsInLocation([]);
+        await fetchSchoolsInLocation(location);
+    };
+
     const generateReportHTML = (predictions) => {
 
         // Convert any value to a clean number
@@ -324,20 +320,16 @@ export default function CreatePredictionByLocation() {
         setIsLoading(true);
         setSuccess(false);
         try {
+            // The report is built from the created predictions, so no list is re-read.
+            const createdPredictions = [];
             for (const school of schoolsInLocation) {
-                await predictionService.create({
+                const result = await predictionService.create({
                     school_id: school.id,
                     created_by: userdata.id,
                 });
+                if (result.success) createdPredictions.push(result.data);
             }
-            const predictionsResult = await predictionService.getAllPredictions();
-            if (predictionsResult.success) {
-                const schoolIds = schoolsInLocation.map((s) => s.id);
-                const relevantPredictions = predictionsResult.data.filter((pred) =>
-                    schoolIds.includes(pred.school?.id)
-                );
-                await generateAndSavePDF(relevantPredictions);
-            }
+            await generateAndSavePDF(createdPredictions);
         } catch (error) {
             console.error("Error creating predictions:", error);
             toast.error("Failed to create predictions.");
@@ -457,6 +449,10 @@ export default function CreatePredictionByLocation() {
                                                 </div>
                                             ))}
                                         </div>
+                                        <LoadMoreButton
+                                            next={nextSchools}
+                                            onLoadMore={(cursor) => fetchSchoolsInLocation(selectedLocation, cursor)}
+                                        />
                                     </div>
                                 </div>
                             </div>
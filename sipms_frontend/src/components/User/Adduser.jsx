@@ -5,6 +5,7 @@ import 'react-toastify/dist/ReactToastify.css';
 import { USER_ROLES, getRoles, getRoleLabel } from '../../constants/roles';
 import { getDistricts, getSectorsByDistrict, formatLocation } from '../../constants/locations';
 import { userService, schoolService, getCurrentUser } from '../../api';
+import LoadMoreButton from '../layout/LoadMoreButton';
 import { ArrowLeft, Save, X, User, Mail, Shield, MapPin, Building2, AlertCircle, Check } from 'lucide-react';
 
 export default function AddUserPage() {
@@ -14,6 +15,8 @@ export default function AddUserPage() {
     const [districts, setDistricts] = useState([]);
     const [sectors, setSectors] = useState([]);
     const [schools, setSchools] = useState([]);
+    const [nextSchools, setNextSchools] = useState(null);
+    const [isLoadingSchools, setIsLoadingSchools] = useState(false);
     const [formData, setFormData] = useState({
         username: '',
         email: '',
@@ -30,12 +33,18 @@ export default function AddUserPage() {
         fetchSchools();
     }, []);
 
-    const fetchSchools = async () => {
+    const fetchSchools = async (cursor = null) => {
+        setIsLoadingSchools(true);
         try {
-            const result = await schoolService.getAllSchools();
-            if (result.success) setSchools(result.data);
+            const result = await schoolService.getAllSchools({ fields: 'id,name,location', ordering: 'name' }, cursor);
+            if (result.success) {
+                setSchools((current) => (cursor ? current.concat(result.data) : result.data));
+                setNextSchools(result.next);
+            }
         } catch (error) {
             console.error('Error fetching schools:', error);
+        } finally {
+            setIsLoadingSchools(false);
         }
     };
 
@@ -341,6 +350,7 @@ export default function AddUserPage() {
                                                 </option>
                                             ))}
                                         </select>
+                                        <LoadMoreButton next={nextSchools} isLoading={isLoadingSchools} onLoadMore={fetchSchools} />
                                     </div>
                                 )}
 
@@ -5,6 +5,7 @@ import 'react-toastify/dist/ReactToastify.css';
 import { USER_ROLES, getRoles, getRoleLabel } from '../../constants/roles';
 import { getDistricts, getSectorsByDistrict, formatLocation, parseLocation } from '../../constants/locations';
 import { userService, schoolService } from '../../api';
+import LoadMoreButton from '../layout/LoadMoreButton';
 import { ArrowLeft, Save, X, User, Mail, Shield, MapPin, Building2, AlertCircle, Edit3, Loader } from 'lucide-react';
 
 export default function EditUserPage() {
@@ -15,6 +16,9 @@ export default function EditUserPage() {
     const [districts, setDistricts] = useState([]);
     const [sectors, setSectors] = useState([]);
     const [schools, setSchools] = useState([]);
+    const [nextSchools, setNextSchools] = useState(null);
+    const [assignedSchool, setAssignedSchool] = useState(null);
+    const [isLoadingSchools, setIsLoadingSchools] = useState(false);
     const [formData, setFormData] = useState({
         username: '',
         email: '',
@@ -32,14 +36,18 @@ export default function EditUserPage() {
         fetchUser();
     }, [id]);
 
-    const fetchSchools = async () => {
+    const fetchSchools = async (cursor = null) => {
+        setIsLoadingSchools(true);
         try {
-            const result = await schoolService.getAllSchools();
+            const result = await schoolService.getAllSchools({ fields: 'id,name,location', ordering: 'name' }, cursor);
             if (result.success) {
-                setSchools(result.data);
+                setSchools((current) => (cursor ? current.concat(result.data) : result.data));
+                setNextSchools(result.next);
             }
         } catch (error) {
             console.error('Error fetching schools:', error);
+        } finally {
+            setIsLoadingSchools(false);
         }
     };
 
@@ -50,6 +58,7 @@ export default function EditUserPage() {
             if (result.success) {
                 const user = result.data;
                 const location = user.sector ? parseLocation(user.sector) : { district: '', sector: '' };
+                setAssignedSchool(user.school || null);
                 setFormData({
                     username: user.username,
                     email: user.email,
@@ -365,12 +374,18 @@ export default function EditUserPage() {
                                             className="w-full px-4 py-3 border-2 border-gray-200 rounded-xl focus:ring-2 focus:ring-blue-500 focus:border-blue-500 outline-none transition-all disabled:bg-gray-50 disabled:cursor-not-allowed bg-white"
                                         >
                                             <option value="">Select School</option>
+                                            {assignedSchool && !schools.some((school) => school.id === assignedSchool.id) && (
+                                                <option value={assignedSchool.id}>
+                                                    {assignedSchool.name} - {assignedSchool.location}
+                                                </option>
+                                            )}
                                             {schools.map((school) => (
                                                 <option key={school.id} value={school.id}>
                                                     {school.name} - {school.location}
                                                 </option>
                                             ))}
                                         </select>
+                                        <LoadMoreButton next={nextSchools} isLoading={isLoadingSchools} onLoadMore={fetchSchools} />
                                     </div>
                                 )}
                             </div>
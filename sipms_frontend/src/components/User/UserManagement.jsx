@@ -4,6 +4,7 @@ import { userService, getCurrentUser } from '../../api';
 import { toast } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
 import { USER_ROLES, getRoleLabel } from '../../constants/roles';
+import LoadMoreButton from '../layout/LoadMoreButton';
 
 export default function UserManagement() {
     const [users, setUsers] = useState([]);
@@ -12,14 +13,13 @@ export default function UserManagement() {
     const [selectedUser, setSelectedUser] = useState(null);
     const [searchTerm, setSearchTerm] = useState('');
     const [openDropdownId, setOpenDropdownId] = useState(null);
-    const [currentPage, setCurrentPage] = useState(1);
-    const [usersPerPage] = useState(5);
+    const [next, setNext] = useState(null);
+    const [total, setTotal] = useState(null);
     const dropdownRef = useRef(null);
 
     const loggedUser = getCurrentUser();
 
     useEffect(() => {
-
         fetchUsers();
     }, []);
 
@@ -33,22 +33,18 @@ export default function UserManagement() {
         return () => document.removeEventListener('mousedown', handleClickOutside);
     }, []);
 
-    const fetchUsers = async () => {
+    const fetchUsers = async (cursor = null) => {
         setIsLoading(true);
         try {
-            const result = await userService.list();
+            const params = { with_count: 1 };
+            if (loggedUser?.role === USER_ROLES.UMURENGE) {
+                params.role = USER_ROLES.SCHOOL;
+            }
+            const result = await userService.list(params, cursor);
             if (result.success) {
-                let filtered = result.data;
-
-                if (loggedUser?.role === USER_ROLES.UMURENGE) {
-                    filtered = filtered.filter(
-                        (u) =>
-                            u.role === USER_ROLES.SCHOOL
-                        // u.sector?.toLowerCase() === loggedUser.sector?.toLowerCase()
-                    );
-                }
-
-                setUsers(filtered);
+                setUsers((current) => (cursor ? current.concat(result.data) : result.data));
+                setNext(result.next);
+                setTotal(result.total);
             }
         } catch (error) {
             toast.error("Error fetching users")
@@ -89,13 +85,6 @@ export default function UserManagement() {
         getRoleLabel(user.role)?.toLowerCase().includes(searchTerm.toLowerCase())
     );
 
-    const indexOfLastUser = currentPage * usersPerPage;
-    const indexOfFirstUser = indexOfLastUser - usersPerPage;
-    const currentUsers = filteredUsers.slice(indexOfFirstUser, indexOfLastUser);
-    const totalPages = Math.ceil(filteredUsers.length / usersPerPage);
-
-    const paginate = (pageNumber) => setCurrentPage(pageNumber);
-
     const getRoleBadgeColor = (role) => {
         switch (role) {
             case USER_ROLES.ADMIN: return 'bg-purple-100 text-purple-800 border-purple-200';
@@ -106,41 +95,6 @@ export default function UserManagement() {
         }
     };
 
-    const Pagination = ({ totalPages, currentPage, paginate }) => {
-        const pageNumbers = [];
-        for (let i = 1; i <= totalPages; i++) pageNumbers.push(i);
-
-        return (
-            <div className="flex justify-end mt-4 gap-1">
-                <button
-                    className="px-3 py-1 rounded-lg border border-gray-300 hover:bg-gray-100 mr-3"
-                    onClick={() => paginate(Math.max(currentPage - 1, 1))}
-                    disabled={currentPage === 1}
-                >
-                    &lt;
-                </button>
-
-                {pageNumbers.map((number) => (
-                    <button
-                        key={number}
-                        onClick={() => paginate(number)}
-                        className={`px-3 py-1 rounded-lg border ${currentPage === number ? 'bg-blue-600 text-white border-blue-600' : 'border-gray-300 hover:bg-gray-100'}`}
-                    >
-                        {number}
-                    </button>
-                ))}
-
-                <button
-                    className="px-3 py-1 rounded-lg border border-gray-300 ml-3 hover:bg-gray-100"
-                    onClick={() => paginate(Math.min(currentPage + 1, totalPages))}
-                    disabled={currentPage === totalPages}
-                >
-                    &gt;
-                </button>
-            </div>
-        );
-    };
-
     return (
         <div className="bg-gradient-to-br from-gray-50 to-gray-100 p-6">
             <div className="max-w-7xl mx-auto">
@@ -178,7 +132,7 @@ export default function UserManagement() {
                                 type="text"
                                 placeholder="Search by name, email, username..."
                                 value={searchTerm}
-                                onChange={(e) => { setSearchTerm(e.target.value); setCurrentPage(1); }}
+                                onChange={(e) => setSearchTerm(e.target.value)}
                                 className="w-full pl-12 pr-4 py-3 border border-gray-200 rounded-xl focus:ring-2 focus:ring-blue-500 focus:border-transparent outline-none transition-all"
                             />
                         </div>
@@ -205,7 +159,7 @@ export default function UserManagement() {
                             </thead>
 
                             <tbody className="divide-y divide-gray-100">
-                                {isLoading ? (
+                                {isLoading && users.length === 0 ? (
                                     <tr>
                                         <td colSpan="7" className="px-6 py-16 text-center">
                                             <div className="flex flex-col items-center justify-center">
@@ -214,17 +168,17 @@ export default function UserManagement() {
                                             </div>
                                         </td>
                                     </tr>
-                                ) : currentUsers.length === 0 ? (
+                                ) : filteredUsers.length === 0 ? (
                                     <tr>
                                         <td colSpan="7" className="px-6 py-16 text-center">
                                             <p className="text-gray-600 font-medium text-lg">No users found</p>
                                         </td>
                                     </tr>
                                 ) : (
-                                    currentUsers.map((user, index) => (
+                                    filteredUsers.map((user, index) => (
                                         <tr key={user.id} className="hover:bg-blue-50/50 transition-colors text-sm">
 
-                                            <td className="px-6 py-2">{indexOfFirstUser + index + 1}.</td>
+                                            <td className="px-6 py-2">{index + 1}.</td>
                                             <td className="px-6 py-2">
 
                                                 <p className="">
@@ -302,9 +256,13 @@ export default function UserManagement() {
                     </div>
                 </div>
 
-                {totalPages > 1 && (
-                    <Pagination totalPages={totalPages} currentPage={currentPage} paginate={paginate} />
-                )}
+                <LoadMoreButton
+                    next={next}
+                    isLoading={isLoading}
+                    onLoadMore={fetchUsers}
+                    loaded={users.length}
+                    total={total}
+                />
             </div>
 
             {showDetailModal && selectedUser && (
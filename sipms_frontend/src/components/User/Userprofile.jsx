@@ -4,7 +4,7 @@ import { toast } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
 import { USER_ROLES, getRoleLabel } from '../../constants/roles';
 import { parseLocation } from '../../constants/locations';
-import { userService, schoolService, getCurrentUser } from '../../api';
+import { userService, getCurrentUser } from '../../api';
 import { ArrowLeft, Save, X, User, Mail, Shield, MapPin, Building2, AlertCircle, Edit3, Loader, Lock, Eye, EyeOff, Check } from 'lucide-react';
 
 export default function EditUserPage() {
@@ -12,7 +12,8 @@ export default function EditUserPage() {
     const [isLoading, setIsLoading] = useState(false);
     const [isFetching, setIsFetching] = useState(true);
 
-    const [schools, setSchools] = useState([]);
+    // The user detail response nests the assigned school.
+    const [school, setSchool] = useState(null);
     const [isMyProfile, setIsMyProfile] = useState(false);
     const [showPassword, setShowPassword] = useState(false);
     const [showConfirmPassword, setShowConfirmPassword] = useState(false);
@@ -80,7 +81,6 @@ export default function EditUserPage() {
             setIsMyProfile(true);
         }
 
-        fetchSchools();
         fetchUser();
     }, [id]);
 
@@ -92,17 +92,6 @@ export default function EditUserPage() {
         }
     }, [formData.password]);
 
-    const fetchSchools = async () => {
-        try {
-            const result = await schoolService.getAllSchools();
-            if (result.success) {
-                setSchools(result.data);
-            }
-        } catch (error) {
-            console.error('Error fetching schools:', error);
-        }
-    };
-
     const fetchUser = async () => {
         setIsFetching(true);
         try {
@@ -111,6 +100,7 @@ export default function EditUserPage() {
                 const user = result.data;
                 console.log("user data :", result.data)
                 const location = user.sector ? parseLocation(user.sector) : { district: '', sector: '' };
+                setSchool(user.school || null);
                 setFormData({
                     username: user.username,
                     email: user.email,
@@ -512,9 +502,8 @@ export default function EditUserPage() {
                                             School Assignment
                                         </label>
                                         <div className="w-full px-4 py-3 border-2 border-gray-200 rounded-xl bg-gray-50 text-gray-700">
-                                            {schools.find(s => s.id === formData.school)?.name || 'Not assigned'}
-                                            {schools.find(s => s.id === formData.school)?.location &&
-                                                ` - ${schools.find(s => s.id === formData.school)?.location}`}
+                                            {school?.name || 'Not assigned'}
+                                            {school?.location && ` - ${school.location}`}
                                         </div>
                                     </div>
                                 )}
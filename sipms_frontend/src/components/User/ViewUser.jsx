@@ -3,12 +3,13 @@ import { toast } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
 import { USER_ROLES, getRoleLabel } from '../../constants/roles';
 import { parseLocation } from '../../constants/locations';
-import { userService, schoolService, getCurrentUser } from '../../api';
+import { userService, getCurrentUser } from '../../api';
 import { ArrowLeft, User, Mail, Shield, MapPin, Building2, Eye, Loader, Tag, Home, Edit3, KeyRound } from 'lucide-react';
 
 export default function ViewUserPage() {
     const [isFetching, setIsFetching] = useState(true);
-    const [schools, setSchools] = useState([]);
+    // The user detail response nests the assigned school.
+    const [school, setSchool] = useState(null);
     const storedUserData = getCurrentUser();
     const id = storedUserData.id;
 
@@ -24,22 +25,9 @@ export default function ViewUserPage() {
     });
 
     useEffect(() => {
-
-        fetchSchools();
         fetchUser();
     }, [id]);
 
-    const fetchSchools = async () => {
-        try {
-            const result = await schoolService.getAllSchools();
-            if (result.success) {
-                setSchools(result.data);
-            }
-        } catch (error) {
-            console.error('Error fetching schools:', error);
-        }
-    };
-
     const fetchUser = async () => {
         setIsFetching(true);
         try {
@@ -47,6 +35,7 @@ export default function ViewUserPage() {
             if (result.success) {
                 const user = result.data;
                 const location = user.sector ? parseLocation(user.sector) : { district: '', sector: '' };
+                setSchool(user.school || null);
                 setUserData({
                     username: user.username,
                     email: user.email,
@@ -67,13 +56,11 @@ export default function ViewUserPage() {
     };
 
     const getSchoolName = (schoolId) => {
-        const school = schools.find(s => s.id === schoolId);
-        return school ? school.name : 'Not assigned';
+        return school && school.id === schoolId ? school.name : 'Not assigned';
     };
 
     const getSchoolLocation = (schoolId) => {
-        const school = schools.find(s => s.id === schoolId);
-        return school ? school.location : null;
+        return school && school.id === schoolId ? school.location : null;
     }
 
     if (isFetching) {
@@ -0,0 +1,23 @@
+import { Loader } from "lucide-react";
+
+// Fetches the next page of a cursor-paginated list; hidden once `next` runs out.
+export default function LoadMoreButton({ next, isLoading, onLoadMore, loaded, total }) {
+    if (!next) return null;
+
+    return (
+        <div className="flex flex-col items-center gap-1 py-4">
+            <button
+                type="button"
+                onClick={() => onLoadMore(next)}
+                disabled={isLoading}
+                className="flex items-center gap-2 px-4 py-2 rounded-lg border border-gray-300 text-sm font-medium text-gray-700 hover:bg-gray-100 disabled:opacity-50"
+            >
+                {isLoading && <Loader className="w-4 h-4 animate-spin" />}
+                Load more
+            </button>
+            {total != null && (
+                <span className="text-xs text-gray-500">Showing {loaded} of {total}</span>
+            )}
+        </div>
+    );
+}
@@ -2,6 +2,7 @@ import { useState, useEffect, useRef } from 'react';
 import { Eye, Plus, Search, Filter, Building2, Users, Calendar, MapPin, Loader, X, Check, MoreVertical, Pen, AlertCircle } from "lucide-react";
 import { getDistricts, getSectorsByDistrict, formatLocation, parseLocation } from '../../constants/locations';
 import { schoolService } from '../../api';
+import LoadMoreButton from '../layout/LoadMoreButton';
 import { toast } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
 
@@ -20,12 +21,14 @@ export default function SchoolManagement() {
     const [openDropdownId, setOpenDropdownId] = useState(null);
     const dropdownRef = useRef(null);
 
-    const [currentPage, setCurrentPage] = useState(1);
-    const schoolsPerPage = 2;
+    const [next, setNext] = useState(null);
+    const [total, setTotal] = useState(null);
 
+    // Search runs on the server, so it covers schools not loaded yet.
     useEffect(() => {
-        fetchSchools();
-    }, []);
+        const timer = setTimeout(() => fetchSchools(), 300);
+        return () => clearTimeout(timer);
+    }, [searchTerm]);
 
     useEffect(() => {
         const handleClickOutside = (event) => {
@@ -38,12 +41,15 @@ export default function SchoolManagement() {
         return () => document.removeEventListener('mousedown', handleClickOutside);
     }, []);
 
-    const fetchSchools = async () => {
+    const fetchSchools = async (cursor = null) => {
         setIsLoading(true);
         try {
-            const result = await schoolService.getAllSchools();
+            const params = { with_count: 1, ...(searchTerm && { search: searchTerm }) };
+            const result = await schoolService.getAllSchools(params, cursor);
             if (result.success) {
-                setSchools(result.data);
+                setSchools((current) => (cursor ? current.concat(result.data) : result.data));
+                setNext(result.next);
+                setTotal(result.total);
             }
         } catch (error) {
             console.error('Error fetching schools:', error);
@@ -54,41 +60,6 @@ export default function SchoolManagement() {
     };
 
 
-    const Pagination = ({ totalPages, currentPage, paginate }) => {
-        const pageNumbers = [];
-        for (let i = 1; i <= totalPages; i++) {
-            pageNumbers.push(i);
-        }
-
-        return (
-            <div className="flex justify-end mt-4 gap-1">
-                <button
-                    className="px-3 py-1 rounded-lg border border-gray-300 mr-2 hover:bg-gray-100 disabled:opacity-50"
-                    onClick={() => paginate(Math.max(currentPage - 1, 1))}
-                    disabled={currentPage === 1}
-                >
-                    &lt;
-                </button>
-                {pageNumbers.map(number => (
-                    <button
-                        key={number}
-                        onClick={() => paginate(number)}
-                        className={`px-3 py-1 rounded-lg border ${currentPage === number ? 'bg-blue-600 text-white border-blue-600' : 'border-gray-300 hover:bg-gray-100'}`}
-                    >
-                        {number}
-                    </button>
-                ))}
-                <button
-                    className="px-3 py-1 rounded-lg border border-gray-300 ml-2 hover:bg-gray-100 disabled:opacity-50"
-                    onClick={() => paginate(Math.min(currentPage + 1, totalPages))}
-                    disabled={currentPage === totalPages}
-                >
-                    &gt;
-                </button>
-            </div>
-        );
-    };
-
     const handleOpenModal = (school = null) => {
         if (school) {
             setIsEditing(true);
@@ -172,20 +143,8 @@ export default function SchoolManagement() {
         }
     };
 
-    const filteredSchools = schools.filter(school =>
-        school.name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        school.location?.toLowerCase().includes(searchTerm.toLowerCase())
-    );
-
-    // Pagination logic
-    const indexOfLastSchool = currentPage * schoolsPerPage;
-    const indexOfFirstSchool = indexOfLastSchool - schoolsPerPage;
-    const currentSchools = filteredSchools.slice(indexOfFirstSchool, indexOfLastSchool);
-    const totalPages = Math.ceil(filteredSchools.length / schoolsPerPage);
-    const paginate = (pageNumber) => setCurrentPage(pageNumber);
-
     const stats = {
-        totalSchools: schools.length,
+        totalSchools: total ?? schools.length,
         totalStudents: schools.reduce((sum, s) => sum + (s.student_population || 0), 0),
         totalRooms: schools.reduce((sum, s) => sum + (s.number_of_rooms || 0), 0),
         averageStudents: schools.length > 0
@@ -276,7 +235,7 @@ export default function SchoolManagement() {
                             <Search className="absolute left-4 top-1/2 transform -translate-y-1/2 text-gray-400 w-5 h-5" />
                             <input
                                 type="text"
-                                placeholder="Search by school name or location..."
+                                placeholder="Search by school name..."
                                 value={searchTerm}
                                 onChange={(e) => setSearchTerm(e.target.value)}
                                 className="w-full pl-12 pr-4 py-3 border border-gray-200 rounded-xl focus:ring-2 focus:ring-blue-500 focus:border-transparent outline-none transition-all"
@@ -306,7 +265,7 @@ export default function SchoolManagement() {
                                 </tr>
                             </thead>
                             <tbody className="divide-y divide-gray-100">
-                                {isLoading ? (
+                                {isLoading && schools.length === 0 ? (
                                     <tr>
                                         <td colSpan="8" className="px-6 py-16 text-center">
                                             <div className="flex flex-col items-center justify-center">
@@ -315,7 +274,7 @@ export default function SchoolManagement() {
                                             </div>
                                         </td>
                                     </tr>
-                                ) : currentSchools.length === 0 ? (
+                                ) : schools.length === 0 ? (
                                     <tr>
                                         <td colSpan="8" className="px-6 py-16 text-center">
                                             <div className="flex flex-col items-center justify-center">
@@ -330,7 +289,7 @@ export default function SchoolManagement() {
                                         </td>
                                     </tr>
                                 ) : (
-                                    currentSchools.map((school, index) => (
+                                    schools.map((school, index) => (
                                         <tr key={school.id} className="hover:bg-blue-50/50 transition-colors">
                                             <td className="px-6 py-4 text-sm font-medium text-gray-900">{index + 1}</td>
                                             <td className="px-6 py-4">
@@ -402,9 +361,13 @@ export default function SchoolManagement() {
                         </table>
                     </div>
                 </div>
-                {totalPages > 1 && (
-                    <Pagination totalPages={totalPages} currentPage={currentPage} paginate={paginate} />
-                )}
+                <LoadMoreButton
+                    next={next}
+                    isLoading={isLoading}
+                    onLoadMore={fetchSchools}
+                    loaded={schools.length}
+                    total={total}
+                />
             </div>
 
             {/* Detail Modal */}
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { Eye, TrendingUp, Building2, Users, Home, DollarSign, Calendar, AlertCircle } from "lucide-react";
 import { predictionService, getCurrentUser } from '../../api';
+import LoadMoreButton from '../layout/LoadMoreButton';
 import { toast } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
 
@@ -10,6 +11,8 @@ export default function SchoolPredictions() {
     const [showDetailModal, setShowDetailModal] = useState(false);
     const [selectedPrediction, setSelectedPrediction] = useState(null);
     const [schoolData, setSchoolData] = useState(null);
+    const [next, setNext] = useState(null);
+    const [total, setTotal] = useState(null);
 
     useEffect(() => {
         const userData = getCurrentUser();
@@ -17,19 +20,15 @@ export default function SchoolPredictions() {
         fetchPredictions();
     }, []);
 
-    const fetchPredictions = async () => {
+    const fetchPredictions = async (cursor = null) => {
         setIsLoading(true);
         try {
             const userData = getCurrentUser();
             const schoolId = userData.school.id;
 
-            const result = await predictionService.getAllPredictions();
+            const result = await predictionService.getAllPredictions({ school: schoolId, with_count: 1 }, cursor);
             if (result.success) {
-                const filteredPredictions = result.data.filter(
-                    prediction => prediction.school?.id === schoolId
-                );
-
-                const enhancedData = filteredPredictions.map(pred => {
+                const enhancedData = result.data.map(pred => {
                     const existing = pred.school?.number_of_rooms || 0;
                     const required = pred.required_rooms || 0;
                     const students = pred.school?.student_population || 0;
@@ -56,7 +55,9 @@ export default function SchoolPredictions() {
                     return { ...pred, detail, remaining_students, status };
                 });
 
-                setPredictions(enhancedData);
+                setPredictions((current) => (cursor ? current.concat(enhancedData) : enhancedData));
+                setNext(result.next);
+                setTotal(result.total);
             }
         } catch (error) {
             console.error("Error fetching predictions:", error);
@@ -95,7 +96,7 @@ export default function SchoolPredictions() {
     };
 
     const stats = {
-        totalPredictions: predictions.length,
+        totalPredictions: total ?? predictions.length,
         totalRoomsNeeded: predictions.reduce((sum, p) => sum + (p.rooms_to_build || 0), 0),
         deficit: predictions.filter(p => p.status === 'deficit').length,
     };
@@ -170,7 +171,7 @@ export default function SchoolPredictions() {
                                 </tr>
                             </thead>
                             <tbody className="divide-y divide-gray-100">
-                                {isLoading ? (
+                                {isLoading && predictions.length === 0 ? (
                                     <tr>
                                         <td colSpan="7" className="px-6 py-16 text-center">
                                             <div className="flex flex-col items-center justify-center">
@@ -228,6 +229,13 @@ export default function SchoolPredictions() {
                             </tbody>
                         </table>
                     </div>
+                    <LoadMoreButton
+                        next={next}
+                        isLoading={isLoading}
+                        onLoadMore={fetchPredictions}
+                        loaded={predictions.length}
+                        total={total}
+                    />
                 </div>
             </div>
 